@@ -0,0 +1,70 @@
+"""Import-time budget of the msmanager CLI.
+
+Runs `python -X importtime -m msmanager <args>` several times, sums the
+cumulative import time of the msmanager modules and fails if the median
+exceeds the budget or if a heavy dependency is imported.
+
+    python benchmarks/importtime.py --budget 150 -- --help
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import List, Dict, Tuple
+
+# ! Constants
+HEAVY_MODULES = ["pydantic", "rich", "pydustry", "vbml", "versioner", "screens", "asyncio"]
+
+# ! Functions
+def parse_importtime(stderr: str) -> Tuple[int, Dict[str, int]]:
+    total, modules = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        cumulative, name = int(fields[1]), fields[2].rstrip()
+        stripped = name.strip()
+        modules[stripped] = cumulative
+        # * Top-level msmanager imports include everything they pull in
+        if (name == " " + stripped) and stripped.split(".")[0] == "msmanager":
+            total += cumulative
+    return total, modules
+
+def measure(args: List[str]) -> Tuple[int, Dict[str, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "msmanager", *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    return parse_importtime(completed.stderr)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget of the msmanager CLI.")
+    parser.add_argument("--budget", type=float, default=150, help="Budget in milliseconds.")
+    parser.add_argument("--runs", type=int, default=5, help="How many times to run the CLI.")
+    parser.add_argument("args", nargs="*", default=["--help"], help="The CLI arguments.")
+    options = parser.parse_args()
+
+    totals, modules = [], {}
+    for _ in range(options.runs):
+        total, modules = measure(options.args)
+        totals.append(total / 1000)
+    median = statistics.median(totals)
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    result = {
+        "args": options.args,
+        "median_ms": round(median, 2),
+        "budget_ms": options.budget,
+        "runs_ms": [round(i, 2) for i in totals],
+        "heavy_modules": heavy,
+        "ok": (median <= options.budget) and (len(heavy) == 0)
+    }
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
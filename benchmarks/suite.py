@@ -0,0 +1,326 @@
+"""Benchmarks of the msmanager hot paths.
+
+Measures the config registry, the parsers, the `MSManager` construction and
+the `list`/`ping` commands (through `click.testing.CliRunner`) with 10, 1000
+and 10000 servers in the config. The results are written as JSON and compared
+with a baseline, the run fails if a case became slower than the tolerance,
+and with the exit code 2 if there is no baseline to compare with.
+
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --tolerance 0.25 --output results.json
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import socket
+import struct
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from typing import Optional, Callable, List, Dict, Any
+
+# * msmanager takes its paths from the environment at import time
+WORKDIR = tempfile.mkdtemp(prefix="msmanager-bench-")
+atexit.register(shutil.rmtree, WORKDIR, True)
+for variable in ("XDG_CONFIG_HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_RUNTIME_DIR"):
+    os.environ[variable] = os.path.join(WORKDIR, variable.lower())
+    os.makedirs(os.environ[variable], mode=0o700)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ! Constants
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = [10, 1000, 10000]
+LOG_LINE = "[12-01-2024 10:00:{0:02}] \x1b[34m[I]\x1b[0m Player {0} has connected.\x1b[0m"
+VERSION_LINE = "[12-01-2024 10:00:00] [I] Version: Mindustry 146 / build 146"
+STATUS_PAYLOAD = b"".join(
+    [
+        bytes([3]), b"srv", bytes([3]), b"map",
+        struct.pack(">iii", 3, 7, 146),
+        bytes([8]), b"official", struct.pack(">b", 0), struct.pack(">i", 0),
+        bytes([1]), b"d", bytes([1]), b"m"
+    ]
+)
+
+# ! Cases
+Case = Callable[[int], Callable[[], Any]]
+CASES: Dict[str, Case] = {}
+
+def case(name: str) -> Callable[[Case], Case]:
+    def case_wrapper(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return case_wrapper
+
+def write_config(size: int) -> str:
+    from msmanager.units import CONFIG_PATH
+    from msmanager.config import MSManagerConfig, configs_cache
+    from msmanager.models import MainConfig, MindustryServerConfig
+    MSManagerConfig.dump(
+        CONFIG_PATH,
+        MainConfig(
+            servers=[
+                MindustryServerConfig(
+                    screen_name=f"server-{idx}",
+                    work_dirpath=f"/srv/mindustry/{idx}",
+                    executable_filepath=f"/srv/mindustry/{idx % 10}/server-release.jar",
+                    arguments=[],
+                    host="127.0.0.1", port=10000 + idx, input_port=30000 + idx
+                ) for idx in range(size)
+            ]
+        )
+    )
+    configs_cache.clear()
+    return CONFIG_PATH
+
+@case("config.load")
+def config_load(size: int) -> Callable[[], Any]:
+    from msmanager.config import MSManagerConfig, configs_cache
+    path = write_config(size)
+    def run():
+        configs_cache.clear()
+        return MSManagerConfig(path)
+    return run
+
+@case("config.open_cached")
+def config_open_cached(size: int) -> Callable[[], Any]:
+    from msmanager.config import MSManagerConfig
+    path = write_config(size)
+    MSManagerConfig(path)
+    return lambda: MSManagerConfig(path)
+
+@case("config.refresh")
+def config_refresh(size: int) -> Callable[[], Any]:
+    from msmanager.config import MSManagerConfig
+    config = MSManagerConfig(write_config(size))
+    return config.refresh
+
+@case("config.lookup")
+def config_lookup(size: int) -> Callable[[], Any]:
+    from msmanager.config import MSManagerConfig
+    config = MSManagerConfig(write_config(size))
+    name, port = f"server-{size - 1}", 10000 + size - 1
+    def run():
+        config.get_server(name)
+        config.get_server_by_address("127.0.0.1", port)
+        return config.exists_server("missing")
+    return run
+
+@case("config.add_remove")
+def config_add_remove(size: int) -> Callable[[], Any]:
+    from msmanager.config import MSManagerConfig
+    from msmanager.models import MindustryServerConfig
+    config = MSManagerConfig(write_config(size))
+    server = MindustryServerConfig(
+        screen_name="extra", work_dirpath="/srv/mindustry/extra",
+        executable_filepath="/srv/mindustry/extra/server-release.jar",
+        arguments=[], host="127.0.0.1", port=9999, input_port=9998
+    )
+    def run():
+        config.add_server(server)
+        config.remove_server(server.screen_name)
+    return run
+
+@case("parse.connect_data")
+def parse_connect_data(size: int) -> Callable[[], Any]:
+    from msmanager.functions import parse_connect_data
+    texts = [f"10.0.{idx // 256 % 256}.{idx % 256}:{6567 + idx % 100}" for idx in range(size)]
+    return lambda: [parse_connect_data(text) for text in texts]
+
+@case("parse.vbml_linear")
+def parse_vbml_linear(size: int) -> Callable[[], Any]:
+    from msmanager.functions import parse_vbml_linear
+    lines = [LOG_LINE.format(idx % 60) for idx in range(size - 1)] + [VERSION_LINE]
+    return lambda: parse_vbml_linear(lines, "<dt> [I] Version: <build> / build <version>")
+
+@case("parse.connect_data_vbml")
+def parse_connect_data_vbml(size: int) -> Callable[[], Any]:
+    from msmanager.functions import parse_vbml_patterns
+    texts = [f"10.0.{idx // 256 % 256}.{idx % 256}:{6567 + idx % 100}" for idx in range(size)]
+    return lambda: [parse_vbml_patterns(text, ["<host>:<port:int>", "<host>"]) for text in texts]
+
+@case("parse.version_line")
+def parse_version_line(size: int) -> Callable[[], Any]:
+    from msmanager.parsers import find_server_version
+    lines = [LOG_LINE.format(idx % 60) for idx in range(size - 1)] + [VERSION_LINE]
+    return lambda: find_server_version(lines)
+
+@case("parse.log_line")
+def parse_log_line(size: int) -> Callable[[], Any]:
+    from msmanager.parsers import parse_log_line
+    lines = [LOG_LINE.format(idx % 60) for idx in range(size)]
+    return lambda: [parse_log_line(line) for line in lines]
+
+@case("parse.log_line_vbml")
+def parse_log_line_vbml(size: int) -> Callable[[], Any]:
+    from msmanager.types import get_vbml_patcher, get_vbml_pattern
+    from msmanager.functions import remove_color
+    patcher, pattern = get_vbml_patcher(), get_vbml_pattern("[<time>] [<level>] <message>")
+    lines = [LOG_LINE.format(idx % 60) for idx in range(size)]
+    return lambda: [patcher.check(pattern, remove_color(line)) for line in lines]
+
+@case("parse.remove_color")
+def parse_remove_color(size: int) -> Callable[[], Any]:
+    from msmanager.functions import remove_color
+    text = "\n".join(LOG_LINE.format(idx % 60) for idx in range(size * 10))
+    return lambda: remove_color(text)
+
+@case("msmanager.init")
+def msmanager_init(size: int) -> Callable[[], Any]:
+    from msmanager.msm import MSManager
+    from msmanager.config import configs_cache
+    path = write_config(size)
+    def run():
+        configs_cache.clear()
+        return MSManager(path, check_environment=False)
+    return run
+
+def invoke(args: List[str]) -> Callable[[], Any]:
+    from click.testing import CliRunner
+    from msmanager.cli import main
+    runner = CliRunner()
+    def run():
+        result = runner.invoke(main, args)
+        # * Errors are reported in the output, not by the exit code
+        if (result.exit_code != 0) or ('"status":"error"' in result.output):
+            raise RuntimeError(result.output)
+        return result
+    return run
+
+@case("cli.list")
+def cli_list(size: int) -> Callable[[], Any]:
+    write_config(size)
+    return invoke(["--no-agent", "-f", "json", "list"])
+
+@case("cli.ping")
+def cli_ping(size: int) -> Callable[[], Any]:
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    def serve():
+        while True:
+            _, address = server.recvfrom(16)
+            server.sendto(STATUS_PAYLOAD, address)
+    threading.Thread(target=serve, daemon=True).start()
+    write_config(size)
+    return invoke(["--no-agent", "--no-history", "-f", "json", "ping", f"127.0.0.1:{server.getsockname()[1]}"])
+
+# ! Functions
+def measure(func: Callable[[], Any], rounds: int, min_time: float) -> Dict[str, Any]:
+    # * The first call pays for the lazy imports and the caches
+    func()
+    # * The number of calls per round is picked so that a round takes at least min_time
+    number, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if (elapsed >= min_time) or (number >= 1_000_000):
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "number": number,
+        "rounds": len(timings)
+    }
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    min_delta: float
+) -> List[str]:
+    regressions = []
+    for key, result in results.items():
+        if (expected:=baseline.get(key)) is None:
+            continue
+        result["baseline"] = expected["median"]
+        result["ratio"] = result["median"] / expected["median"] if expected["median"] > 0 else None
+        if (result["median"] > expected["median"] * (1 + tolerance)) and \
+            (result["median"] - expected["median"] > min_delta):
+            regressions.append(key)
+    return regressions
+
+def format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the msmanager hot paths.")
+    parser.add_argument("--sizes", type=lambda text: [int(i) for i in text.split(",")], default=SIZES, help="Config sizes (comma separated).")
+    parser.add_argument("--filter", "-k", default=None, help="Run only the cases whose name contains this text.")
+    parser.add_argument("--rounds", type=int, default=5, help="How many rounds per case.")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum duration of a round in seconds.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="The baseline file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%).")
+    parser.add_argument("--min-delta", type=float, default=50e-6, help="Slowdowns below this many seconds are ignored.")
+    parser.add_argument("--output", "-o", default=None, help="Write the results to this file instead of stdout.")
+    options = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, factory in CASES.items():
+        if (options.filter is not None) and (options.filter not in name):
+            continue
+        for size in options.sizes:
+            key = f"{name}[{size}]"
+            results[key] = {"case": name, "size": size, **measure(factory(size), options.rounds, options.min_time)}
+            print(f"{key:<32} {format_time(results[key]['median']):>12}", file=sys.stderr)
+
+    baseline, regressions = {}, []
+    if (not options.save_baseline) and os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, options.tolerance, options.min_delta)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.time()
+        },
+        "tolerance": options.tolerance,
+        "results": results,
+        "compared": (compared:=sum("baseline" in result for result in results.values())),
+        "regressions": regressions
+    }
+    text = json.dumps(report, indent=2)
+    if options.output is not None:
+        with open(options.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    if options.save_baseline:
+        with open(options.baseline, "w") as file:
+            file.write(text)
+        print(f"The baseline is saved to {options.baseline!r}.", file=sys.stderr)
+    elif compared == 0:
+        # * A run without a baseline checks nothing, it must not pass for a successful comparison
+        print(f"NO BASELINE: nothing compared, {options.baseline!r} is missing or has none of these cases, use --save-baseline.", file=sys.stderr)
+        return 2
+    for key in regressions:
+        result = results[key]
+        print(
+            f"REGRESSION {key}: {format_time(result['median'])} " \
+            f"against {format_time(result['baseline'])} ({result['ratio']:.2f}x)",
+            file=sys.stderr
+        )
+    return 1 if len(regressions) != 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
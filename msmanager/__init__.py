@@ -1,8 +1,22 @@
-from .functions import checking_environment
+from typing import Any
 from .units import (
     __name__, __version__, __author__, __email__, __url__,
     SUPPORT_PLATFORMS, CONFIG_DIRPATH, CONFIG_PATH
 )
-from .msm import MSManager
-from .config import MSManagerConfig
-from .cli import run
\ No newline at end of file
+
+# ! Lazy Imports
+# * The heavy parts are imported on first access, so that the CLI starts quickly
+lazy_imports = {
+    "checking_environment": ".functions",
+    "MSManager": ".msm",
+    "MSManagerConfig": ".config",
+    "run": ".cli"
+}
+
+def __getattr__(name: str) -> Any:
+    if (module_name:=lazy_imports.get(name)) is not None:
+        import importlib
+        value = getattr(importlib.import_module(module_name, "msmanager"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'msmanager' has no attribute {name!r}")
@@ -1,4 +1,4 @@
-import msmanager
+from msmanager.cli import run
 
 if __name__ == "__main__":
-    msmanager.run()
\ No newline at end of file
+    run()
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import signal
+import asyncio
+import dataclasses
+from functools import partial
+from pydantic import BaseModel
+from typing import Optional, Iterable, Tuple, List, Dict, Any
+# * Local Imports
+from .msm import MSManager
+from .watchdog import Watchdog
+from .models import MindustryServerConfig, HealthPolicy, LaunchProfile
+from .pinging import Address, PingResult, StatusPinger
+from .channel import ConsolePool
+from .client import agent_is_running
+from .functions import exception_data
+from .units import AGENT_SOCKET_PATH
+from .exceptions import AgentIsRunningError, AgentMethodError
+
+# ! Constants
+AGENT_METHODS = [
+    "add_server_config",
+    "add_servers_config",
+    "get_server_config",
+    "get_servers_config",
+    "exists_server_config",
+    "remove_server_config",
+    "set_server_health",
+    "set_servers_health",
+    "set_server_profile",
+    "get_profiles",
+    "set_profile",
+    "remove_profile",
+    "get_sessions",
+    "server_is_started",
+    "get_server_pid",
+    "start_server",
+    "stop_server",
+    "restart_server",
+    "get_server_log_path"
+]
+
+# ! Functions
+def encode(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.dict()
+    elif dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    elif isinstance(value, BaseException):
+        return {"__error__": exception_data(value)}
+    elif isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    return value
+
+# ! Agent
+class Agent:
+    def __init__(
+        self,
+        msmanager: MSManager,
+        socket_path: str=AGENT_SOCKET_PATH,
+        ping_ttl: float=1,
+        watchdog: Optional[Watchdog]=None
+    ) -> None:
+        self.msmanager = msmanager
+        self.socket_path = socket_path
+        self.ping_ttl = ping_ttl
+        self.watchdog = watchdog
+        # * Runtime
+        self.started: Optional[float] = None
+        self.pinger: Optional[StatusPinger] = None
+        self.ping_results: Dict[Address, Tuple[float, PingResult]] = {}
+        self.console = ConsolePool()
+
+    # ? Methods
+    async def ping_servers(self, targets: Iterable[List], timeout: float=10) -> Dict[Address, PingResult]:
+        now, results = time.monotonic(), {}
+        targets = [(host, port) for host, port in targets]
+        missing = []
+        for address in dict.fromkeys(targets):
+            if ((cached:=self.ping_results.get(address)) is not None) and (now - cached[0] <= self.ping_ttl):
+                results[address] = cached[1]
+            else:
+                missing.append(address)
+        statuses = await asyncio.gather(
+            *[self.pinger.status(host, port, timeout) for host, port in missing],
+            return_exceptions=True
+        )
+        for address, status in zip(missing, statuses):
+            self.ping_results[address] = (time.monotonic(), status)
+            results[address] = status
+        return results
+
+    async def exec_servers(
+        self,
+        screen_names: Iterable[str],
+        command: str,
+        timeout: float=5,
+        idle: float=0.5,
+        localhost: bool=True
+    ) -> Dict[str, Any]:
+        # * The console connections stay open between the calls
+        targets, errors = self.msmanager.get_console_targets(screen_names, localhost)
+        sent = await asyncio.get_running_loop().run_in_executor(
+            None, partial(self.msmanager.send_servers, errors, command)
+        )
+        return {**await self.console.broadcast(targets, command, timeout, idle), **sent}
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "servers": len(self.msmanager.config.config.servers),
+            # * The cached screen sessions and the supervised processes (the state file only)
+            "sessions": encode({**self.msmanager.sessions.sessions, **self.msmanager.backends['native'].get_sessions()}),
+            "pings": len(self.ping_results),
+            "consoles": sum(i.connected for i in self.console.connections.values()),
+            "watchdog": None if self.watchdog is None else self.watchdog.state
+        }
+
+    async def call(self, method: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        # * The config may be changed by other processes, a reload costs one stat call
+        self.msmanager.config.reload()
+        if method == "ping_servers":
+            results = await self.ping_servers(*args, **kwargs)
+            return [[list(address), encode(result)] for address, result in results.items()]
+        elif method == "exec_servers":
+            return encode(await self.exec_servers(*args, **kwargs))
+        elif method == "get_state":
+            return self.get_state()
+        elif method not in AGENT_METHODS:
+            raise AgentMethodError(method)
+        if method == "add_server_config":
+            args = [MindustryServerConfig.parse_obj(args[0]), *args[1:]]
+        elif method == "add_servers_config":
+            args = [[MindustryServerConfig.parse_obj(i) for i in args[0]], *args[1:]]
+        elif (method == "set_server_health") and (args[1] is not None):
+            args = [args[0], HealthPolicy.parse_obj(args[1])]
+        elif method == "set_servers_health":
+            args = [
+                {
+                    screen_name: None if health is None else HealthPolicy.parse_obj(health) \
+                        for screen_name, health in args[0].items()
+                },
+                *args[1:]
+            ]
+        elif method == "set_profile":
+            args = [args[0], LaunchProfile.parse_obj(args[1])]
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, partial(getattr(self.msmanager, method), *args, **kwargs)
+        )
+        return encode(result)
+
+    # ? Server
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while len(line:=await reader.readline()) != 0:
+                try:
+                    request = json.loads(line)
+                    result = await self.call(
+                        request["method"],
+                        request.get("args", []),
+                        request.get("kwargs", {})
+                    )
+                    response = {"status": "success", "data": {"result": result}}
+                except Exception as e:
+                    response = {"status": "error", "data": exception_data(e)}
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def prepare_socket(self) -> None:
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if agent_is_running(self.socket_path):
+                raise AgentIsRunningError(self.socket_path)
+            os.remove(self.socket_path)
+
+    async def run(self) -> None:
+        self.prepare_socket()
+        self.started = time.time()
+        self.pinger = StatusPinger()
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                tasks = [server.serve_forever()]
+                if self.watchdog is not None:
+                    tasks.append(self.watchdog.run())
+                await asyncio.gather(*tasks)
+        finally:
+            self.pinger.close()
+            self.console.close()
+            try: os.remove(self.socket_path)
+            except OSError: pass
+
+    def start(self) -> None:
+        try:
+            asyncio.run(self.run())
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import shlex
+import signal
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Literal, Dict, Any
+# * Local Imports
+from .units import RUNTIME_DIRPATH
+from .models import MindustryServerConfig, ScreenSession
+from .storage import atomic_write, file_lock
+from .sessions import SessionSnapshot, kill_session, enable_logging, send_to_session
+from .logs import server_log_path
+from .processes import process_start_time, process_is_alive, find_process
+from .launch import LaunchCommand, launch_command
+from .exceptions import ServerIsStartedError, ServerIsStoppedError, BackendNotSupportedError
+
+# ! Types
+BackendKind = Literal['screen', 'native']
+
+# ! Constants
+NATIVE_STATE_PATH = os.path.join(RUNTIME_DIRPATH, "native.json")
+NATIVE_STDIN_DIRPATH = os.path.join(RUNTIME_DIRPATH, "stdin")
+
+# ! Backend
+class Backend(ABC):
+    name: BackendKind
+
+    @abstractmethod
+    def get_sessions(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        ...
+
+    def is_started(self, server: MindustryServerConfig) -> bool:
+        return server.screen_name in self.get_sessions()
+
+    def get_pid(self, server: MindustryServerConfig) -> Optional[int]:
+        if (session:=self.get_sessions().get(server.screen_name)) is not None:
+            return session.pid
+
+    @abstractmethod
+    def start(self, server: MindustryServerConfig, launch: Optional[LaunchCommand]=None) -> None:
+        ...
+
+    @abstractmethod
+    def stop(self, server: MindustryServerConfig) -> None:
+        ...
+
+    @abstractmethod
+    def send(self, server: MindustryServerConfig, command: str) -> None:
+        ...
+
+# ! Screen Backend
+class ScreenBackend(Backend):
+    name = 'screen'
+
+    def __init__(self, sessions_ttl: float=2) -> None:
+        self.sessions = SessionSnapshot(sessions_ttl)
+
+    def get_sessions(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        return self.sessions.get(refresh)
+
+    def get_pid(self, server: MindustryServerConfig) -> Optional[int]:
+        # * The session PID is the screen process, the server is the java process inside it
+        if (session:=self.sessions.get_session(server.screen_name)) is not None and (session.pid is not None):
+            return find_process(session.pid)
+
+    def start(self, server: MindustryServerConfig, launch: Optional[LaunchCommand]=None) -> None:
+        if self.is_started(server):
+            raise ServerIsStartedError(server.screen_name)
+        launch = launch or launch_command(server)
+        import screens
+        server_screen = screens.Screen(server.screen_name)
+        log_path = server_log_path(server.screen_name)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        enable_logging(server.screen_name, log_path)
+        # * The working directory is changed inside the session, not in this process
+        server_screen.send_command(f"cd {shlex.quote(server.work_dirpath)}")
+        # * The server arguments are typed as they are, the environment goes through env(1)
+        command = launch.command if len(launch.env) == 0 else \
+            ["env", *[f"{key}={value}" for key, value in launch.env.items()], *launch.command]
+        server_screen.send_command(f"{shlex.join(command)} {' '.join(launch.arguments)}")
+        self.sessions.add(ScreenSession(name=server.screen_name, state="Starting"))
+
+    def stop(self, server: MindustryServerConfig) -> None:
+        if (session:=self.sessions.get_session(server.screen_name)) is None:
+            raise ServerIsStoppedError(server.screen_name)
+        kill_session(session)
+        self.sessions.discard(server.screen_name)
+
+    def send(self, server: MindustryServerConfig, command: str) -> None:
+        if (session:=self.sessions.get_session(server.screen_name)) is None:
+            raise ServerIsStoppedError(server.screen_name)
+        send_to_session(session, command)
+
+# ! Native Backend
+class NativeBackend(Backend):
+    name = 'native'
+
+    def __init__(
+        self,
+        state_path: str=NATIVE_STATE_PATH,
+        stdin_dirpath: str=NATIVE_STDIN_DIRPATH,
+        stop_timeout: float=15
+    ) -> None:
+        self.state_path = state_path
+        self.stdin_dirpath = stdin_dirpath
+        self.stop_timeout = stop_timeout
+        # * Children of this process are reaped here, the others are reaped by init
+        self.processes: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+
+    # ? State
+    def read_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path) as file:
+                state = json.load(file)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def write_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        atomic_write(self.state_path, json.dumps(state))
+
+    def stdin_path(self, screen_name: str) -> str:
+        from urllib.parse import quote
+        return os.path.join(self.stdin_dirpath, quote(screen_name, safe=""))
+
+    def is_alive(self, screen_name: str, entry: Dict[str, Any]) -> bool:
+        if (process:=self.processes.get(screen_name)) is not None:
+            if process.poll() is None:
+                return True
+            self.processes.pop(screen_name, None)
+            return False
+        return process_is_alive(entry["pid"], entry.get("start_time"))
+
+    def get_sessions(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        return {
+            name: ScreenSession(pid=entry["pid"], name=name, state="Native") \
+                for name, entry in self.read_state().items() if self.is_alive(name, entry)
+        }
+
+    # ? Actions
+    def start(self, server: MindustryServerConfig, launch: Optional[LaunchCommand]=None) -> None:
+        if not hasattr(os, "mkfifo"):
+            raise BackendNotSupportedError(self.name)
+        import subprocess
+        launch = launch or launch_command(server)
+        with file_lock(self.state_path), self.lock:
+            state = self.read_state()
+            if (server.screen_name in state) and self.is_alive(server.screen_name, state[server.screen_name]):
+                raise ServerIsStartedError(server.screen_name)
+            stdin_path = self.stdin_path(server.screen_name)
+            os.makedirs(self.stdin_dirpath, mode=0o700, exist_ok=True)
+            if os.path.exists(stdin_path):
+                os.remove(stdin_path)
+            os.mkfifo(stdin_path, 0o600)
+            log_path = server_log_path(server.screen_name)
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            # * The server holds the FIFO open for writing too, so it never reads EOF between commands
+            stdin = os.open(stdin_path, os.O_RDWR)
+            try:
+                with open(log_path, "ab") as log:
+                    process = subprocess.Popen(
+                        launch.argv,
+                        cwd=server.work_dirpath,
+                        env={**os.environ, **launch.env} if len(launch.env) != 0 else None,
+                        stdin=stdin, stdout=log, stderr=subprocess.STDOUT,
+                        start_new_session=True
+                    )
+            finally:
+                os.close(stdin)
+            self.processes[server.screen_name] = process
+            state[server.screen_name] = {
+                "pid": process.pid,
+                "start_time": process_start_time(process.pid),
+                "started": time.time()
+            }
+            self.write_state(state)
+
+    def stop(self, server: MindustryServerConfig) -> None:
+        with file_lock(self.state_path), self.lock:
+            state = self.read_state()
+            entry = state.pop(server.screen_name, None)
+            if (entry is None) or not self.is_alive(server.screen_name, entry):
+                if entry is not None:
+                    self.write_state(state)
+                raise ServerIsStoppedError(server.screen_name)
+            # * The entry is dropped before the wait, the locks are not held while the server exits
+            self.write_state(state)
+            process = self.processes.pop(server.screen_name, None)
+            try: os.remove(self.stdin_path(server.screen_name))
+            except OSError: pass
+        def is_alive() -> bool:
+            return (process.poll() is None) if process is not None else process_is_alive(entry["pid"], entry.get("start_time"))
+        self.signal(entry["pid"], signal.SIGTERM)
+        deadline = time.monotonic() + self.stop_timeout
+        while is_alive() and (time.monotonic() < deadline):
+            time.sleep(0.05)
+        if is_alive():
+            self.signal(entry["pid"], signal.SIGKILL)
+        if process is not None:
+            process.wait()
+
+    @staticmethod
+    def signal(pid: int, signum: int) -> None:
+        # * The server runs in its own session, the whole process group is signalled
+        try:
+            os.killpg(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def send(self, server: MindustryServerConfig, command: str) -> None:
+        if not self.is_started(server):
+            raise ServerIsStoppedError(server.screen_name)
+        descriptor = os.open(self.stdin_path(server.screen_name), os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            os.write(descriptor, command.encode() + b"\n")
+        finally:
+            os.close(descriptor)
+
+# ! Registry
+def create_backends(sessions_ttl: float=2) -> Dict[BackendKind, Backend]:
+    return {'screen': ScreenBackend(sessions_ttl), 'native': NativeBackend()}
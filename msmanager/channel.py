@@ -0,0 +1,145 @@
+import asyncio
+from typing import Optional, Union, Mapping, Tuple, List, Dict
+# * Local Imports
+from .models import CommandReply
+from .functions import remove_color
+
+# ! Types
+Address = Tuple[str, int]
+CommandResult = Union[CommandReply, Exception]
+
+# ! Console Connection
+class ConsoleConnection:
+    def __init__(self, address: Address) -> None:
+        self.address = address
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.lines: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self.reading: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return (self.reading is not None) and not self.reading.done()
+
+    async def connect(self) -> None:
+        self.close()
+        self.reader, self.writer = await asyncio.open_connection(*self.address)
+        self.lines = asyncio.Queue()
+        self.reading = asyncio.create_task(self.read())
+
+    async def read(self) -> None:
+        try:
+            while len(line:=await self.reader.readline()) != 0:
+                self.lines.put_nowait(remove_color(line.decode("utf-8", "replace").rstrip("\r\n")))
+        except ConnectionError:
+            pass
+        finally:
+            self.lines.put_nowait(None)
+
+    def discard_lines(self) -> None:
+        # * The output that came between commands (e.g. the log) does not belong to the reply
+        while not self.lines.empty():
+            if self.lines.get_nowait() is None:
+                self.lines.put_nowait(None)
+                break
+
+    async def collect(self, timeout: float, idle: float) -> Tuple[List[str], bool]:
+        loop = asyncio.get_running_loop()
+        deadline, lines = loop.time() + timeout, []
+        while (idle > 0) and ((remaining:=deadline - loop.time()) > 0):
+            try:
+                line = await asyncio.wait_for(self.lines.get(), min(idle, remaining))
+            except asyncio.TimeoutError:
+                break
+            if line is None:
+                return lines, True
+            lines.append(line)
+        return lines, False
+
+    async def send(self, command: str, timeout: float=5, idle: float=0.5) -> CommandReply:
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            start = loop.time()
+            deadline = start + timeout
+            for attempt in range(2):
+                try:
+                    if not self.connected:
+                        await asyncio.wait_for(self.connect(), max(0, deadline - loop.time()))
+                    self.discard_lines()
+                    self.writer.write(command.encode() + b"\n")
+                    await asyncio.wait_for(self.writer.drain(), max(0, deadline - loop.time()))
+                except ConnectionError:
+                    # * A pooled connection may have been closed by the server, it is reopened once
+                    self.close()
+                    if attempt != 0:
+                        raise
+                    continue
+                except:
+                    self.close()
+                    raise
+                lines, closed = await self.collect(max(0, deadline - loop.time()), idle)
+                if closed:
+                    self.close()
+                return CommandReply(lines=lines, elapsed=loop.time() - start)
+
+    def close(self) -> None:
+        if self.reading is not None:
+            self.reading.cancel()
+            self.reading = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+# ! Console Pool
+class ConsolePool:
+    def __init__(self) -> None:
+        self.connections: Dict[Address, ConsoleConnection] = {}
+
+    def connection(self, address: Address) -> ConsoleConnection:
+        if (connection:=self.connections.get(address)) is None:
+            connection = self.connections[address] = ConsoleConnection(address)
+        return connection
+
+    async def send(self, address: Address, command: str, timeout: float=5, idle: float=0.5) -> CommandReply:
+        return await self.connection(address).send(command, timeout, idle)
+
+    async def broadcast(
+        self,
+        targets: Mapping[str, Address],
+        command: str,
+        timeout: float=5,
+        idle: float=0.5
+    ) -> Dict[str, CommandResult]:
+        names = list(targets)
+        results = await asyncio.gather(
+            *[self.send(targets[name], command, timeout, idle) for name in names],
+            return_exceptions=True
+        )
+        return dict(zip(names, results))
+
+    def close(self) -> None:
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+# ! Functions
+async def abroadcast(
+    targets: Mapping[str, Address],
+    command: str,
+    timeout: float=5,
+    idle: float=0.5
+) -> Dict[str, CommandResult]:
+    pool = ConsolePool()
+    try:
+        return await pool.broadcast(targets, command, timeout, idle)
+    finally:
+        pool.close()
+
+def broadcast(
+    targets: Mapping[str, Address],
+    command: str,
+    timeout: float=5,
+    idle: float=0.5
+) -> Dict[str, CommandResult]:
+    return asyncio.run(abroadcast(targets, command, timeout, idle))
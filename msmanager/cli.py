@@ -1,57 +1,79 @@
+from __future__ import annotations
 import os
 import time
 import json
 import click
 import datetime
-from rich.console import Console
-from typing import Literal, Optional, Union, Iterable, Callable, List, Dict, Any
+from functools import cached_property
+from typing import TYPE_CHECKING, Literal, Optional, Union, Iterable, Callable, Tuple, List, Dict, Any
 # > Local Imports
-from .msm import MSManager
 from .units import (
     __title__ as prog_name,
     __version__ as prog_version,
-    ERRORLOG_DIRPATH
-)
-from .models import (
-    MindustryServerConfig,
-    JsonOutput
+    AGENT_SOCKET_PATH, START_TIMEOUT
 )
 from .functions import (
-    remove_color,
     rich_exception,
-    is_server_connect_correct,
+    exception_data,
+    run_parallel,
     wait_start_server,
-    ping, pingok,
-    endicext, parse_connect_data
+    endicext, parse_connect_data, parse_timepoint
 )
+from .parsers import HEAP_SIZE_REGEX
 from .exceptions import (
     VBMLParseError, IncorrectConnectionDataError,
-    ServerIsStoppedError, ServerIsStartedError
+    ServerIsStoppedError, ServerStartTimeoutError
 )
 
+# > Type Imports
+if TYPE_CHECKING:
+    from rich.console import Console
+    from .msm import MSManager
+    from .client import AgentClient
+    from .readiness import ProbeKind
+    from .backends import BackendKind
+    from .metrics import ServerMetrics, TextfileWriter
+    from .history import HistoryStore
+    from .pinging import PingResult
+    from .models import MindustryServerConfig, LaunchProfile, ReadinessResult, JsonOutput
+
+# ! Lazy Console
+class LazyConsole:
+    @cached_property
+    def console(self) -> Console:
+        from rich.console import Console
+        return Console()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.console, name)
+
 # ! Vars
-console = Console()
+console = LazyConsole()
 debug_mode = False
 verbose_mode = False
-msmanager: MSManager = ...
+history_mode = True
+msmanager: Union[MSManager, AgentClient] = ...
 oformat: Literal['text', 'json'] = 'text'
+# * With ndjson the output is json, but the streaming commands print one record per line as soon as it is ready
+stream_mode = False
 
 # ! Functions
 def print_exception(e: Exception) -> None:
     if debug_mode:
-        console.print_exception(word_wrap=True, show_locals=True)
+        from rich.traceback import Traceback
+        console.print(
+            Traceback.from_exception(
+                type(e), e, e.__traceback__,
+                word_wrap=True, show_locals=True
+            )
+        )
     else:
         console.print(rich_exception(e))
 
-def save_print_exception() -> None:
-    cdt = datetime.datetime.now()
-    with console.capture() as cap:
-        console.print_exception(word_wrap=True, show_locals=True)
-    text = remove_color(cap.get())
-    with open(os.path.join(ERRORLOG_DIRPATH, "last.log"), "w") as logfile:
-        logfile.write(text)
-    with open(os.path.join(ERRORLOG_DIRPATH, f"{round(cdt.timestamp())}.log"), "w") as logfile:
-        logfile.write(text)
+def save_exception(e: BaseException) -> None:
+    from .errorlog import get_errorlog
+    # * Rendered and written by the error log thread, repeated tracebacks are only counted
+    get_errorlog().record(e)
 
 def hand_exception():
     def hand_exception_wrapper(func: Callable[..., Any]):
@@ -62,20 +84,29 @@ def hand_exception():
                 if oformat == 'text':
                     print_exception(e)
                 elif oformat == 'json':
-                    printjson(
-                        JsonOutput(
-                            status='error',
-                            data={
-                                'name': e.__class__.__name__,
-                                'args': list(e.args),
-                                'kwargs': {}
-                            }
-                        )
-                    )
+                    from .models import JsonOutput
+                    printjson(JsonOutput(status='error', data=exception_data(e)))
         return hand_exception_wrapped
     return hand_exception_wrapper
 
+def record_value(value: Any) -> Any:
+    from pydantic import BaseModel
+    from pydustry import Status
+    from .pinging import status_to_dict
+    if isinstance(value, BaseException):
+        return exception_data(value)
+    elif isinstance(value, BaseModel):
+        return value.dict()
+    elif isinstance(value, Status):
+        return status_to_dict(value)
+    return value
+
+def printrecord(record: Dict[str, Any]) -> None:
+    # * Flushed at once, the records are read by other programs while the command is running
+    print(json.dumps({key: record_value(value) for key, value in record.items()}, separators=(",", ":")), flush=True)
+
 def printjson(data: Union[Dict[str, Any], JsonOutput]) -> None:
+    from .models import JsonOutput
     if isinstance(data, JsonOutput):
         print(data.model_dump_json(warnings=False))
     elif isinstance(data, dict):
@@ -109,6 +140,16 @@ def printjson(data: Union[Dict[str, Any], JsonOutput]) -> None:
     help="Server input port for telnet connection.",
     type=int, default=None, show_default=True
 )
+@click.option(
+    "-b", "--backend", "backend",
+    help="How the server process is run: in a GNU screen session or supervised directly.",
+    type=click.Choice(['screen', 'native']), default='screen', show_default=True
+)
+@click.option(
+    "--profile", "profile",
+    help="The launch profile (JVM flags, heap and environment) of the server.",
+    type=str, default=None
+)
 @hand_exception()
 def adder(
     screen_name: str,
@@ -116,15 +157,19 @@ def adder(
     arguments: Iterable[str],
     host: Optional[str],
     port: Optional[int],
-    input_port: Optional[int]
+    input_port: Optional[int],
+    backend: BackendKind,
+    profile: Optional[str]
 ):
+    from .models import MindustryServerConfig, JsonOutput
     msmanager.add_server_config(
         MindustryServerConfig(
             screen_name=screen_name,
             work_dirpath=os.path.dirname(os.path.abspath(executable_filepath)),
             executable_filepath=os.path.abspath(executable_filepath),
             arguments=list(arguments),
-            host=host, port=port, input_port=input_port
+            host=host, port=port, input_port=input_port,
+            backend=backend, profile=profile
         )
     )
     if oformat == 'text':
@@ -137,72 +182,425 @@ def adder(
 @click.argument("screen_name", type=str)
 @hand_exception()
 def remover(screen_name: str):
+    from .models import JsonOutput
     msmanager.remove_server_config(screen_name)
     if oformat == 'text':
         console.print("[green]>[/] Server [bold yellow]removed[/]!")
     elif oformat == 'json':
         printjson(JsonOutput(status='success'))
 
-# ? Start Command
-@click.command("start", help="Run the server(s).")
-@click.argument("scn", type=str)
+# ? Import Command
+@click.command("import", help="Add servers from a JSON/CSV manifest or from a directory tree with server executables.")
+@click.argument("source", type=click.Path(exists=True))
+@click.option(
+    "-t", "--type", "manifest_type",
+    help="The manifest format, guessed from the file extension by default.",
+    type=click.Choice(['json', 'ndjson', 'csv']), default=None
+)
+@click.option(
+    "-h", "--host", "host",
+    help="Host of the found servers (127.0.0.1 by default) and of the manifest servers without one.",
+    type=str, default=None
+)
+@click.option(
+    "-p", "--port", "port",
+    help="The first port given to the servers with a host and without a port.",
+    type=click.IntRange(1, 65535), default=6567, show_default=True
+)
 @click.option(
-    "-w", "--wait", "wait",
-    help="Waiting for the server to start up.",
-    is_flag=True
+    "-i", "--input-port", "input_port",
+    help="The first input port given to the servers with a host and without an input port.",
+    type=click.IntRange(1, 65535), default=None
+)
+@click.option(
+    "-a", "--arg", "arguments",
+    help="Arguments for starting the found servers.",
+    type=str, multiple=True
+)
+@click.option(
+    "-b", "--backend", "backend",
+    help="The backend of the found servers.",
+    type=click.Choice(['screen', 'native']), default='screen', show_default=True
+)
+@click.option(
+    "--profile", "profile",
+    help="The launch profile of the found servers and of the manifest servers without one.",
+    type=str, default=None
+)
+@click.option(
+    "--prefix", "prefix",
+    help="Prefix of the names of the found servers.",
+    type=str, default="", show_default=True
+)
+@click.option(
+    "--executable-name", "executable_name",
+    help="The server executable file name to look for.",
+    type=str, default="server-release.jar", show_default=True
+)
+@click.option(
+    "--max-depth", "max_depth",
+    help="How deep to look for the server executables.",
+    type=click.IntRange(min=0), default=4, show_default=True
+)
+@click.option(
+    "-P", "--parallel", "parallel",
+    help="How many directories to scan at the same time.",
+    type=click.IntRange(min=1), default=8, show_default=True
+)
+@click.option(
+    "-n", "--dry-run", "dry_run",
+    help="Only check and show the servers, the config is not changed.",
+    is_flag=True, default=False
 )
 @hand_exception()
-def starter(scn: str, wait: bool):
-    screens_names = scn.split(",")
-    for screen_name in screens_names:
-        msmanager.start_server(screen_name)
-        if (server_config := msmanager.get_server_config(screen_name)) is not None:
-            if is_server_connect_correct(server_config.host, server_config.port, server_config.input_port) and wait:
-                wait_start_server(server_config.host, server_config.port, server_config.input_port)
+def importer(
+    source: str,
+    manifest_type: Optional[Literal['json', 'ndjson', 'csv']],
+    host: Optional[str],
+    port: int,
+    input_port: Optional[int],
+    arguments: Iterable[str],
+    backend: BackendKind,
+    profile: Optional[str],
+    prefix: str,
+    executable_name: str,
+    max_depth: int,
+    parallel: int,
+    dry_run: bool
+):
+    from .models import JsonOutput
+    from .manifest import read_manifest, scan_servers, discovered_servers, assign_ports, taken_ports
+    current = msmanager.get_servers_config()
+    if os.path.isdir(source):
+        executables = scan_servers(source, executable_name, max_depth, parallel)
+        # * A directory already in the config is not added again
+        known = {os.path.abspath(server.executable_filepath) for server in current}
+        servers = discovered_servers(
+            source, [i for i in executables if i not in known], [server.screen_name for server in current],
+            prefix=prefix, arguments=arguments, host=host or "127.0.0.1", backend=backend
+        )
+        if profile is not None:
+            servers = [server.copy(update={"profile": profile}) for server in servers]
+    else:
+        servers = read_manifest(source, manifest_type)
+        defaults = {key: value for key, value in {"host": host, "profile": profile}.items() if value is not None}
+        servers = [
+            server.copy(update={key: value for key, value in defaults.items() if getattr(server, key) is None}) \
+                for server in servers
+        ]
+    servers = assign_ports(servers, taken_ports(current), port, input_port)
+    # * All servers are checked and written at once, nothing is added if one of them is rejected
+    count = 0 if dry_run else msmanager.add_servers_config(servers)
+    if stream_mode:
+        for server in servers:
+            printrecord(server_record(server, None))
+    elif oformat == 'text':
+        for server in servers:
+            address = f"{server.host}:{server.port}" if server.host is not None else "-"
+            console.print(f"[green]>[/] [bold]{server.screen_name}[/] [green]{address}[/] {server.work_dirpath}")
+        if dry_run:
+            console.print(f"[green]>[/] {len(servers)} server(s) [bold yellow]checked[/], the config is not changed!")
+        else:
+            console.print(f"[green]>[/] {count} server(s) [bold yellow]imported[/]!")
+    elif oformat == 'json':
+        printjson(
+            JsonOutput(
+                status='success',
+                data={"imported": count, "servers": [server_record(server, None) for server in servers]}
+            )
+        )
+
+# ? Export Command
+@click.command("export", help="Write the servers of the config as a JSON/CSV manifest.")
+@click.option(
+    "-o", "--output", "output",
+    help="The manifest file, the servers are streamed to stdout by default.",
+    type=click.Path(dir_okay=False), default=None
+)
+@click.option(
+    "-t", "--type", "manifest_type",
+    help="The manifest format, guessed from the output file extension by default.",
+    type=click.Choice(['json', 'ndjson', 'csv']), default=None
+)
+@hand_exception()
+def exporter(output: Optional[str], manifest_type: Optional[Literal['json', 'ndjson', 'csv']]):
+    import sys
+    from .manifest import manifest_format, iter_export
+    default_type = 'ndjson' if stream_mode else 'json'
+    manifest_type = manifest_type or (default_type if output is None else manifest_format(output, default_type))
+    servers = msmanager.get_servers_config()
+    if output is None:
+        for chunk in iter_export(servers, manifest_type):
+            sys.stdout.write(chunk)
+        sys.stdout.flush()
+        return
+    from .storage import atomic_write
+    atomic_write(os.path.abspath(output), "".join(iter_export(servers, manifest_type)))
+    if oformat == 'text':
+        console.print(f"[green]>[/] {len(servers)} server(s) [bold yellow]exported[/] to {repr(output)}!")
+    elif oformat == 'json':
+        from .models import JsonOutput
+        printjson(JsonOutput(status='success', data={"exported": len(servers), "output": output}))
+
+# ? Server Actions
+def start_one(screen_name: str, wait: bool, wait_timeout: float, probe: ProbeKind) -> Optional[ReadinessResult]:
+    server_probe = None
+    if wait and ((server_config:=msmanager.get_server_config(screen_name)) is not None):
+        from .readiness import server_probe as create_probe, missing_probe_fields
+        # * Each probe only needs its own fields, a missing one is an error rather than a skipped wait
+        if len(missing:=missing_probe_fields(server_config, probe)) != 0:
+            raise IncorrectConnectionDataError(f"{screen_name}: no {', '.join(missing)} for the {probe} probe")
+        # * The log probe only looks at the lines written after it was created
+        server_probe = create_probe(server_config, probe)
+    msmanager.start_server(screen_name)
+    if server_probe is not None:
+        result = wait_start_server(
+            server_config.host, server_config.port, server_config.input_port,
+            timeout=wait_timeout, probe=server_probe
+        )
+        if not result.ready:
+            raise ServerStartTimeoutError(screen_name, wait_timeout)
+        return result
+
+def restart_one(screen_name: str, wait: bool, wait_timeout: float, probe: ProbeKind) -> Optional[ReadinessResult]:
+    try:
+        msmanager.stop_server(screen_name)
+    except ServerIsStoppedError:
+        pass
+    return start_one(screen_name, wait, wait_timeout, probe)
+
+def fleet_action(
+    func: Callable[[str], Optional[ReadinessResult]],
+    scn: str,
+    parallel: int,
+    action_name: str
+) -> None:
+    from .models import JsonOutput
+    results: List[Dict[str, Any]] = []
+    for screen_name, result in run_parallel(func, scn.split(","), parallel):
+        if isinstance(result, Exception):
+            if oformat == 'text':
+                console.print(f"[red]>[/red] Server [green]{screen_name}[/green] is [bold red]not {action_name}[/bold red]:")
+                print_exception(result)
+            results.append({"screen_name": screen_name, "status": "error", "error": exception_data(result)})
+            if stream_mode:
+                printrecord(results[-1])
+        else:
+            if oformat == 'text':
+                ready = "" if result is None else f" (ready in {result.elapsed:.1f} s, {result.attempts} attempt(s))"
+                console.print(f"[green]>[/green] Server [green]{screen_name}[/green] is [bold yellow]{action_name}[/bold yellow]!{ready}")
+            results.append(
+                {
+                    "screen_name": screen_name,
+                    "status": "success",
+                    "readiness": None if result is None else result.dict()
+                }
+            )
+            if stream_mode:
+                printrecord(results[-1])
+    if (oformat == 'json') and not stream_mode:
+        printjson(
+            JsonOutput(
+                status='success' if all(i["status"] == "success" for i in results) else 'error',
+                data={"servers": results}
+            )
+        )
+
+def wait_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    func = click.option(
+        "--probe", "probe",
+        help="How to check that the server is ready.",
+        type=click.Choice(['status', 'tcp', 'log']), default='status', show_default=True
+    )(func)
+    func = click.option(
+        "-wt", "--wait-timeout", "wait_timeout",
+        help="Maximum waiting time for the server to start up (in seconds).",
+        type=click.FLOAT, default=START_TIMEOUT, show_default=True
+    )(func)
+    return click.option(
+        "-w", "--wait", "wait",
+        help="Waiting for the server to start up.",
+        is_flag=True
+    )(func)
+
+positive_float = click.FloatRange(min=0, min_open=True)
+non_negative_float = click.FloatRange(min=0)
+
+parallel_option = click.option(
+    "-P", "--parallel", "parallel",
+    help="How many servers to process at the same time.",
+    type=click.IntRange(min=1), default=1, show_default=True
+)
+
+metrics_file_option = click.option(
+    "--metrics-file", "metrics_file",
+    help="Write the metrics to a file in the Prometheus text format (for the textfile collector).",
+    type=click.Path(dir_okay=False), default=None
+)
+
+def metrics_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    func = metrics_file_option(func)
+    return click.option(
+        "--metrics-port", "metrics_port",
+        help="Serve the metrics in the Prometheus text format on this local port.",
+        type=click.IntRange(min=1, max=65535), default=None
+    )(func)
+
+def start_metrics(
+    metrics_port: Optional[int],
+    metrics_file: Optional[str]
+) -> Tuple[Optional[ServerMetrics], Optional[TextfileWriter]]:
+    if (metrics_port is None) and (metrics_file is None):
+        return None, None
+    from .metrics import ServerMetrics, TextfileWriter, serve_metrics
+    metrics, writer = ServerMetrics(), None
+    if metrics_port is not None:
+        serve_metrics(metrics.registry, metrics_port)
         if oformat == 'text':
-            console.print(f"[green]>[/green] Server [green]{screen_name}[/green] is [bold yellow]started[/bold yellow]!")
-    if oformat == 'json':
-        printjson(JsonOutput(status='success'))
+            console.print(f"[green]>[/green] Metrics are served on [cyan]http://127.0.0.1:{metrics_port}/metrics[/cyan]")
+    if metrics_file is not None:
+        writer = TextfileWriter(metrics.registry, metrics_file).start()
+    return metrics, writer
+
+def get_history() -> Optional[HistoryStore]:
+    if history_mode:
+        from .history import HistoryStore
+        return HistoryStore()
+
+def record_history(records: Iterable[Tuple[str, PingResult]]) -> None:
+    if (history:=get_history()) is None:
+        return
+    # * A broken history file must not hide the ping results
+    try:
+        for name, result in records:
+            history.record(name, result)
+    except (OSError, ValueError) as e:
+        if verbose_mode and (oformat == 'text'):
+            print_exception(e)
+    finally:
+        try: history.close()
+        except (OSError, ValueError): pass
+
+# ? Start Command
+@click.command("start", help="Run the server(s).")
+@click.argument("scn", type=str)
+@wait_options
+@parallel_option
+@hand_exception()
+def starter(scn: str, wait: bool, wait_timeout: float, probe: ProbeKind, parallel: int):
+    fleet_action(
+        lambda screen_name: start_one(screen_name, wait, wait_timeout, probe),
+        scn, parallel, "started"
+    )
 
 # ? Stop Command
 @click.command("stop", help="Stop the server(s).")
 @click.argument("scn", type=str)
+@parallel_option
 @hand_exception()
-def stoper(scn: str):
-    screens_names = scn.split(",")
-    for screen_name in screens_names:
-        msmanager.stop_server(screen_name)
-        if oformat == 'text':
-            console.print(f"[green]>[/green] Server [green]{screen_name}[/green] is [bold yellow]stoped[/bold yellow]!")
-    if oformat == 'json':
-        printjson(JsonOutput(status='success'))
+def stoper(scn: str, parallel: int):
+    fleet_action(msmanager.stop_server, scn, parallel, "stoped")
 
 # ? Restart Command
 @click.command("restart", help="Restart the server(s).")
 @click.argument("scn", type=str)
+@wait_options
+@parallel_option
+@hand_exception()
+def restarter(scn: str, wait: bool, wait_timeout: float, probe: ProbeKind, parallel: int):
+    fleet_action(
+        lambda screen_name: restart_one(screen_name, wait, wait_timeout, probe),
+        scn, parallel, "restarted"
+    )
+
+# ? Exec Command
+@click.command("exec", help="Send a console command to the server(s).")
+@click.argument("scn", type=str)
+@click.argument("command", type=str, nargs=-1, required=True)
+@click.option(
+    "-t", "--timeout", "timeout",
+    help="Maximum time to send the command and collect the reply of one server (in seconds).",
+    type=click.FLOAT, default=5, show_default=True
+)
+@click.option(
+    "-i", "--idle", "idle",
+    help="The reply is complete after this time without new lines (in seconds, 0 - do not wait for the reply).",
+    type=click.FLOAT, default=0.5, show_default=True
+)
 @click.option(
-    "-w", "--wait", "wait",
-    help="Waiting for the server to start up.",
-    is_flag=True
+    "-r", "--remote", "remote",
+    help="Connect to the host from the config instead of localhost.",
+    is_flag=True, default=False
 )
 @hand_exception()
-def restarter(scn: str, wait: bool):
-    screens_names = scn.split(",")
-    for screen_name in screens_names:
-        msmanager.stop_server(screen_name)
-        if oformat == 'text':
-            console.print(f"[green]>[/green] Server [green]{screen_name}[/green] is [bold yellow]stoped[/bold yellow]!")
-    for screen_name in screens_names:
-        msmanager.start_server(screen_name)
-        if (server_config:=msmanager.get_server_config(screen_name)) is not None:
-            if is_server_connect_correct(server_config.host, server_config.port, server_config.input_port) and wait:
-                wait_start_server(server_config.host, server_config.port, server_config.input_port)
-        if oformat == 'text':
-            console.print(f"Server [green]{screen_name}[/green] is [bold yellow]started[/bold yellow]!")
-    if oformat == 'json':
-        printjson(JsonOutput(status='success'))
+def executor(scn: str, command: Iterable[str], timeout: float, idle: float, remote: bool):
+    from .models import JsonOutput
+    command = " ".join(command)
+    results = msmanager.exec_servers(scn.split(","), command, timeout, idle, not remote)
+    if oformat == 'text':
+        for screen_name, result in results.items():
+            if isinstance(result, Exception):
+                console.print(f"[red]>[/red] Server [green]{screen_name}[/green]: {rich_exception(result)}")
+            else:
+                console.print(f"[green]>[/green] Server [green]{screen_name}[/green] ({result.elapsed:.2f} s):")
+                for line in result.lines:
+                    click.echo(f"\t{line}")
+    elif stream_mode:
+        for screen_name, result in results.items():
+            printrecord(
+                {"screen_name": screen_name, "command": command, "status": "error", "error": result} \
+                    if isinstance(result, Exception) else \
+                {"screen_name": screen_name, "command": command, "status": "success", **result.dict()}
+            )
+    elif oformat == 'json':
+        printjson(
+            JsonOutput(
+                status='success' if not any(isinstance(i, Exception) for i in results.values()) else 'error',
+                data={
+                    "command": command,
+                    "servers": [
+                        {"screen_name": screen_name, "status": "error", "error": exception_data(result)} \
+                            if isinstance(result, Exception) else \
+                        {"screen_name": screen_name, "status": "success", **result.dict()} \
+                            for screen_name, result in results.items()
+                    ]
+                }
+            )
+        )
 
 # ? List Command
+def server_record(server: MindustryServerConfig, started: Optional[bool]) -> Dict[str, Any]:
+    return {
+        "screen_name": server.screen_name,
+        "executable_filepath": server.executable_filepath,
+        "arguments": server.arguments,
+        "host": server.host,
+        "port": server.port,
+        "input_port": server.input_port,
+        "backend": server.backend,
+        "profile": server.profile,
+        "started": started
+    }
+
+def stream_pings(
+    servers: List[MindustryServerConfig],
+    timeout: int
+) -> Dict[Tuple[str, int], PingResult]:
+    from .pinging import iter_ping
+    # * Pinged directly (not through the agent) to print every server as soon as it answers
+    addresses: Dict[Tuple[str, int], List[MindustryServerConfig]] = {}
+    for server in servers:
+        if (server.host is not None) and (server.port is not None):
+            addresses.setdefault((server.host, server.port), []).append(server)
+        else:
+            printrecord(server_record(server, False))
+    results = {}
+    for address, result in iter_ping(addresses, timeout):
+        results[address] = result
+        for server in addresses[address]:
+            printrecord(server_record(server, not isinstance(result, Exception)))
+    return results
+
 @click.command("list", help="List of servers in the config.")
 @click.option(
     "--pinging", "-p", "pinging",
@@ -214,12 +612,42 @@ def restarter(scn: str, wait: bool):
     help="Maximum response waiting time (in seconds).",
     type=int, default=10, show_default=True
 )
+@metrics_file_option
 @hand_exception()
-def lister(pinging: bool, timeout: int):
+def lister(pinging: bool, timeout: int, metrics_file: Optional[str]):
+    from .models import JsonOutput
     if oformat == 'json':
         output = JsonOutput(status='success', data={"servers": []})
-    if len(msmanager.config.config.servers) != 0:
-        for idx, server in enumerate(msmanager.config.config.servers):
+    servers = msmanager.get_servers_config()
+    if pinging and stream_mode:
+        results = stream_pings(servers, timeout)
+    elif pinging:
+        results = msmanager.ping_servers(
+            [
+                (server.host, server.port) for server in servers \
+                    if (server.host is not None) and (server.port is not None)
+            ],
+            timeout
+        )
+    elif stream_mode:
+        for server in servers:
+            printrecord(server_record(server, None))
+    if pinging:
+        if metrics_file is not None:
+            from .metrics import ServerMetrics
+            metrics = ServerMetrics()
+            for server in servers:
+                if (address:=(server.host, server.port)) in results:
+                    metrics.observe_status(server.screen_name, results[address])
+            metrics.registry.write_textfile(metrics_file)
+        record_history(
+            (server.screen_name, results[address]) for server in servers \
+                if (address:=(server.host, server.port)) in results
+        )
+    if stream_mode:
+        return
+    if len(servers) != 0:
+        for idx, server in enumerate(servers):
             if oformat == 'text':
                 lines = [
                     f"({idx}) Server {repr(server.screen_name)}:",
@@ -227,29 +655,19 @@ def lister(pinging: bool, timeout: int):
                     f"[magenta]Arguments[/]           : {repr(server.arguments)}",
                     f"[magenta]Host[/]                : [green]{server.host}[/]",
                     f"[magenta]Port[/]                : [cyan]{server.port}[/]",
-                    f"[magenta]Input Port[/]          : [cyan]{server.input_port}[/]"
+                    f"[magenta]Input Port[/]          : [cyan]{server.input_port}[/]",
+                    f"[magenta]Backend[/]             : [yellow]{server.backend}[/]"
                 ]
+            started = None
             if pinging:
-                try:
-                    ping(server.host, server.port, timeout)
-                    started = True
-                except:
-                    started = False
+                address = (server.host, server.port)
+                started = (address in results) and not isinstance(results[address], Exception)
                 if oformat == 'text':
                     lines.append(f"[magenta]Started[/]             : {repr(started)}")
             if oformat == 'text':
                 console.print("\n\t".join(lines))
             if oformat == 'json':
-                output.data['servers'].append(
-                    {
-                        "executable_filepath": server.executable_filepath,
-                        "arguments": server.arguments,
-                        "host": server.host,
-                        "port": server.port,
-                        "input_port": server.input_port,
-                        "started": started
-                    }
-                )
+                output.data['servers'].append(server_record(server, started))
     else:
         if oformat == 'text':
             console.print("[green]>[/] The list of servers is [bold yellow]empty[/]!")
@@ -257,67 +675,137 @@ def lister(pinging: bool, timeout: int):
         printjson(output)
 
 # ? Ping Command
-@click.command("ping", help="Server status check.")
+def ping_record(target: str, status: PingResult) -> Dict[str, Any]:
+    from .pinging import status_to_dict
+    if isinstance(status, Exception):
+        return {"connect": target, "status": "error", "error": exception_data(status)}
+    return {"connect": target, "status": "success", **status_to_dict(status)}
+
+@click.command("ping", help="Server(s) status check.")
 @click.argument("connect", type=str)
 @click.option(
     "-t", "--timeout", "timeout",
     help="Maximum response waiting time (in seconds).",
     type=int, default=10, show_default=True
 )
+@metrics_file_option
 @hand_exception()
-def pinger(connect: str, timeout: int):
-    if (server_config:=msmanager.get_server_config(connect)) is not None:
-        connect_data = {"host": server_config.host, "port": server_config.port}
+def pinger(connect: str, timeout: int, metrics_file: Optional[str]):
+    from .models import JsonOutput
+    from .pinging import status_to_dict
+    targets: Dict[str, Union[Dict[str, Any], Exception]] = {}
+    for target in connect.split(","):
+        if (server_config:=msmanager.get_server_config(target)) is not None:
+            targets[target] = {"host": server_config.host, "port": server_config.port}
+        else:
+            try:
+                targets[target] = parse_connect_data(target)
+            except VBMLParseError:
+                targets[target] = IncorrectConnectionDataError(target)
+    addresses = [(i["host"], i["port"]) for i in targets.values() if isinstance(i, dict)]
+    if stream_mode:
+        from .pinging import iter_ping
+        results, by_address = {}, {}
+        for target, data in targets.items():
+            if isinstance(data, Exception):
+                printrecord(ping_record(target, data))
+            else:
+                by_address.setdefault((data["host"], data["port"]), []).append(target)
+        for address, result in iter_ping(addresses, timeout):
+            results[address] = result
+            for target in by_address[address]:
+                printrecord(ping_record(target, result))
     else:
-        try:
-            connect_data = parse_connect_data(connect)
-        except VBMLParseError:
-            if oformat == 'text':
-                raise IncorrectConnectionDataError(connect)
-            elif oformat == 'json':
-                printjson(
-                    JsonOutput(
-                        status='error',
-                        data={
-                            'name': 'IncorrectConnectionDataError',
-                            'args': [connect],
-                            'kwargs': {}
-                        }
+        results = msmanager.ping_servers(addresses, timeout)
+    statuses = {
+        target: (data if isinstance(data, Exception) else results[(data["host"], data["port"])]) \
+            for target, data in targets.items()
+    }
+    if metrics_file is not None:
+        from .metrics import ServerMetrics
+        metrics = ServerMetrics()
+        for target, status in statuses.items():
+            metrics.observe_status(target, status)
+        metrics.registry.write_textfile(metrics_file)
+    record_history((target, statuses[target]) for target, data in targets.items() if isinstance(data, dict))
+    if oformat == 'text':
+        for target, status in statuses.items():
+            if isinstance(status, Exception):
+                console.print(f"[red]>[/] Server {repr(target)}: {rich_exception(status)}")
+            else:
+                console.print(
+                    "\n\t".join(
+                        [
+                            f"[green]>[/] Server {endicext(status.name)}:",
+                            f"- [magenta]Players[/] : {status.players} players",
+                            f"- [magenta]Map[/]     : {repr(status.map)}",
+                            f"- [magenta]Wave[/]    : {status.wave} wave",
+                            f"- [magenta]Ping[/]    : {round(status.ping)} ms",
+                            f"- [magenta]Version[/] : {repr(status.version)}",
+                            f"- [magenta]Vertype[/] : {repr(status.vertype)}"
+                        ]
                     )
                 )
-    status = ping(connect_data["host"], connect_data["port"], timeout)
-    if oformat == 'text':
-        console.print(
-            "\n\t".join(
-                [
-                    f"[green]>[/] Server {endicext(status.name)}:",
-                    f"- [magenta]Players[/] : {status.players} players",
-                    f"- [magenta]Map[/]     : {repr(status.map)}",
-                    f"- [magenta]Wave[/]    : {status.wave} wave",
-                    f"- [magenta]Ping[/]    : {round(status.ping)} ms",
-                    f"- [magenta]Version[/] : {repr(status.version)}",
-                    f"- [magenta]Vertype[/] : {repr(status.vertype)}"
-                ]
+    elif (oformat == 'json') and not stream_mode:
+        if len(statuses) == 1:
+            status = list(statuses.values())[0]
+            if isinstance(status, Exception):
+                printjson(JsonOutput(status='error', data=exception_data(status)))
+            else:
+                printjson(JsonOutput(status='success', data=status_to_dict(status)))
+        else:
+            printjson(
+                JsonOutput(
+                    status='success',
+                    data={"servers": [ping_record(target, status) for target, status in statuses.items()]}
+                )
             )
+
+# ? Watchdog
+def watchdog_event(event: str, server_config: MindustryServerConfig, data: Dict[str, Any]) -> None:
+    if oformat == 'json':
+        # * The watchdog never finishes, so in json it prints a stream of events
+        printrecord({"time": time.time(), "event": event, "server": server_config.screen_name, **data})
+        if event == 'restart_failed':
+            save_exception(data['error'])
+    elif event == 'check':
+        if verbose_mode:
+            state = "[green]ON[/green]" if data["ok"] else "[red]OFF[/red]"
+            console.print(f"[yellow]>[/yellow] Checked {repr(server_config.screen_name)}: {state}")
+    elif event == 'tracked':
+        if verbose_mode:
+            console.print(f"[yellow]>[/yellow] Watching the process of {repr(server_config.screen_name)}: {data['pid']}")
+    elif event == 'exited':
+        console.print(f"[red]>[/red] The server process has exited: {repr(server_config.screen_name)} ({data['pid']})")
+    elif event == 'backoff':
+        console.print(
+            f"[yellow]>[/yellow] Waiting {data['delay']:.0f} second(s) before restart #{data['attempt'] + 1}: " \
+            f"{repr(server_config.screen_name)}"
         )
-    elif oformat == 'json':
-        printjson(
-            JsonOutput(
-                status='success',
-                data={
-                    "name": status.name,
-                    "players": status.players,
-                    "map": status.map,
-                    "wave": status.wave,
-                    "ping": status.ping,
-                    "version": status.version,
-                    "vertype": status.vertype
-                }
-            )
+    elif event == 'parked':
+        until = datetime.datetime.fromtimestamp(data['until']).strftime("%H:%M:%S")
+        console.print(
+            f"[red]>[/red] The server is parked after {data['restarts']} restart(s), " \
+            f"no restarts until {until}: {repr(server_config.screen_name)}"
         )
+    elif event == 'unparked':
+        console.print(f"[yellow]>[/yellow] The server is checked again after parking: {repr(server_config.screen_name)}")
+    elif event == 'restart':
+        console.print(f"[red]>[/red] Attempt to restart the server: {repr(server_config.screen_name)}")
+    elif event == 'restarted':
+        console.print(
+            f"[green]>[/green] The server has been restarted: {repr(server_config.screen_name)} " \
+            f"(ready in {data['result'].elapsed:.1f} s)"
+        )
+    elif event == 'restart_failed':
+        console.print(f"[red]>[/red] Failed to restart the server: {repr(server_config.screen_name)}")
+        save_exception(data['error'])
 
-# ? Watchdog
-@click.command("watchdog", help="The active process of monitoring servers, which, if the server fails, restarts it.")
+@click.command(
+    "watchdog",
+    help="The active process of monitoring servers, which, if the server fails, restarts it. " \
+        "The check and restart options are the defaults for the servers without their own health policy."
+)
 @click.argument("scn", type=str)
 @click.option(
     "--localhost", "-l", "localhost", 
@@ -327,23 +815,74 @@ def pinger(connect: str, timeout: int):
 @click.option(
     "--start-delay", "-d", "start_delay",
     help="The delay before watchdog starts (in secounds).",
-    type=click.INT, default=60, show_default=True
+    type=click.IntRange(min=0), default=60, show_default=True
 )
 @click.option(
     "--check-timeout", "-ct", "check_timeout",
-    help="The delay between process checks (in secounds).",
-    type=click.INT, default=1, show_default=True
+    help="The delay between repeated checks of a failed server (in secounds).",
+    type=click.IntRange(min=1), default=1, show_default=True
 )
 @click.option(
     "--checks", "-c", "checks",
-    help="How many times to check one server.",
-    type=click.INT, default=3, show_default=True
+    help="How many failed checks in a row are needed to restart a server.",
+    type=click.IntRange(min=1), default=3, show_default=True
 )
 @click.option(
     "--all-timeout", "-at", "all_timeout",
-    help="Runs a check of all servers once in a while (in secounds).",
-    type=click.INT, default=600, show_default=True
+    help="The interval between checks of each server (in secounds).",
+    type=click.IntRange(min=1), default=60, show_default=True
+)
+@click.option(
+    "--ping-timeout", "-pt", "ping_timeout",
+    help="Maximum response waiting time of one check (in seconds).",
+    type=click.IntRange(min=1), default=10, show_default=True
+)
+@click.option(
+    "--max-restarts", "-mr", "max_restarts",
+    help="How many servers can be restarted at the same time.",
+    type=click.IntRange(min=1), default=4, show_default=True
+)
+@click.option(
+    "--restart-limit", "-rl", "restart_limit",
+    help="How many restarts of a server in the restart window park it.",
+    type=click.IntRange(min=1), default=5, show_default=True
+)
+@click.option(
+    "--restart-window", "-rw", "restart_window",
+    help="The window in which the restarts are counted (in seconds).",
+    type=positive_float, default=600, show_default=True
+)
+@click.option(
+    "--backoff", "-b", "backoff",
+    help="The delay before the second restart in a row, doubled for each next one (in seconds).",
+    type=non_negative_float, default=5, show_default=True
+)
+@click.option(
+    "--backoff-max", "-bm", "backoff_max",
+    help="The longest delay between restarts in a row (in seconds).",
+    type=non_negative_float, default=300, show_default=True
+)
+@click.option(
+    "--cooldown", "-cd", "cooldown",
+    help="How long a parked server is left alone (in seconds).",
+    type=positive_float, default=1800, show_default=True
+)
+@click.option(
+    "--start-timeout", "-st", "start_timeout",
+    help="Maximum waiting time for a restarted server to start up (in seconds).",
+    type=positive_float, default=START_TIMEOUT, show_default=True
 )
+@click.option(
+    "--probe", "probe",
+    help="How to check that a restarted server is ready.",
+    type=click.Choice(['status', 'tcp', 'log']), default='status', show_default=True
+)
+@click.option(
+    "--no-process-watch", "no_process_watch",
+    help="Detect crashes by the pings only, without watching the server processes.",
+    default=False, is_flag=True
+)
+@metrics_options
 @hand_exception()
 def watchdog(
     scn: str,
@@ -351,58 +890,638 @@ def watchdog(
     start_delay: int,
     check_timeout: int,
     checks: int,
-    all_timeout: int
+    all_timeout: int,
+    ping_timeout: int,
+    max_restarts: int,
+    restart_limit: int,
+    restart_window: float,
+    backoff: float,
+    backoff_max: float,
+    cooldown: float,
+    start_timeout: float,
+    probe: ProbeKind,
+    no_process_watch: bool,
+    metrics_port: Optional[int],
+    metrics_file: Optional[str]
 ):
+    from .watchdog import Watchdog
     screens_names = scn.split(",")
     servers_config: List[MindustryServerConfig] = []
     for screen_name in screens_names:
         if (server_config := msmanager.get_server_config(screen_name)) is not None:
             if (server_config.host is not None) or (server_config.port is not None):
                 servers_config.append(server_config)
-                console.print(f"[green]>[/green] The server was found in the config: {repr(screen_name)}")
-            else:
+                if oformat == 'text':
+                    console.print(f"[green]>[/green] The server was found in the config: {repr(screen_name)}")
+            elif oformat == 'text':
                 console.print(f"[red]>[/red] There are no settings for ping: {repr(screen_name)}")
-        else:
+            else:
+                printrecord({"time": time.time(), "event": "skipped", "server": screen_name, "reason": "no_address"})
+        elif oformat == 'text':
             console.print(f"[red]>[/red] One of the listed servers was not found: {repr(screen_name)}")
-    console.print(f"[green]>[/green] Waiting {start_delay} second(s) before starting the watchdog operation.")
+        else:
+            printrecord({"time": time.time(), "event": "skipped", "server": screen_name, "reason": "not_found"})
+    if oformat == 'text':
+        console.print(f"[green]>[/green] Waiting {start_delay} second(s) before starting the watchdog operation.")
     time.sleep(start_delay)
-    console.print("[green]>[/green] Watchdog is started!")
+    metrics, writer = start_metrics(metrics_port, metrics_file)
+    if oformat == 'text':
+        console.print("[green]>[/green] Watchdog is started!")
+    try:
+        Watchdog(
+            msmanager,
+            servers_config,
+            interval=all_timeout,
+            check_timeout=check_timeout,
+            checks=checks,
+            ping_timeout=ping_timeout,
+            max_restarts=max_restarts,
+            restart_limit=restart_limit,
+            restart_window=restart_window,
+            backoff=backoff,
+            backoff_max=backoff_max,
+            cooldown=cooldown,
+            start_timeout=start_timeout,
+            probe=probe,
+            localhost=localhost,
+            process_watch=not no_process_watch,
+            on_event=watchdog_event,
+            metrics=metrics,
+            history=get_history()
+        ).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer is not None:
+            writer.stop()
+    if oformat == 'text':
+        console.print("[green]>[/green] Watchdog is shutdown!")
+
+# ? Policy
+@click.command(
+    "policy",
+    help="Show or change the health-check and restart policy of the server(s). " \
+        "A running watchdog picks up the change after the next check of the server."
+)
+@click.argument("scn", type=str)
+@click.option("--interval", "interval", help="The interval between checks (in seconds).", type=positive_float, default=None)
+@click.option("--check-timeout", "check_timeout", help="The delay between repeated checks of a failed server (in seconds).", type=positive_float, default=None)
+@click.option("--checks", "checks", help="How many failed checks in a row are needed to restart the server.", type=click.IntRange(min=1), default=None)
+@click.option("--ping-timeout", "ping_timeout", help="Maximum response waiting time of one check (in seconds).", type=positive_float, default=None)
+@click.option("--restart-limit", "restart_limit", help="How many restarts in the restart window park the server.", type=click.IntRange(min=1), default=None)
+@click.option("--restart-window", "restart_window", help="The window in which the restarts are counted (in seconds).", type=positive_float, default=None)
+@click.option("--backoff", "backoff", help="The delay before the second restart in a row, doubled for each next one (in seconds).", type=non_negative_float, default=None)
+@click.option("--backoff-max", "backoff_max", help="The longest delay between restarts in a row (in seconds).", type=non_negative_float, default=None)
+@click.option("--cooldown", "cooldown", help="How long a parked server is left alone (in seconds).", type=positive_float, default=None)
+@click.option("--reset", "reset", help="Remove the policy, the watchdog options are used again.", is_flag=True)
+@hand_exception()
+def policer(scn: str, reset: bool, **changes: Optional[float]):
+    from .models import HealthPolicy, JsonOutput
+    from .exceptions import ServerNotExistsError
+    changes = {key: value for key, value in changes.items() if value is not None}
+    output = JsonOutput(status='success', data={'servers': {}})
+    servers: Dict[str, MindustryServerConfig] = {}
+    for screen_name in scn.split(","):
+        if (server_config:=msmanager.get_server_config(screen_name)) is None:
+            raise ServerNotExistsError(screen_name)
+        servers[screen_name] = server_config
+    if reset or (len(changes) != 0):
+        # * Every server is checked first and all of them are written at once
+        healths = {
+            screen_name: None if reset else (server_config.health or HealthPolicy()).copy(update=changes) \
+                for screen_name, server_config in servers.items()
+        }
+        servers = {server.screen_name: server for server in msmanager.set_servers_health(healths)}
+    for screen_name, server_config in servers.items():
+        policy = (server_config.health or HealthPolicy()).dict()
+        if oformat == 'text':
+            console.print(
+                "\n\t".join(
+                    [
+                        f"[green]>[/] Server {repr(screen_name)}:",
+                        *[
+                            f"[magenta]{key.replace('_', ' ').capitalize():<14}[/] : " + \
+                                (f"[cyan]{value}[/]" if value is not None else "[yellow]watchdog option[/]") \
+                                for key, value in policy.items()
+                        ]
+                    ]
+                )
+            )
+        elif oformat == 'json':
+            output.data['servers'][screen_name] = policy
+    if oformat == 'json':
+        printjson(output)
+
+# ? Launch Profiles
+def heap_callback(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[str]:
+    if (value is not None) and (HEAP_SIZE_REGEX.match(value) is None):
+        raise click.BadParameter(f"{repr(value)} is not a heap size (512m, 4g, 1048576).")
+    return value
+
+def env_callback(ctx: click.Context, param: click.Parameter, value: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+    if len(value) == 0:
+        return None
+    env = {}
+    for item in value:
+        key, sep, item_value = item.partition("=")
+        if (len(sep) == 0) or (len(key) == 0):
+            raise click.BadParameter(f"{repr(item)} is not KEY=VALUE.")
+        env[key] = item_value
+    return env
+
+def print_profile(name: str, profile: LaunchProfile, screen_names: List[str]) -> None:
+    console.print(
+        "\n\t".join(
+            [
+                f"[green]>[/] Profile {repr(name)}:",
+                f"[magenta]Java[/]      : {profile.java or 'java'}",
+                f"[magenta]Heap[/]      : [cyan]{profile.min_heap or '-'}[/] .. [cyan]{profile.max_heap or '-'}[/]",
+                f"[magenta]JVM Flags[/] : {repr(profile.jvm_flags)}",
+                f"[magenta]Env[/]       : {repr(profile.env)}",
+                f"[magenta]AppCDS[/]    : {'[green]on[/]' if profile.cds else '[yellow]off[/]'}",
+                f"[magenta]Servers[/]   : {', '.join(screen_names) or '-'}"
+            ]
+        )
+    )
+
+@click.group("profile", help="Launch profiles: JVM flags, heap limits, environment and AppCDS archives.")
+def profile_group():
+    pass
+
+@profile_group.command("list", help="List of launch profiles.")
+@hand_exception()
+def profile_list():
+    from .models import JsonOutput
+    profiles, servers = msmanager.get_profiles(), msmanager.get_servers_config()
+    users = {name: [i.screen_name for i in servers if i.profile == name] for name in profiles}
+    if oformat == 'text':
+        if len(profiles) == 0:
+            console.print("[green]>[/] The list of profiles is [bold yellow]empty[/]!")
+        for name, profile in profiles.items():
+            print_profile(name, profile, users[name])
+    elif oformat == 'json':
+        printjson(
+            JsonOutput(
+                status='success',
+                data={"profiles": {name: {**profile.dict(), "servers": users[name]} for name, profile in profiles.items()}}
+            )
+        )
+
+@profile_group.command("set", help="Create or change a launch profile, only the given options are changed.")
+@click.argument("name", type=str)
+@click.option("--java", "java", help="The java binary to run the server with.", type=str, default=None)
+@click.option("--min-heap", "min_heap", help="The initial heap size (-Xms).", type=str, default=None, callback=heap_callback)
+@click.option("--max-heap", "max_heap", help="The maximum heap size (-Xmx).", type=str, default=None, callback=heap_callback)
+@click.option(
+    "-x", "--jvm-flag", "jvm_flags",
+    help="A JVM flag, replaces the flags of the profile (--jvm-flag=-XX:+UseZGC).",
+    type=str, multiple=True
+)
+@click.option(
+    "-e", "--env", "env",
+    help="An environment variable KEY=VALUE, replaces the environment of the profile.",
+    type=str, multiple=True, callback=env_callback
+)
+@click.option(
+    "--cds/--no-cds", "cds",
+    help="Generate and reuse an AppCDS archive per server jar version (JDK 13+).",
+    default=None
+)
+@hand_exception()
+def profile_set(
+    name: str,
+    java: Optional[str],
+    min_heap: Optional[str],
+    max_heap: Optional[str],
+    jvm_flags: Tuple[str, ...],
+    env: Optional[Dict[str, str]],
+    cds: Optional[bool]
+):
+    from .models import LaunchProfile, JsonOutput
+    changes = {"java": java, "min_heap": min_heap, "max_heap": max_heap, "env": env, "cds": cds}
+    changes = {key: value for key, value in changes.items() if value is not None}
+    if len(jvm_flags) != 0:
+        changes["jvm_flags"] = list(jvm_flags)
+    profile = (msmanager.get_profiles().get(name) or LaunchProfile()).copy(update=changes)
+    msmanager.set_profile(name, profile)
+    if oformat == 'text':
+        print_profile(name, profile, [i.screen_name for i in msmanager.get_servers_config() if i.profile == name])
+    elif oformat == 'json':
+        printjson(JsonOutput(status='success', data={"name": name, "profile": profile.dict()}))
+
+@profile_group.command("remove", help="Remove a launch profile that no server uses.")
+@click.argument("name", type=str)
+@hand_exception()
+def profile_remove(name: str):
+    from .models import JsonOutput
+    msmanager.remove_profile(name)
+    if oformat == 'text':
+        console.print("[green]>[/] Profile [bold yellow]removed[/]!")
+    elif oformat == 'json':
+        printjson(JsonOutput(status='success'))
+
+@profile_group.command("use", help="Set the launch profile of the server(s), without a profile the plain java is used.")
+@click.argument("scn", type=str)
+@click.argument("name", type=str, required=False, default=None)
+@hand_exception()
+def profile_use(scn: str, name: Optional[str]):
+    from .models import JsonOutput
+    for screen_name in scn.split(","):
+        msmanager.set_server_profile(screen_name, name)
+    if oformat == 'text':
+        console.print(
+            f"[green]>[/] The profile is [bold yellow]{'set' if name is not None else 'reset'}[/], " \
+            "it is used from the next start!"
+        )
+    elif oformat == 'json':
+        printjson(JsonOutput(status='success', data={"servers": scn.split(","), "profile": name}))
+
+@profile_group.command("clear-cds", help="Remove the generated AppCDS archives.")
+@hand_exception()
+def profile_clear_cds():
+    from .models import JsonOutput
+    from .launch import clear_archives
+    count = clear_archives()
+    if oformat == 'text':
+        console.print(f"[green]>[/] {count} archive(s) [bold yellow]removed[/]!")
+    elif oformat == 'json':
+        printjson(JsonOutput(status='success', data={"removed": count}))
+
+# ? History
+def timepoint_callback(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[float]:
+    if value is not None:
+        try:
+            return parse_timepoint(value)
+        except ValueError:
+            raise click.BadParameter(f"{repr(value)} is neither a duration (30s, 15m, 6h, 7d, 2w) nor a UNIX timestamp.")
+
+@click.command("history", help="The recorded status history of the server.")
+@click.argument("name", type=str)
+@click.option(
+    "--since", "-s", "since",
+    help="Start of the range: a duration back from now (30s, 15m, 6h, 7d, 2w) or a UNIX timestamp.",
+    type=str, default="1h", show_default=True, callback=timepoint_callback
+)
+@click.option(
+    "--until", "-u", "until",
+    help="End of the range, in the same format as --since.",
+    type=str, default=None, callback=timepoint_callback
+)
+@click.option(
+    "--resolution", "-r", "resolution",
+    help="The resolution of the records (auto picks one by the range length).",
+    type=click.Choice(['auto', 'raw', '1m', '1h']), default='auto', show_default=True
+)
+@click.option(
+    "--limit", "-n", "limit",
+    help="Show only the last N records.",
+    type=click.IntRange(min=1), default=None
+)
+@hand_exception()
+def historian(name: str, since: float, until: Optional[float], resolution: str, limit: Optional[int]):
+    from collections import deque
+    from .models import JsonOutput
+    from .history import HistoryStore, Sample, DEFAULT_CAPACITY
+    history = HistoryStore()
+    if resolution == 'auto':
+        span = (until or time.time()) - since
+        if span <= DEFAULT_CAPACITY['raw']:
+            resolution = 'raw'
+        elif span <= DEFAULT_CAPACITY['1m'] * 60:
+            resolution = '1m'
+        else:
+            resolution = '1h'
+    records = deque(history.query(name, resolution, since, until) if history.exists(name) else [], limit)
+    history.close()
+    if oformat == 'text':
+        if len(records) == 0:
+            console.print(f"[green]>[/] The history of {repr(name)} is [bold yellow]empty[/] in this range!")
+        for record in records:
+            dt = datetime.datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            if isinstance(record, Sample):
+                if record.up:
+                    console.print(
+                        f"[magenta]{dt}[/] [green]ON[/]  " \
+                        f"{round(record.ping)} ms, {record.players} players, {record.wave} wave"
+                    )
+                else:
+                    console.print(f"[magenta]{dt}[/] [red]OFF[/]")
+            else:
+                line = f"[magenta]{dt}[/] uptime [cyan]{record.uptime:.0%}[/] of {record.samples} sample(s)"
+                if record.up != 0:
+                    line += \
+                        f", ping {round(record.ping_avg)}/{round(record.ping_max)} ms" \
+                        f", players {record.players_avg:.1f}/{record.players_max}" \
+                        f", wave {record.wave_max}"
+                console.print(line)
+    elif oformat == 'json':
+        printjson(
+            JsonOutput(
+                status='success',
+                data={
+                    "name": name,
+                    "resolution": resolution,
+                    "records": [record._asdict() for record in records]
+                }
+            )
+        )
+
+# ? Logs
+@click.command("logs", help="The console log of the server.")
+@click.argument("screen_name", type=str)
+@click.option(
+    "--lines", "-n", "lines",
+    help="How many last lines to show (0 - all).",
+    type=click.IntRange(min=0), default=20, show_default=True
+)
+@click.option(
+    "--follow", "-f", "follow",
+    help="Keep showing new lines as they are written.",
+    is_flag=True, default=False
+)
+@click.option(
+    "--grep", "-g", "grep",
+    help="Show only the lines matching the regular expression.",
+    type=str, default=None
+)
+@click.option(
+    "--new", "new",
+    help="Show only the lines written since the previous call with this flag.",
+    is_flag=True, default=False
+)
+@click.option(
+    "--colors", "colors",
+    help="Keep the color codes of the console.",
+    is_flag=True, default=False
+)
+@hand_exception()
+def logger(screen_name: str, lines: int, follow: bool, grep: Optional[str], new: bool, colors: bool):
+    import re
+    from collections import deque
+    from .models import JsonOutput
+    from .units import LOG_OFFSETS_PATH
+    from .storage import DiskCache
+    from .logs import LogCursor, decode_line, tail_offset, search
+    from .exceptions import ServerLogNotFoundError
+    filepath = msmanager.get_server_log_path(screen_name)
+    if not os.path.exists(filepath):
+        raise ServerLogNotFoundError(screen_name, filepath)
+    pattern = None if grep is None else re.compile(grep.encode())
+    offsets = DiskCache(LOG_OFFSETS_PATH)
+    cursor = LogCursor(filepath)
+    records = deque(maxlen=lines or None)
+    if new and ((stored:=offsets.get(filepath)) is not None):
+        cursor.inode, cursor.offset = stored
+    elif pattern is not None:
+        # * Searching through mmap does not read the whole log into memory
+        cursor.offset = tail_offset(filepath, 0)
+        records.extend(line for offset, line in search(filepath, pattern) if offset < cursor.offset)
+    elif lines != 0:
+        cursor.offset = tail_offset(filepath, lines)
+    records.extend(line for line in cursor.lines() if (pattern is None) or (pattern.search(line) is not None))
+    if new:
+        offsets.set(filepath, [cursor.inode, cursor.offset])
+    if oformat == 'text':
+        for line in records:
+            click.echo(decode_line(line, colors))
+    elif oformat == 'json':
+        printjson(
+            JsonOutput(
+                status='success',
+                data={
+                    "screen_name": screen_name,
+                    "filepath": filepath,
+                    "offset": cursor.offset,
+                    "lines": [decode_line(line, colors) for line in records]
+                }
+            )
+        )
+    if follow:
+        try:
+            for line in cursor.follow():
+                if (pattern is None) or (pattern.search(line) is not None):
+                    if oformat == 'text':
+                        click.echo(decode_line(line, colors))
+                    elif oformat == 'json':
+                        printjson({"screen_name": screen_name, "line": decode_line(line, colors)})
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if new:
+                offsets.set(filepath, [cursor.inode, cursor.offset])
+
+# ? Simulate
+def range_callback(ctx: click.Context, param: click.Parameter, value: str) -> Tuple[float, float]:
     try:
-        while True:
-            for server_config in servers_config:
-                oks, server_host = 0, "localhost" if localhost else server_config.host
-                if verbose_mode:
-                    console.print(f"[yellow]>[/yellow] Checking: {repr(server_config.screen_name)}")
-                for _ in range(checks):
-                    if pingok(server_host, server_config.port):
-                        oks += 1
-                        if verbose_mode:
-                            console.print(f"[yellow]>[/yellow] Checked: [green]ON[/green]")
-                    else:
-                        if verbose_mode:
-                            console.print(f"[yellow]>[/yellow] Checked: [red]OFF[/red]")
-                    time.sleep(check_timeout)
-                if oks == 0:
-                    ok = False
-                    while not ok:
-                        console.print(f"[red]>[/red] Attempt to restart the server: {repr(server_config.screen_name)}")
-                        try:
-                            msmanager.stop_server(server_config.screen_name)
-                        except ServerIsStoppedError:
-                            pass
-                        try:
-                            msmanager.start_server(server_config.screen_name)
-                            wait_start_server(server_config.host, server_config.port, server_config.input_port)
-                            ok = True
-                        except ServerIsStartedError:
-                            save_print_exception()
-                            ok = False
-                        if ok:
-                            console.print(f"[green]>[/green] The server has been restarted: {repr(server_config.screen_name)}")
-            time.sleep(all_timeout)
+        low, _, high = value.partition(":")
+        low, high = float(low), float(high or low)
+    except ValueError:
+        raise click.BadParameter(f"{repr(value)} is neither a number nor a MIN:MAX range.")
+    if (low < 0) or (high < low):
+        raise click.BadParameter(f"{repr(value)} is not a valid range.")
+    return low, high
+
+def simulator_event(event: str, server: Any, data: Dict[str, Any]) -> None:
+    if event == 'up':
+        if verbose_mode:
+            console.print(f"[green]>[/green] Simulated server {repr(server.name)} is up ({server.port}/{server.input_port}).")
+    elif event == 'down':
+        console.print(
+            f"[red]>[/red] Simulated server {repr(server.name)} has {data['reason']} " \
+            f"after {data['uptime']:.1f} s of uptime."
+        )
+    elif event == 'stats':
+        console.print(
+            f"[yellow]>[/yellow] Up {data['up']}/{data['servers']}, " \
+            f"{data['answered']}/{data['queries']} status queries answered, " \
+            f"{data['commands']} commands, {data['crashed']} crashes, CPU {data['cpu']:.2f} s."
+        )
+
+@click.command("simulate", help="Run a fleet of fake servers that answer status queries and console commands.")
+@click.option(
+    "-n", "--count", "count",
+    help="How many servers to simulate.",
+    type=click.IntRange(min=1), default=10, show_default=True
+)
+@click.option(
+    "-h", "--host", "host",
+    help="The host to listen on.",
+    type=str, default="127.0.0.1", show_default=True
+)
+@click.option(
+    "-p", "--port", "port",
+    help="The status port of the first server, the next servers take the next ports.",
+    type=click.IntRange(min=1, max=65535), default=20000, show_default=True
+)
+@click.option(
+    "-i", "--input-port", "input_port",
+    help="The input port of the first server, the next servers take the next ports.",
+    type=click.IntRange(min=1, max=65535), default=30000, show_default=True
+)
+@click.option(
+    "--prefix", "prefix",
+    help="The name prefix of the simulated servers.",
+    type=str, default="sim-", show_default=True
+)
+@click.option(
+    "--latency", "latency",
+    help="The reply delay (in milliseconds).",
+    type=click.FloatRange(min=0), default=0, show_default=True
+)
+@click.option(
+    "--jitter", "jitter",
+    help="The random deviation of the reply delay (in milliseconds).",
+    type=click.FloatRange(min=0), default=0, show_default=True
+)
+@click.option(
+    "--loss", "loss",
+    help="The share of status queries left without a reply.",
+    type=click.FloatRange(min=0, max=1), default=0, show_default=True
+)
+@click.option(
+    "--crash-rate", "crash_rate",
+    help="The mean number of crashes of each server per hour.",
+    type=click.FloatRange(min=0), default=0, show_default=True
+)
+@click.option(
+    "--downtime", "downtime",
+    help="How long a crashed server stays down before starting again (in seconds, -1 - forever).",
+    type=click.FLOAT, default=30, show_default=True
+)
+@click.option(
+    "--slow-start", "slow_start",
+    help="How long a server starts up (in seconds, a number or a MIN:MAX range).",
+    type=str, default="0", show_default=True, callback=range_callback
+)
+@click.option(
+    "--duration", "duration",
+    help="Stop the simulation after this time (in seconds, 0 - run until interrupted).",
+    type=click.FloatRange(min=0), default=0, show_default=True
+)
+@click.option(
+    "--report", "report",
+    help="The interval of the statistics report (in seconds, 0 - only at the end).",
+    type=click.FloatRange(min=0), default=0, show_default=True
+)
+@click.option(
+    "--register", "register",
+    help="Add the simulated servers to the config while the simulation runs.",
+    is_flag=True, default=False
+)
+@hand_exception()
+def simulator(
+    count: int,
+    host: str,
+    port: int,
+    input_port: int,
+    prefix: str,
+    latency: float,
+    jitter: float,
+    loss: float,
+    crash_rate: float,
+    downtime: float,
+    slow_start: Tuple[float, float],
+    duration: float,
+    report: float,
+    register: bool
+):
+    from .units import CONFIG_PATH
+    from .config import MSManagerConfig
+    from .simulator import Simulator, register_servers, unregister_servers
+    fleet = Simulator(
+        count,
+        host=host, port=port, input_port=input_port, prefix=prefix,
+        latency=latency / 1000, jitter=jitter / 1000, loss=loss,
+        crash_rate=crash_rate, downtime=None if downtime < 0 else downtime,
+        slow_start=slow_start, report_interval=report or None,
+        on_event=simulator_event
+    )
+    config = None
+    if register:
+        config = MSManagerConfig(CONFIG_PATH)
+        register_servers(config, [server.config(os.getcwd()) for server in fleet.servers])
+        console.print(f"[green]>[/green] {count} simulated server(s) are added to the config.")
+    console.print(
+        f"[green]>[/green] Simulating {count} server(s) on {host}, " \
+        f"ports {port}-{port + count - 1} and input ports {input_port}-{input_port + count - 1}."
+    )
+    try:
+        fleet.start(duration or None)
     except KeyboardInterrupt:
         pass
-    console.print("[green]>[/green] Watchdog is shutdown!")
+    finally:
+        if config is not None:
+            unregister_servers(config, [server.name for server in fleet.servers])
+            console.print(f"[green]>[/green] The simulated servers are removed from the config.")
+    simulator_event("stats", None, {**fleet.get_state(), "cpu": time.process_time()})
+
+# ? Agent
+@click.group("agent", help="The resident process that keeps the servers state in memory.")
+def agent_group():
+    pass
+
+@agent_group.command("run", help="Run the agent in the foreground.")
+@click.option(
+    "--watch", "-w", "watch",
+    help="Servers (comma separated) for the watchdog inside the agent.",
+    type=str, default=None
+)
+@click.option(
+    "--ping-ttl", "ping_ttl",
+    help="How long the ping results are reused (in seconds).",
+    type=click.FLOAT, default=1, show_default=True
+)
+@metrics_options
+@hand_exception()
+def agent_runner(watch: Optional[str], ping_ttl: float, metrics_port: Optional[int], metrics_file: Optional[str]):
+    from .agent import Agent
+    from .watchdog import Watchdog
+    metrics, writer = start_metrics(metrics_port, metrics_file)
+    watchdog = None
+    if watch is not None:
+        servers_config = []
+        for screen_name in watch.split(","):
+            if (server_config:=msmanager.get_server_config(screen_name)) is not None:
+                servers_config.append(server_config)
+            else:
+                console.print(f"[red]>[/red] One of the listed servers was not found: {repr(screen_name)}")
+        watchdog = Watchdog(
+            msmanager, servers_config,
+            on_event=watchdog_event, metrics=metrics, history=get_history()
+        )
+    agent = Agent(msmanager, AGENT_SOCKET_PATH, ping_ttl, watchdog)
+    console.print(f"[green]>[/green] Agent is started on {repr(AGENT_SOCKET_PATH)}!")
+    try:
+        agent.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer is not None:
+            writer.stop()
+    console.print("[green]>[/green] Agent is shutdown!")
+
+@agent_group.command("status", help="The state of the running agent.")
+@hand_exception()
+def agent_status():
+    from .client import AgentClient
+    from .models import JsonOutput
+    state = AgentClient(AGENT_SOCKET_PATH).get_state()
+    if oformat == 'text':
+        console.print(
+            "\n\t".join(
+                [
+                    f"[green]>[/] Agent {repr(AGENT_SOCKET_PATH)}:",
+                    f"- [magenta]PID[/]      : {state['pid']}",
+                    f"- [magenta]Uptime[/]   : {round(state['uptime'])} s",
+                    f"- [magenta]Servers[/]  : {state['servers']}",
+                    f"- [magenta]Sessions[/] : {len(state['sessions'])}",
+                    f"- [magenta]Consoles[/] : {state['consoles']}",
+                    f"- [magenta]Watchdog[/] : {'off' if state['watchdog'] is None else len(state['watchdog'])}"
+                ]
+            )
+        )
+    elif oformat == 'json':
+        printjson(JsonOutput(status='success', data=state))
 
 # ! Main Group
 @click.group()
@@ -414,7 +1533,8 @@ def watchdog(
 
 @click.option(
     "--format", "-f", "output_format",
-    help="The output format.", type=click.Choice(['text', 'json']),
+    help="The output format (ndjson - one json record per line as soon as it is ready).",
+    type=click.Choice(['text', 'json', 'ndjson']),
     default="text", show_default=True
 )
 @click.option(
@@ -427,6 +1547,16 @@ def watchdog(
     help="Displaying more detailed logs.",
     is_flag=True, default=False
 )
+@click.option(
+    "--no-agent", "no_agent",
+    help="Do not use the running agent even if it is available.",
+    is_flag=True, default=False
+)
+@click.option(
+    "--no-history", "no_history",
+    help="Do not record the status history of the servers.",
+    is_flag=True, default=False
+)
 @click.version_option(
     version=prog_version,
     prog_name=prog_name
@@ -434,23 +1564,42 @@ def watchdog(
 @hand_exception()
 def main(
     check_environment: bool,
-    output_format: Literal['text', 'json'],
+    output_format: Literal['text', 'json', 'ndjson'],
     debug: bool,
-    verbose: bool
+    verbose: bool,
+    no_agent: bool,
+    no_history: bool
 ):
-    global msmanager, debug_mode, oformat, verbose_mode
-    debug_mode, verbose_mode, oformat = debug, verbose, output_format
+    global msmanager, debug_mode, oformat, verbose_mode, history_mode, stream_mode
+    debug_mode, verbose_mode = debug, verbose
+    oformat, stream_mode = 'json' if output_format == 'ndjson' else output_format, output_format == 'ndjson'
+    history_mode = not no_history
+    if (not no_agent) and (click.get_current_context().invoked_subcommand != "agent"):
+        from .client import AgentClient, agent_is_running
+        if agent_is_running(AGENT_SOCKET_PATH):
+            msmanager = AgentClient(AGENT_SOCKET_PATH)
+            return
+    from .msm import MSManager
     msmanager = MSManager(check_environment=check_environment)
 
 # ! Add in Group
 main.add_command(adder)
 main.add_command(remover)
+main.add_command(importer)
+main.add_command(exporter)
 main.add_command(starter)
 main.add_command(stoper)
 main.add_command(restarter)
+main.add_command(executor)
 main.add_command(lister)
 main.add_command(pinger)
 main.add_command(watchdog)
+main.add_command(policer)
+main.add_command(profile_group)
+main.add_command(historian)
+main.add_command(logger)
+main.add_command(simulator)
+main.add_command(agent_group)
 
 # ! Run
 def run():
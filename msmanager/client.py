@@ -0,0 +1,189 @@
+from __future__ import annotations
+import os
+import json
+import socket
+import builtins
+import threading
+from typing import TYPE_CHECKING, Optional, Iterable, Tuple, List, Dict, Any
+# * Local Imports
+from . import exceptions
+from .units import AGENT_SOCKET_PATH, AGENT_TIMEOUT
+from .exceptions import AgentNotRunningError
+
+# * Type Imports
+if TYPE_CHECKING:
+    from .pinging import PingResult
+    from .channel import CommandResult
+    from .models import MindustryServerConfig, HealthPolicy, LaunchProfile, ScreenSession
+
+# ! Functions
+def agent_is_running(socket_path: str=AGENT_SOCKET_PATH) -> bool:
+    if (not hasattr(socket, "AF_UNIX")) or (not os.path.exists(socket_path)):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(1)
+            connection.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+def decode_exception(data: Dict[str, Any]) -> Exception:
+    exception_class = getattr(exceptions, data["name"], None) or getattr(builtins, data["name"], None)
+    if not (isinstance(exception_class, type) and issubclass(exception_class, Exception)):
+        # * Keeps the name of an exception that is unknown on this side
+        exception_class = type(data["name"], (Exception,), {})
+    exception = exception_class.__new__(exception_class)
+    exception.args = tuple(data["args"])
+    return exception
+
+# ! Agent Client
+class AgentClient:
+    def __init__(self, socket_path: str=AGENT_SOCKET_PATH, timeout: float=AGENT_TIMEOUT) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        # * One connection per thread, the agent handles connections concurrently
+        self.local = threading.local()
+        self.connections: List[socket.socket] = []
+        self.connection()
+
+    def connection(self) -> Any:
+        if (file:=getattr(self.local, "file", None)) is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            try:
+                connection.connect(self.socket_path)
+            except OSError:
+                connection.close()
+                raise AgentNotRunningError(self.socket_path)
+            self.connections.append(connection)
+            file = self.local.file = connection.makefile("rwb")
+        return file
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        file = self.connection()
+        file.write(json.dumps({"method": method, "args": args, "kwargs": kwargs}).encode() + b"\n")
+        file.flush()
+        if len(line:=file.readline()) == 0:
+            raise AgentNotRunningError(self.socket_path)
+        response = json.loads(line)
+        if response["status"] == "error":
+            raise decode_exception(response["data"])
+        return response["data"]["result"]
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.close()
+        self.connections.clear()
+
+    # ? Config Managemant
+    def add_server_config(self, server: MindustryServerConfig) -> None:
+        return self.call("add_server_config", server.dict())
+
+    def add_servers_config(self, servers: Iterable[MindustryServerConfig]) -> int:
+        return self.call("add_servers_config", [i.dict() for i in servers])
+
+    def get_server_config(self, screen_name: str) -> Optional[MindustryServerConfig]:
+        from .models import MindustryServerConfig
+        if (data:=self.call("get_server_config", screen_name)) is not None:
+            return MindustryServerConfig.parse_obj(data)
+
+    def get_servers_config(self) -> List[MindustryServerConfig]:
+        from .models import MindustryServerConfig
+        return [MindustryServerConfig.parse_obj(i) for i in self.call("get_servers_config")]
+
+    def exists_server_config(self, screen_name: str) -> bool:
+        return self.call("exists_server_config", screen_name)
+
+    def remove_server_config(self, screen_name: str) -> None:
+        return self.call("remove_server_config", screen_name)
+
+    def set_server_health(self, screen_name: str, health: Optional[HealthPolicy]) -> MindustryServerConfig:
+        from .models import MindustryServerConfig
+        return MindustryServerConfig.parse_obj(
+            self.call("set_server_health", screen_name, None if health is None else health.dict())
+        )
+
+    def set_servers_health(self, healths: Dict[str, Optional[HealthPolicy]]) -> List[MindustryServerConfig]:
+        from .models import MindustryServerConfig
+        return [
+            MindustryServerConfig.parse_obj(i) for i in self.call(
+                "set_servers_health",
+                {screen_name: None if health is None else health.dict() for screen_name, health in healths.items()}
+            )
+        ]
+
+    def set_server_profile(self, screen_name: str, profile: Optional[str]) -> MindustryServerConfig:
+        from .models import MindustryServerConfig
+        return MindustryServerConfig.parse_obj(self.call("set_server_profile", screen_name, profile))
+
+    # ? Launch Profiles
+    def get_profiles(self) -> Dict[str, LaunchProfile]:
+        from .models import LaunchProfile
+        return {name: LaunchProfile.parse_obj(data) for name, data in self.call("get_profiles").items()}
+
+    def set_profile(self, name: str, profile: LaunchProfile) -> None:
+        return self.call("set_profile", name, profile.dict())
+
+    def remove_profile(self, name: str) -> None:
+        return self.call("remove_profile", name)
+
+    # ? Server Status
+    def ping_servers(
+        self,
+        targets: Iterable[Tuple[str, int]],
+        timeout: float=10
+    ) -> Dict[Tuple[str, int], PingResult]:
+        import pydustry
+        results = {}
+        for address, value in self.call("ping_servers", [list(i) for i in targets], timeout):
+            if "__error__" in value:
+                results[tuple(address)] = decode_exception(value["__error__"])
+            else:
+                results[tuple(address)] = pydustry.Status(**value)
+        return results
+
+    def get_state(self) -> Dict[str, Any]:
+        return self.call("get_state")
+
+    # ? Server Managemant
+    def get_sessions(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        from .models import ScreenSession
+        return {
+            name: ScreenSession.parse_obj(data) \
+                for name, data in self.call("get_sessions", refresh).items()
+        }
+
+    def server_is_started(self, screen_name: str) -> bool:
+        return self.call("server_is_started", screen_name)
+
+    def get_server_pid(self, screen_name: str) -> Optional[int]:
+        return self.call("get_server_pid", screen_name)
+
+    def start_server(self, screen_name: str) -> None:
+        return self.call("start_server", screen_name)
+
+    def stop_server(self, screen_name: str) -> None:
+        return self.call("stop_server", screen_name)
+
+    def restart_server(self, screen_name: str) -> None:
+        return self.call("restart_server", screen_name)
+
+    # ? Server Console
+    def exec_servers(
+        self,
+        screen_names: Iterable[str],
+        command: str,
+        timeout: float=5,
+        idle: float=0.5,
+        localhost: bool=True
+    ) -> Dict[str, CommandResult]:
+        from .models import CommandReply
+        return {
+            name: decode_exception(value["__error__"]) if "__error__" in value else CommandReply.parse_obj(value) \
+                for name, value in self.call("exec_servers", list(screen_names), command, timeout, idle, localhost).items()
+        }
+
+    # ? Server Logs
+    def get_server_log_path(self, screen_name: str) -> str:
+        return self.call("get_server_log_path", screen_name)
@@ -1,11 +1,20 @@
 import os
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
-from .models import MainConfig, MindustryServerConfig
+from contextlib import contextmanager
+from typing import Optional, Iterable, Tuple, List, Dict, Iterator, Any
+from .models import MainConfig, MindustryServerConfig, LaunchProfile
+from .storage import Signature, get_signature, atomic_write, file_lock
 from .exceptions import (
-    ServerExistsError, ServerNotExistsError
+    ServerExistsError, ServerNotExistsError, ServerAddressExistsError,
+    ProfileNotExistsError, ProfileInUseError
 )
+# ! Types
+Index = Tuple[Dict[str, int], Dict[Tuple[str, int], str], Dict[str, List[str]]]
+
+# ! Vars
+# * Parsed configs of this process, keyed by path and checked against (mtime, size)
+configs_cache: Dict[str, Tuple[Signature, MainConfig]] = {}
 
 # ! Config Manager
 class MSManagerConfig:
@@ -15,8 +24,7 @@ class MSManagerConfig:
     
     @staticmethod
     def dump(filepath: str, data: MainConfig) -> None:
-        with open(filepath, "w") as file:
-            file.write(data.json())
+        atomic_write(filepath, data.json())
     
     @staticmethod
     def json_load(filepath: str) -> Dict[str, Any]:
@@ -25,46 +33,180 @@ class MSManagerConfig:
     
     @staticmethod
     def json_dump(filepath: str, data: Dict[str, Any]) -> None:
-        with open(filepath, "w") as file:
-            json.dump(data, file)
+        atomic_write(filepath, json.dumps(data))
+    
+    @staticmethod
+    def read(filepath: str) -> MainConfig:
+        config_data = MainConfig().dict()
+        if os.path.exists(filepath):
+            try: config_data.update(MSManagerConfig.json_load(filepath))
+            except: pass
+        try: return MainConfig.parse_obj(config_data)
+        except: return MainConfig()
+    
+    @staticmethod
+    def server_addresses(server: MindustryServerConfig) -> List[Tuple[str, int]]:
+        if server.host is None:
+            return []
+        return [(server.host, port) for port in (server.port, server.input_port) if port is not None]
+    
+    def refresh(self) -> None:
+        try:
+            self.dump(self.name, self.config)
+        except:
+            configs_cache.pop(self.name, None)
+            raise
+        self.signature = get_signature(self.name)
+        configs_cache[self.name] = (self.signature, self.config)
     
-    def refresh(self) -> None: self.dump(self.name, self.config)
+    def reload(self) -> bool:
+        signature = get_signature(self.name)
+        if (self.signature is not None) and (signature == self.signature):
+            return False
+        cached = configs_cache.get(self.name)
+        if (cached is not None) and (signature is not None) and (cached[0] == signature):
+            self.config = cached[1]
+        else:
+            self.config = self.read(self.name)
+            if signature is not None:
+                configs_cache[self.name] = (signature, self.config)
+        self.signature = signature
+        self.reindex()
+        return True
+    
+    @contextmanager
+    def transaction(self) -> Iterator[MainConfig]:
+        with file_lock(self.name):
+            self.reload()
+            try:
+                yield self.config
+            except:
+                # * The config may be partially changed, so it will be re-read
+                self.signature = None
+                configs_cache.pop(self.name, None)
+                raise
+            self.refresh()
+    
+    def index_server(self, idx: int, server: MindustryServerConfig, index: Optional[Index]=None) -> None:
+        names, addresses, executables = index or (self.names, self.addresses, self.executables)
+        names.setdefault(server.screen_name, idx)
+        for address in self.server_addresses(server):
+            addresses.setdefault(address, server.screen_name)
+        executables.setdefault(server.executable_filepath, []).append(server.screen_name)
+    
+    def reindex(self) -> None:
+        # * Built aside and swapped in at once, the agent threads read the index while it is rebuilt
+        index: Index = ({}, {}, {})
+        for idx, server in enumerate(self.config.servers):
+            self.index_server(idx, server, index)
+        self.names, self.addresses, self.executables = index
     
     def __init__(self, config_path: str) -> None:
         self.name = os.path.abspath(config_path)
         self.name_path = Path(self.name)
-        
-        config_data = MainConfig().dict()
-        if self.name_path.exists():
-            try: config_data.update(self.json_load(self.name))
-            except: pass
-        try: self.config = MainConfig.parse_obj(config_data)
-        except: self.config = MainConfig()
-        self.refresh()
+        self.signature: Optional[Signature] = None
+        self.reload()
 
     def get_server(self, screen_name: str) -> Optional[MindustryServerConfig]:
-        for server in self.config.servers:
-            if server.screen_name == screen_name:
-                return server
+        if (idx:=self.names.get(screen_name)) is not None:
+            servers = self.config.servers
+            if (idx < len(servers)) and (servers[idx].screen_name == screen_name):
+                return servers[idx]
+            # * The config was swapped by a reload and the index is not swapped yet
+            for server in servers:
+                if server.screen_name == screen_name:
+                    return server
     
     def get_server_index(self, screen_name: str) -> Optional[int]:
-        for idx, server in enumerate(self.config.servers):
-            if server.screen_name == screen_name:
-                return idx
+        return self.names.get(screen_name)
+    
+    def get_server_by_address(self, host: str, port: int) -> Optional[MindustryServerConfig]:
+        if (screen_name:=self.addresses.get((host, port))) is not None:
+            return self.get_server(screen_name)
+    
+    def get_servers_by_executable(self, executable_filepath: str) -> List[MindustryServerConfig]:
+        return [
+            self.get_server(screen_name) \
+                for screen_name in self.executables.get(os.path.abspath(executable_filepath), [])
+        ]
     
     def exists_server(self, screen_name: str) -> bool:
-        return self.get_server(screen_name) is not None
+        return screen_name in self.names
+    
+    def check_server(self, server: MindustryServerConfig) -> None:
+        if self.exists_server(server.screen_name):
+            raise ServerExistsError(server.screen_name)
+        for address in self.server_addresses(server):
+            if (screen_name:=self.addresses.get(address)) is not None:
+                raise ServerAddressExistsError(screen_name, *address)
+        if (server.profile is not None) and (server.profile not in self.config.profiles):
+            raise ProfileNotExistsError(server.profile)
     
     def add_server(self, server: MindustryServerConfig) -> None:
-        if not self.exists_server(server.screen_name):
+        with self.transaction():
+            self.check_server(server)
             self.config.servers.append(server)
-            self.refresh()
-        else:
-            raise ServerExistsError(server.screen_name)
+            self.index_server(len(self.config.servers) - 1, server)
+    
+    def add_servers(self, servers: Iterable[MindustryServerConfig]) -> int:
+        servers = list(servers)
+        # * One write for the whole batch, nothing is added (even in memory) if any of the servers is rejected
+        with self.transaction():
+            names, addresses = set(), {}
+            for server in servers:
+                self.check_server(server)
+                if server.screen_name in names:
+                    raise ServerExistsError(server.screen_name)
+                for address in self.server_addresses(server):
+                    if (screen_name:=addresses.get(address)) is not None:
+                        raise ServerAddressExistsError(screen_name, *address)
+                    addresses[address] = server.screen_name
+                names.add(server.screen_name)
+            for server in servers:
+                self.config.servers.append(server)
+                self.index_server(len(self.config.servers) - 1, server)
+        return len(servers)
     
     def remove_server(self, screen_name: str) -> None:
-        if (server_index:=self.get_server_index(screen_name)) is not None:
-            self.config.servers.pop(server_index)
-            self.refresh()
-        else:
-            raise ServerNotExistsError(screen_name)
\ No newline at end of file
+        with self.transaction():
+            if (server_index:=self.get_server_index(screen_name)) is not None:
+                self.config.servers.pop(server_index)
+                self.reindex()
+            else:
+                raise ServerNotExistsError(screen_name)
+    
+    def update_server(self, screen_name: str, **changes: Any) -> MindustryServerConfig:
+        return self.update_servers({screen_name: changes})[0]
+    
+    def update_servers(self, changes: Dict[str, Dict[str, Any]]) -> List[MindustryServerConfig]:
+        # * One write for the whole batch, nothing is changed if any of the servers is rejected
+        with self.transaction():
+            updated: List[Tuple[int, MindustryServerConfig]] = []
+            for screen_name, server_changes in changes.items():
+                if (server_index:=self.get_server_index(screen_name)) is None:
+                    raise ServerNotExistsError(screen_name)
+                if (server_changes.get("profile") is not None) and (server_changes["profile"] not in self.config.profiles):
+                    raise ProfileNotExistsError(server_changes["profile"])
+                updated.append(
+                    (server_index, MindustryServerConfig.parse_obj({**self.config.servers[server_index].dict(), **server_changes}))
+                )
+            for server_index, server in updated:
+                self.config.servers[server_index] = server
+            self.reindex()
+            return [server for _, server in updated]
+    
+    # ? Launch Profiles
+    def get_profile(self, name: str) -> Optional[LaunchProfile]:
+        return self.config.profiles.get(name)
+    
+    def set_profile(self, name: str, profile: LaunchProfile) -> None:
+        with self.transaction():
+            self.config.profiles[name] = profile
+    
+    def remove_profile(self, name: str) -> None:
+        with self.transaction():
+            if name not in self.config.profiles:
+                raise ProfileNotExistsError(name)
+            if len(screen_names:=[i.screen_name for i in self.config.servers if i.profile == name]) != 0:
+                raise ProfileInUseError(name, screen_names)
+            del self.config.profiles[name]
@@ -0,0 +1,193 @@
+import os
+import io
+import gzip
+import time
+import queue
+import shutil
+import hashlib
+import datetime
+import threading
+import traceback
+from typing import Optional, Tuple, Dict, Any
+# * Local Imports
+from .units import ERRORLOG_DIRPATH
+
+# ! Constants
+ERRORLOG_NAME = "errors.log"
+LAST_ERROR_NAME = "last.log"
+MAX_BYTES = 1024 * 1024
+BACKUPS = 5
+DEDUP_WINDOW = 3600
+FLUSH_INTERVAL = 5
+RENDER_WIDTH = 120
+
+# ! Functions
+def error_key(error: BaseException) -> str:
+    # * Identical tracebacks have the same type, message and frames (the locals are not compared)
+    frames = traceback.extract_tb(error.__traceback__)
+    text = "\n".join(
+        [
+            f"{error.__class__.__module__}.{error.__class__.__qualname__}: {error}",
+            *[f"{frame.filename}:{frame.lineno}:{frame.name}" for frame in frames]
+        ]
+    )
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=6).hexdigest()
+
+def render_error(error: BaseException, show_locals: bool=True) -> str:
+    from rich.console import Console
+    from rich.traceback import Traceback
+    console = Console(file=io.StringIO(), width=RENDER_WIDTH, color_system=None, force_terminal=False)
+    console.print(
+        Traceback.from_exception(
+            type(error), error, error.__traceback__,
+            word_wrap=True, show_locals=show_locals
+        )
+    )
+    return console.file.getvalue()
+
+def format_time(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+# ! Error Log
+class ErrorLog:
+    def __init__(
+        self,
+        dirpath: str=ERRORLOG_DIRPATH,
+        *,
+        max_bytes: int=MAX_BYTES,
+        backups: int=BACKUPS,
+        compress: bool=True,
+        dedup_window: float=DEDUP_WINDOW,
+        flush_interval: float=FLUSH_INTERVAL,
+        show_locals: bool=True
+    ) -> None:
+        self.dirpath = dirpath
+        self.max_bytes = max_bytes
+        self.backups = max(0, backups)
+        self.compress = compress
+        self.dedup_window = dedup_window
+        self.flush_interval = flush_interval
+        self.show_locals = show_locals
+        # * key -> [first time, last time, repeats not written yet, traceback written]
+        self.seen: Dict[str, list] = {}
+        self.lock = threading.Lock()
+        self.queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def filepath(self) -> str:
+        return os.path.join(self.dirpath, ERRORLOG_NAME)
+
+    def segment_path(self, idx: int) -> str:
+        return os.path.join(self.dirpath, f"errors.{idx}.log" + (".gz" if self.compress else ""))
+
+    # ? Producer
+    def record(self, error: BaseException) -> str:
+        key, now = error_key(error), time.time()
+        with self.lock:
+            seen = self.seen.get(key)
+            if (seen is not None) and (now - seen[1] < self.dedup_window):
+                # * A repeated traceback is only counted, it is written as one line later
+                seen[1], seen[2] = now, seen[2] + 1
+                return key
+            self.seen[key] = [now, now, 0, False]
+            self.start()
+        self.queue.put(("error", (key, now, error)))
+        return key
+
+    def start(self) -> None:
+        if (self.thread is None) or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name="msmanager-errorlog", daemon=True)
+            self.thread.start()
+
+    def close(self, timeout: Optional[float]=10) -> None:
+        if (self.thread is not None) and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+        self.thread = None
+
+    # ? Writer
+    def run(self) -> None:
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.write_repeats()
+                continue
+            if item is None:
+                self.write_repeats()
+                break
+            key, timestamp, error = item[1]
+            self.write_repeats()
+            try:
+                text = render_error(error, self.show_locals)
+            except Exception:
+                text = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+            self.write(f"==== {format_time(timestamp)} | {error.__class__.__name__} | {key} ====\n{text}\n", text)
+            with self.lock:
+                if (seen:=self.seen.get(key)) is not None:
+                    seen[3] = True
+
+    def write_repeats(self) -> None:
+        with self.lock:
+            now, repeats = time.time(), []
+            for key, seen in list(self.seen.items()):
+                if not seen[3]:
+                    # * The repeats are counted until the traceback itself is written
+                    continue
+                if seen[2] != 0:
+                    repeats.append((key, seen[0], seen[1], seen[2]))
+                    seen[2] = 0
+                elif now - seen[1] >= self.dedup_window:
+                    del self.seen[key]
+        for key, first, last, count in repeats:
+            self.write(
+                f"==== {format_time(last)} | {key} | repeated {count} time(s) since {format_time(first)} ====\n\n"
+            )
+
+    def write(self, entry: str, last_error: Optional[str]=None) -> None:
+        data = entry.encode("utf-8", "replace")
+        try:
+            os.makedirs(self.dirpath, exist_ok=True)
+            try:
+                size = os.path.getsize(self.filepath)
+            except OSError:
+                size = 0
+            if (size != 0) and (size + len(data) > self.max_bytes):
+                self.rotate()
+            with open(self.filepath, "ab") as file:
+                file.write(data)
+            if last_error is not None:
+                with open(os.path.join(self.dirpath, LAST_ERROR_NAME), "w", encoding="utf-8") as file:
+                    file.write(last_error)
+        except OSError:
+            # * The error log must never break the caller
+            pass
+
+    def rotate(self) -> None:
+        if self.backups == 0:
+            os.remove(self.filepath)
+            return
+        if os.path.exists(oldest:=self.segment_path(self.backups)):
+            os.remove(oldest)
+        for idx in range(self.backups - 1, 0, -1):
+            if os.path.exists(segment:=self.segment_path(idx)):
+                os.replace(segment, self.segment_path(idx + 1))
+        if self.compress:
+            with open(self.filepath, "rb") as source, gzip.open(self.segment_path(1), "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(self.filepath)
+        else:
+            os.replace(self.filepath, self.segment_path(1))
+
+# ! Default Error Log
+default_errorlog: Optional[ErrorLog] = None
+
+def get_errorlog() -> ErrorLog:
+    global default_errorlog
+    if default_errorlog is None:
+        import atexit
+        default_errorlog = ErrorLog()
+        # * The queued tracebacks are written before the process exits
+        atexit.register(default_errorlog.close)
+    return default_errorlog
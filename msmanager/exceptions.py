@@ -1,3 +1,4 @@
+from typing import List
 from .units import SUPPORT_PLATFORMS
 
 # ! System Exceptions
@@ -36,6 +37,13 @@ class VBMLParseError(Exception):
             "There was an error parsing through vbml.",
         )
 
+class ServerVersionError(Exception):
+    """Indicates that the server version could not be determined."""
+    def __init__(self, jarfilepath: str) -> None:
+        """Called if the version of the server executable file could not be read."""
+        self.args = (
+            f"Could not read the server version from {repr(jarfilepath)}.",
+        )
 
 # ! Config Exceptions
 class ServerExistsError(Exception):
@@ -54,6 +62,40 @@ class ServerNotExistsError(Exception):
             f"A server named {repr(name)} does not exist in the config.",
         )
 
+class ProfileNotExistsError(Exception):
+    """Indicates that the launch profile does not exist in the config."""
+    def __init__(self, name: str) -> None:
+        """Called if a server refers to a launch profile that is not in the config."""
+        self.args = (
+            f"A launch profile named {repr(name)} does not exist in the config.",
+        )
+
+class ProfileInUseError(Exception):
+    """Indicates that the launch profile is used by servers."""
+    def __init__(self, name: str, screen_names: List[str]) -> None:
+        """Called when removing a launch profile that servers still refer to."""
+        self.args = (
+            f"The launch profile {repr(name)} is used by the servers: {', '.join(repr(i) for i in screen_names)}.",
+        )
+
+class ServerAddressExistsError(Exception):
+    """Indicates that the server address is already taken by another server."""
+    def __init__(self, name: str, host: str, port: int) -> None:
+        """Called if the host and port of a server are already used by another server in the config."""
+        self.args = (
+            f"The address {host}:{port} is already used by the server named {repr(name)}.",
+        )
+
+class ManifestError(Exception):
+    """Indicates that a server manifest could not be imported."""
+    def __init__(self, filepath: str, errors: List[str]) -> None:
+        """Called if the manifest cannot be read or some of its entries are not valid servers."""
+        self.errors = errors
+        self.args = (
+            f"The manifest {repr(filepath)} has {len(errors)} error(s): " + "; ".join(errors[:10]) + \
+                ("; ..." if len(errors) > 10 else ""),
+        )
+
 # ! Server Actions Exceptions
 class ServerIsStartedError(Exception):
     """Indicates that the server is already running."""
@@ -71,6 +113,63 @@ class ServerIsStoppedError(Exception):
             f"The {repr(name)} server is stopped as it is.",
         )
 
+class ServerStartTimeoutError(Exception):
+    """Indicates that the server did not become ready in time."""
+    def __init__(self, name: str, timeout: float) -> None:
+        """Called if the server is not ready after the waiting timeout."""
+        self.args = (
+            f"The {repr(name)} server did not become ready in {timeout} second(s).",
+        )
+
+class ServerLogNotFoundError(Exception):
+    """Indicates that the server has no console log."""
+    def __init__(self, name: str, filepath: str) -> None:
+        """Called if the console log of the server has not been written yet."""
+        self.args = (
+            f"The {repr(name)} server has no console log at {repr(filepath)}, it is written from the next start.",
+        )
+
+class ServerInputPortError(Exception):
+    """Indicates that the server has no input port."""
+    def __init__(self, name: str) -> None:
+        """Called when sending a console command to a server without the input port in the config."""
+        self.args = (
+            f"The {repr(name)} server has no input port in the config to send console commands.",
+        )
+
+class BackendNotSupportedError(Exception):
+    """Indicates that the process backend does not work on this system."""
+    def __init__(self, name: str) -> None:
+        """Called when starting a server with a backend that is not supported on this platform."""
+        self.args = (
+            f"The {repr(name)} backend is not supported on this system.",
+        )
+
+# ! Agent Exceptions
+class AgentIsRunningError(Exception):
+    """Indicates that the agent is already running."""
+    def __init__(self, socket_path: str) -> None:
+        """Called when attempting to start a second agent on the same socket."""
+        self.args = (
+            f"The agent is already running on {repr(socket_path)}.",
+        )
+
+class AgentNotRunningError(Exception):
+    """Indicates that the agent is not running."""
+    def __init__(self, socket_path: str) -> None:
+        """Called if there is no agent listening on the socket."""
+        self.args = (
+            f"The agent is not running on {repr(socket_path)}.",
+        )
+
+class AgentMethodError(Exception):
+    """Indicates an unknown agent method."""
+    def __init__(self, method: str) -> None:
+        """Called if the agent was asked to call a method it does not serve."""
+        self.args = (
+            f"The agent does not serve the {repr(method)} method.",
+        )
+
 # ! CLI Exception
 class IncorrectConnectionDataError(Exception):
     """Indicates incorrect data to connect to the server."""
@@ -1,20 +1,44 @@
+from __future__ import annotations
+import os
 import re
-import pydustry
+import json
+import time
+import shutil
 import platform
-from versioner import Version
-from vbml import Pattern, Patcher
-from subprocess import getstatusoutput
-from typing import Tuple, Dict, Any, Iterable, Optional
+import threading
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Iterable, Iterator, Callable, Optional, TypeVar, Union
 # * Local Imports
-from .types import DefaultVersioner, DefaultVBMLPacther
-from .units import SUPPORT_PLATFORMS, COLOR_PATTERN
+from .types import get_versioner, get_vbml_patcher, get_vbml_pattern
+from .parsers import remove_color, parse_address, parse_java_version, find_server_version
+from .units import (
+    SUPPORT_PLATFORMS, BUILD_PATTERN,
+    PROBES_CACHE_PATH, VERSIONS_CACHE_PATH,
+    PROBE_TIMEOUT, START_TIMEOUT, JVM_VERSION_TIMEOUT
+)
+from .storage import DiskCache
 from .exceptions import (
     VBMLParseError, 
+    ServerVersionError,
     PlatformSupportError,
     ScreenNotWorkingError,
     JavaNotFound
 )
 
+# * Type Imports
+if TYPE_CHECKING:
+    import pydustry
+    from vbml import Patcher
+    from versioner import Version
+    from .models import ReadinessResult
+    from .readiness import Probe
+
+# ! Types
+T = TypeVar("T")
+
+# ! Vars
+probes_cache = DiskCache(PROBES_CACHE_PATH)
+versions_cache = DiskCache(VERSIONS_CACHE_PATH, 1024)
+
 # ! Standart Functions
 def replaces(string: str, replaceble: Dict[str, str]) -> str:
     for __old, __new in replaceble.items():
@@ -24,23 +48,55 @@ def replaces(string: str, replaceble: Dict[str, str]) -> str:
 def rich_exception(exception: Exception) -> str:
     return f"[red]{exception.__class__.__name__}:[/] {' '.join([str(i) for i in exception.args])}"
 
+def exception_data(e: BaseException) -> Dict[str, Any]:
+    return {
+        'name': e.__class__.__name__,
+        'args': list(e.args),
+        'kwargs': {}
+    }
+
 def endicext(string: str) -> str:
     return string + ("[/]" * string.count("]"))
 
+def run_parallel(
+    func: Callable[[str], T],
+    items: Iterable[str],
+    parallel: int=1
+) -> Iterator[Tuple[str, Union[T, Exception]]]:
+    items = list(items)
+    if (parallel <= 1) or (len(items) <= 1):
+        for item in items:
+            try:
+                yield item, func(item)
+            except Exception as e:
+                yield item, e
+    else:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(min(parallel, len(items))) as executor:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+
 # ! Server Functions
 def wait_start_server(
     server_host: str,
     port: int=6567,
     input_port: int=6859,
-    per_second: float=1
-) -> None:
-    server = pydustry.Server(server_host, port, input_port)
-    while True:
-        try:
-            server.get_status(per_second)
-            break
-        except:
-            pass
+    per_second: float=1,
+    timeout: Optional[float]=START_TIMEOUT,
+    probe: Optional[Probe]=None,
+    cancel: Optional[threading.Event]=None
+) -> ReadinessResult:
+    from .readiness import StatusProbe, wait_ready
+    return wait_ready(
+        probe or StatusProbe(server_host, port),
+        timeout,
+        attempt_timeout=per_second,
+        cancel=cancel
+    )
 
 def is_server_connect_correct(server_host: str, port: int, input_port: Optional[int]) -> bool:
     return \
@@ -49,9 +105,11 @@ def is_server_connect_correct(server_host: str, port: int, input_port: Optional[
         (isinstance(input_port, int) or (input_port is not None))
 
 def ping(host: str, port: int, timeout: int=10) -> pydustry.Status:
+    import pydustry
     return pydustry.Server(host, port).get_status(timeout)
 
 def pingok(host: str, port: int, timeout: int=10) -> bool:
+    import pydustry
     try:
         pydustry.Server(host, port).get_status(timeout)
         return True
@@ -61,64 +119,137 @@ def pingok(host: str, port: int, timeout: int=10) -> bool:
 
 # ! Subproccess Functions
 def runner(*args: str) -> Tuple[int, str]:
+    from subprocess import getstatusoutput
     return getstatusoutput(" ".join([*args]))
 
+def run_binary(binary: str, *args: str, timeout: Optional[float]=PROBE_TIMEOUT) -> Tuple[int, str]:
+    import subprocess
+    completed = subprocess.run(
+        [binary, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True, errors="replace",
+        timeout=timeout
+    )
+    return completed.returncode, completed.stdout.rstrip("\n")
+
+def probe_binary(name: str, *args: str, timeout: Optional[float]=PROBE_TIMEOUT) -> Optional[Tuple[int, str]]:
+    if (binary:=shutil.which(name)) is None:
+        return None
+    realpath = os.path.realpath(binary)
+    try:
+        stat = os.stat(realpath)
+    except OSError:
+        return None
+    key = json.dumps([realpath, stat.st_mtime_ns, stat.st_size, os.environ.get("PATH", ""), args])
+    if (cached:=probes_cache.get(key)) is not None:
+        return cached[0], cached[1]
+    import subprocess
+    try:
+        result = run_binary(binary, *args, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    probes_cache.set(key, list(result))
+    return result
+
 def exists_screen() -> bool:
-    out = runner("screen", "-v")[0]
-    return (out == 0) or (out == 1)
+    result = probe_binary("screen", "-v")
+    return (result is not None) and ((result[0] == 0) or (result[0] == 1))
 
 def exists_java() -> bool:
-    return runner("java", "--version")[0] == 0
+    result = probe_binary("java", "--version")
+    return (result is not None) and (result[0] == 0)
 
 # ! Parse Functions
-def remove_color(text: str) -> str:
-    return re.sub(COLOR_PATTERN, "", text)
-
-def parse_vbml(text: str, pattern: str, *, pacther: Patcher=DefaultVBMLPacther) -> Dict[str, Any]:
-    data = pacther.check(Pattern(pattern), text)
+def parse_vbml(text: str, pattern: str, *, pacther: Optional[Patcher]=None) -> Dict[str, Any]:
+    data = (pacther or get_vbml_patcher()).check(get_vbml_pattern(pattern), text)
     if isinstance(data, dict):
         return data
     raise VBMLParseError()
 
-def parse_vbml_linear(lines: Iterable[str], pattern: str, *, pacther: Patcher=DefaultVBMLPacther) -> Dict[str, Any]:
+def parse_vbml_linear(lines: Iterable[str], pattern: str, *, pacther: Optional[Patcher]=None) -> Dict[str, Any]:
+    pacther, compiled = pacther or get_vbml_patcher(), get_vbml_pattern(pattern)
     for line in lines:
-        try: return parse_vbml(line, pattern, pacther=pacther)
-        except: pass
+        if isinstance(data:=pacther.check(compiled, line), dict):
+            return data
     raise VBMLParseError()
 
-def parse_vbml_patterns(text: str, patterns: Iterable[str], *, pacther: Patcher=DefaultVBMLPacther) -> Dict[str, Any]:
+def parse_vbml_patterns(text: str, patterns: Iterable[str], *, pacther: Optional[Patcher]=None) -> Dict[str, Any]:
+    pacther = pacther or get_vbml_patcher()
     for pattern in patterns:
-        try: return parse_vbml(text, pattern)
-        except: pass
+        if isinstance(data:=pacther.check(get_vbml_pattern(pattern), text), dict):
+            return data
     raise VBMLParseError()
 
+def parse_timepoint(text: str, now: Optional[float]=None) -> float:
+    now = time.time() if now is None else now
+    if (match:=re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", text.strip())) is not None:
+        return now - float(match[1]) * {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}[match[2]]
+    return float(text)
+
 def parse_connect_data(text: str):
-    data = {"host": None, "port": 6567}
-    data.update(parse_vbml_patterns(text, ["<host>:<port:int>", "<host>"]))
-    return data
+    if (address:=parse_address(text)) is None:
+        raise VBMLParseError()
+    return {"host": address[0], "port": address[1]}
 
 def get_java_version() -> Version:
-    if exists_java():
-        data = parse_vbml(runner("java", "--version")[1].split("\n")[0], "<t1> <version> <t2>")
-        return DefaultVersioner.parse(data["version"])
+    if ((result:=probe_binary("java", "--version")) is not None) and (result[0] == 0):
+        if (version:=parse_java_version(result[1])) is None:
+            raise VBMLParseError()
+        return get_versioner().parse(version)
     raise JavaNotFound()
 
-def get_mindustry_server_version(jarfilepath: str) -> Version:
-    if exists_java():
-        text = runner("java", "-jar", f"\"{jarfilepath}\"", "version,exit")[1]
-        lines = [ remove_color(i) for i in text.split("\n") ]
-        data = parse_vbml_linear(lines, "<dt> [I] Version: <build> / build <version>")
-        return DefaultVersioner.parse(data["version"])
+def read_jar_properties(jarfilepath: str, name: str="version.properties") -> Dict[str, str]:
+    import zipfile
+    with zipfile.ZipFile(jarfilepath) as jar:
+        text = jar.read(name).decode("utf-8", "replace")
+    properties = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if (len(line) == 0) or (line[0] in "#!"):
+            continue
+        key, value = (re.split(r"\s*[=:]\s*", line, 1) + [""])[:2]
+        properties[key] = value
+    return properties
+
+def get_mindustry_server_build_jar(jarfilepath: str) -> Optional[str]:
+    import zipfile
+    try:
+        build = read_jar_properties(jarfilepath).get("build")
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+    if (build is not None) and (re.fullmatch(BUILD_PATTERN, build) is not None):
+        return build
+
+def get_mindustry_server_build_jvm(jarfilepath: str) -> str:
+    if (java:=shutil.which("java")) is not None:
+        text = run_binary(java, "-jar", jarfilepath, "version,exit", timeout=JVM_VERSION_TIMEOUT)[1]
+        if (version:=find_server_version(text.split("\n"))) is None:
+            raise VBMLParseError()
+        return version
     raise JavaNotFound()
 
+def get_mindustry_server_version(jarfilepath: str, jvm_fallback: bool=True) -> Version:
+    jarfilepath = os.path.abspath(jarfilepath)
+    stat = os.stat(jarfilepath)
+    key = json.dumps([jarfilepath, stat.st_size, stat.st_mtime_ns])
+    if (build:=versions_cache.get(key)) is None:
+        if (build:=get_mindustry_server_build_jar(jarfilepath)) is None:
+            if not jvm_fallback:
+                raise ServerVersionError(jarfilepath)
+            build = get_mindustry_server_build_jvm(jarfilepath)
+        versions_cache.set(key, build)
+    return get_versioner().parse(build)
+
 # ! System Functions
 def get_platform_tag() -> str:
     return f"{platform.system()}-{platform.machine()}".lower()
 
-def checking_environment() -> None:
+def checking_environment(screen: bool=True) -> None:
     if (tag:=get_platform_tag()) not in SUPPORT_PLATFORMS:
         raise PlatformSupportError(tag)
-    if not exists_screen():
+    if screen and not exists_screen():
         raise ScreenNotWorkingError()
     if not exists_java():
         raise JavaNotFound()
@@ -0,0 +1,249 @@
+import os
+import mmap
+import time
+import struct
+import threading
+from urllib.parse import quote, unquote
+from typing import Optional, Literal, NamedTuple, Iterator, List, Dict, Any
+# * Local Imports
+from .units import HISTORY_DIRPATH
+from .storage import fcntl, msvcrt
+
+# ! Types
+Resolution = Literal['raw', '1m', '1h']
+
+class Sample(NamedTuple):
+    timestamp: float
+    up: bool
+    ping: float
+    players: int
+    wave: int
+
+class Rollup(NamedTuple):
+    timestamp: float
+    samples: int
+    up: int
+    ping_sum: float
+    ping_max: float
+    players_sum: int
+    players_max: int
+    wave_max: int
+
+    @property
+    def uptime(self) -> float:
+        return self.up / self.samples if self.samples != 0 else 0
+
+    @property
+    def ping_avg(self) -> Optional[float]:
+        return self.ping_sum / self.up if self.up != 0 else None
+
+    @property
+    def players_avg(self) -> Optional[float]:
+        return self.players_sum / self.up if self.up != 0 else None
+
+# ! Constants
+MAGIC = b"MSMH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII4xQQQ")
+HEADER_SIZE = 64
+HEAD = struct.Struct("<Q")
+HEADS_OFFSET = 24
+SAMPLE = struct.Struct("<d?3xfII")
+ROLLUP = struct.Struct("<dIIdfQII")
+RESOLUTIONS: Dict[str, int] = {'raw': 0, '1m': 60, '1h': 3600}
+DEFAULT_CAPACITY: Dict[str, int] = {
+    'raw': 6 * 3600,        # * 6 hours of samples every second
+    '1m': 7 * 24 * 60,      # * 7 days of minutes
+    '1h': 366 * 24          # * 1 year of hours
+}
+
+# ! Functions
+def history_filename(name: str) -> str:
+    return quote(name, safe="") + ".hist"
+
+# ! Series File
+class SeriesFile:
+    def __init__(self, filepath: str, capacity: Optional[Dict[str, int]]=None) -> None:
+        self.filepath = filepath
+        capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self.fd = os.open(filepath, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            self.lock()
+            try:
+                if os.fstat(self.fd).st_size < HEADER_SIZE:
+                    self.create(capacity)
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                header = HEADER.unpack(os.read(self.fd, HEADER.size))
+            finally:
+                self.unlock()
+            if (header[0] != MAGIC) or (header[1] != VERSION):
+                raise ValueError(f"The file {repr(filepath)} is not a history file.")
+            self.capacity = dict(zip(RESOLUTIONS, header[3:6]))
+            self.offsets: Dict[str, int] = {}
+            offset = HEADER_SIZE
+            for resolution, size in zip(RESOLUTIONS, (SAMPLE.size, ROLLUP.size, ROLLUP.size)):
+                self.offsets[resolution] = offset
+                offset += self.capacity[resolution] * size
+            self.mmap = mmap.mmap(self.fd, offset)
+        except:
+            os.close(self.fd)
+            raise
+
+    def create(self, capacity: Dict[str, int]) -> None:
+        size = HEADER_SIZE + capacity['raw'] * SAMPLE.size + (capacity['1m'] + capacity['1h']) * ROLLUP.size
+        os.ftruncate(self.fd, size)
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, HEADER.pack(MAGIC, VERSION, 0, capacity['raw'], capacity['1m'], capacity['1h'], 0, 0, 0))
+
+    def lock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+
+    def unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self) -> None:
+        self.mmap.close()
+        os.close(self.fd)
+
+    # ? Ring Buffers
+    def head(self, resolution: str) -> int:
+        return HEAD.unpack_from(self.mmap, HEADS_OFFSET + HEAD.size * list(RESOLUTIONS).index(resolution))[0]
+
+    def set_head(self, resolution: str, head: int) -> None:
+        HEAD.pack_into(self.mmap, HEADS_OFFSET + HEAD.size * list(RESOLUTIONS).index(resolution), head)
+
+    def position(self, resolution: str, index: int) -> int:
+        record = SAMPLE if resolution == 'raw' else ROLLUP
+        return self.offsets[resolution] + (index % self.capacity[resolution]) * record.size
+
+    def read(self, resolution: str, index: int) -> tuple:
+        record = SAMPLE if resolution == 'raw' else ROLLUP
+        return record.unpack_from(self.mmap, self.position(resolution, index))
+
+    def bounds(self, resolution: str) -> range:
+        head = self.head(resolution)
+        return range(max(0, head - self.capacity[resolution]), head)
+
+    # ? Writing
+    def rollup(self, resolution: str, sample: Sample) -> None:
+        step = RESOLUTIONS[resolution]
+        bucket = sample.timestamp - sample.timestamp % step
+        head = self.head(resolution)
+        if (head != 0) and ((last:=Rollup(*self.read(resolution, head - 1))).timestamp == bucket):
+            index = head - 1
+        elif (head != 0) and (last.timestamp > bucket):
+            # * Samples older than the last bucket are kept only in the raw ring
+            return
+        else:
+            index, last = head, Rollup(bucket, 0, 0, 0, 0, 0, 0, 0)
+            self.set_head(resolution, head + 1)
+        if sample.up:
+            last = last._replace(
+                up=last.up + 1,
+                ping_sum=last.ping_sum + sample.ping,
+                ping_max=max(last.ping_max, sample.ping),
+                players_sum=last.players_sum + sample.players,
+                players_max=max(last.players_max, sample.players),
+                wave_max=max(last.wave_max, sample.wave)
+            )
+        ROLLUP.pack_into(self.mmap, self.position(resolution, index), *last._replace(samples=last.samples + 1))
+
+    def append(self, sample: Sample) -> None:
+        self.lock()
+        try:
+            head = self.head('raw')
+            SAMPLE.pack_into(self.mmap, self.position('raw', head), *sample)
+            self.set_head('raw', head + 1)
+            self.rollup('1m', sample)
+            self.rollup('1h', sample)
+        finally:
+            self.unlock()
+
+    # ? Reading
+    def search(self, resolution: str, timestamp: float) -> int:
+        bounds = self.bounds(resolution)
+        low, high = bounds.start, bounds.stop
+        while low < high:
+            middle = (low + high) // 2
+            if self.read(resolution, middle)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def select(
+        self,
+        resolution: str='raw',
+        since: Optional[float]=None,
+        until: Optional[float]=None
+    ) -> Iterator[tuple]:
+        bounds = self.bounds(resolution)
+        start = bounds.start if since is None else self.search(resolution, since)
+        stop = bounds.stop if until is None else self.search(resolution, until)
+        record = Sample if resolution == 'raw' else Rollup
+        for index in range(start, stop):
+            yield record(*self.read(resolution, index))
+
+# ! History Store
+class HistoryStore:
+    def __init__(self, dirpath: str=HISTORY_DIRPATH, capacity: Optional[Dict[str, int]]=None) -> None:
+        self.dirpath = dirpath
+        self.capacity = capacity
+        self.files: Dict[str, SeriesFile] = {}
+        self.lock = threading.Lock()
+
+    def filepath(self, name: str) -> str:
+        return os.path.join(self.dirpath, history_filename(name))
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.filepath(name))
+
+    def series(self, name: str) -> SeriesFile:
+        with self.lock:
+            if (series:=self.files.get(name)) is None:
+                series = self.files[name] = SeriesFile(self.filepath(name), self.capacity)
+            return series
+
+    def names(self) -> List[str]:
+        try:
+            return sorted(unquote(i[:-5]) for i in os.listdir(self.dirpath) if i.endswith(".hist"))
+        except FileNotFoundError:
+            return []
+
+    def record(self, name: str, status: Any, timestamp: Optional[float]=None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        if isinstance(status, BaseException):
+            sample = Sample(timestamp, False, 0, 0, 0)
+        else:
+            sample = Sample(timestamp, True, status.ping, status.players, status.wave)
+        self.series(name).append(sample)
+
+    def observe_event(self, event: str, server: str, data: Dict[str, Any]) -> None:
+        if event == "check":
+            # * A broken history file must not stop the monitoring
+            try: self.record(server, data["status"] if data["ok"] else data["error"])
+            except (OSError, ValueError): pass
+
+    def query(
+        self,
+        name: str,
+        resolution: Resolution='raw',
+        since: Optional[float]=None,
+        until: Optional[float]=None
+    ) -> Iterator[tuple]:
+        return self.series(name).select(resolution, since, until)
+
+    def close(self) -> None:
+        with self.lock:
+            for series in self.files.values():
+                series.close()
+            self.files.clear()
@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+from typing import Optional, NamedTuple, List, Dict
+# * Local Imports
+from .units import CDS_DIRPATH
+from .models import MindustryServerConfig, LaunchProfile
+from .parsers import parse_java_version
+
+# ! Constants
+DEFAULT_JAVA = "java"
+ARCHIVE_SUFFIX = ".jsa"
+# * The dynamic archive (-XX:ArchiveClassesAtExit) needs JDK 13, the self-updating one JDK 19
+DYNAMIC_ARCHIVE_VERSION = 13
+AUTO_ARCHIVE_VERSION = 19
+
+# ! Types
+class LaunchCommand(NamedTuple):
+    # * The java binary and its flags up to the server jar, the server arguments are kept apart
+    command: List[str]
+    arguments: List[str]
+    env: Dict[str, str]
+    archive: Optional[str]=None
+
+    @property
+    def argv(self) -> List[str]:
+        return [*self.command, *self.arguments]
+
+# ! Functions
+def java_version(java: str=DEFAULT_JAVA) -> Optional[str]:
+    from .functions import probe_binary
+    # * The probe result is cached on disk by the java binary path and mtime
+    if ((result:=probe_binary(java, "--version")) is None) or (result[0] != 0):
+        return None
+    return parse_java_version(result[1])
+
+def major_version(version: str) -> Optional[int]:
+    parts = version.split(".")
+    try:
+        return int(parts[1] if (parts[0] == "1") and (len(parts) > 1) else parts[0])
+    except ValueError:
+        return None
+
+def heap_flags(profile: LaunchProfile) -> List[str]:
+    flags = []
+    if profile.min_heap is not None:
+        flags.append(f"-Xms{profile.min_heap}")
+    if profile.max_heap is not None:
+        flags.append(f"-Xmx{profile.max_heap}")
+    return flags
+
+def archive_path(
+    server: MindustryServerConfig,
+    flags: List[str],
+    version: str,
+    dirpath: str=CDS_DIRPATH
+) -> Optional[str]:
+    executable_filepath = os.path.realpath(server.executable_filepath)
+    try:
+        stat = os.stat(executable_filepath)
+    except OSError:
+        return None
+    # * One archive per launch setup, a new jar or JDK (a patch update too) replaces it with another version key
+    launch_key = hashlib.blake2b(json.dumps([executable_filepath, flags]).encode(), digest_size=6).hexdigest()
+    version_key = hashlib.blake2b(
+        json.dumps([stat.st_size, stat.st_mtime_ns, version]).encode(), digest_size=6
+    ).hexdigest()
+    return os.path.join(dirpath, f"{launch_key}-{version_key}{ARCHIVE_SUFFIX}")
+
+def prune_archives(path: str) -> None:
+    # * The archives of the older jars and JDKs (with the same launch setup) are not used anymore
+    dirpath, filename = os.path.split(path)
+    prefix = filename.split("-", 1)[0] + "-"
+    try:
+        entries = os.listdir(dirpath)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.startswith(prefix) and entry.endswith(ARCHIVE_SUFFIX) and (entry != filename):
+            try: os.remove(os.path.join(dirpath, entry))
+            except OSError: pass
+
+def archive_flags(path: str, major: int) -> List[str]:
+    if major >= AUTO_ARCHIVE_VERSION:
+        # * Created when missing or stale, the JVM writes it on exit and uses it on the next start
+        return ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={path}"]
+    elif os.path.exists(path):
+        return [f"-XX:SharedArchiveFile={path}"]
+    # * Older JDKs dump the loaded classes when the server exits normally, the next start uses them
+    return [f"-XX:ArchiveClassesAtExit={path}"]
+
+def launch_command(
+    server: MindustryServerConfig,
+    profile: Optional[LaunchProfile]=None,
+    cds_dirpath: str=CDS_DIRPATH
+) -> LaunchCommand:
+    profile = profile or LaunchProfile()
+    java = profile.java or DEFAULT_JAVA
+    flags = [*heap_flags(profile), *profile.jvm_flags]
+    archive = None
+    if profile.cds and ((version:=java_version(java)) is not None) and \
+        ((major:=major_version(version)) is not None) and (major >= DYNAMIC_ARCHIVE_VERSION) and \
+        ((archive:=archive_path(server, flags, version, cds_dirpath)) is not None):
+        os.makedirs(cds_dirpath, exist_ok=True)
+        prune_archives(archive)
+        flags.extend(archive_flags(archive, major))
+    return LaunchCommand(
+        [java, *flags, "-jar", server.executable_filepath],
+        list(server.arguments),
+        dict(profile.env),
+        archive
+    )
+
+def clear_archives(dirpath: str=CDS_DIRPATH) -> int:
+    count = 0
+    try:
+        entries = os.listdir(dirpath)
+    except OSError:
+        return count
+    for entry in entries:
+        if entry.endswith(ARCHIVE_SUFFIX):
+            try:
+                os.remove(os.path.join(dirpath, entry))
+                count += 1
+            except OSError:
+                pass
+    return count
@@ -0,0 +1,92 @@
+import os
+import re
+import mmap
+import time
+import threading
+from urllib.parse import quote
+from typing import Optional, Union, Iterator, Tuple
+# * Local Imports
+from .units import LOGS_DIRPATH
+from .functions import remove_color
+
+# ! Constants
+BLOCK_SIZE = 64 * 1024
+
+# ! Functions
+def server_log_path(screen_name: str) -> str:
+    return os.path.join(LOGS_DIRPATH, quote(screen_name, safe="") + ".log")
+
+def decode_line(line: bytes, colors: bool=False) -> str:
+    text = line.decode("utf-8", "replace").rstrip("\r\n")
+    return text if colors else remove_color(text)
+
+def tail_offset(filepath: str, count: int, block_size: int=BLOCK_SIZE) -> int:
+    with open(filepath, "rb") as file:
+        position = file.seek(0, os.SEEK_END)
+        # * The newline that ends the last complete line does not start a new one
+        newlines = -1
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            file.seek(position)
+            block = file.read(size)
+            index = len(block)
+            while (index:=block.rfind(b"\n", 0, index)) != -1:
+                newlines += 1
+                if newlines == count:
+                    return position + index + 1
+    return 0
+
+def search(
+    filepath: str,
+    pattern: Union[str, bytes, re.Pattern],
+    start: int=0
+) -> Iterator[Tuple[int, bytes]]:
+    if isinstance(pattern, str):
+        pattern = pattern.encode()
+    if isinstance(pattern, bytes):
+        pattern = re.compile(pattern)
+    with open(filepath, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = start
+            while (match:=pattern.search(data, position)) is not None:
+                line_start = data.rfind(b"\n", 0, match.start()) + 1
+                if (line_end:=data.find(b"\n", match.end())) == -1:
+                    line_end = len(data)
+                yield line_start, data[line_start:line_end]
+                position = line_end + 1
+
+# ! Log Cursor
+class LogCursor:
+    def __init__(self, filepath: str, offset: int=0, inode: Optional[int]=None) -> None:
+        self.filepath = filepath
+        self.offset = offset
+        self.inode = inode
+
+    def lines(self) -> Iterator[bytes]:
+        try:
+            file = open(self.filepath, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            stat = os.fstat(file.fileno())
+            # * The log was recreated or truncated, reading starts over
+            if ((self.inode is not None) and (stat.st_ino != self.inode)) or (stat.st_size < self.offset):
+                self.offset = 0
+            self.inode = stat.st_ino
+            file.seek(self.offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                yield line
+
+    def follow(self, interval: float=0.25, stop: Optional[threading.Event]=None) -> Iterator[bytes]:
+        while (stop is None) or (not stop.is_set()):
+            yield from self.lines()
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
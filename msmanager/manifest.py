@@ -0,0 +1,225 @@
+import os
+import io
+import csv
+import json
+import shlex
+from functools import partial
+from typing import Optional, Literal, Iterable, Iterator, Tuple, List, Dict, Set, Any
+# * Local Imports
+from .models import MindustryServerConfig
+from .exceptions import ManifestError
+
+# ! Types
+ManifestFormat = Literal['json', 'ndjson', 'csv']
+
+# ! Constants
+SERVER_EXECUTABLE_NAME = "server-release.jar"
+MANIFEST_FIELDS = [
+    "screen_name", "work_dirpath", "executable_filepath", "arguments",
+    "host", "port", "input_port", "backend", "profile"
+]
+SCAN_MAX_DEPTH = 4
+SCAN_WORKERS = 8
+MAX_PORT = 65535
+
+# ! Functions
+def manifest_format(filepath: str, default: ManifestFormat='json') -> ManifestFormat:
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".csv":
+        return 'csv'
+    elif extension in (".ndjson", ".jsonl"):
+        return 'ndjson'
+    elif extension == ".json":
+        return 'json'
+    return default
+
+# ? Import
+def read_entries(filepath: str, format: ManifestFormat) -> List[Dict[str, Any]]:
+    with open(filepath, newline="" if format == 'csv' else None, encoding="utf-8") as file:
+        if format == 'csv':
+            entries = []
+            for row in csv.DictReader(file):
+                # * Empty cells are missing values, the arguments are one shell-quoted cell
+                entry: Dict[str, Any] = {key: value for key, value in row.items() if key and value}
+                if "arguments" in entry:
+                    entry["arguments"] = shlex.split(entry["arguments"])
+                entries.append(entry)
+            return entries
+        elif format == 'ndjson':
+            return [json.loads(line) for line in file if len(line.strip()) != 0]
+        data = json.load(file)
+    # * The export format and the config format have the servers under a key
+    return data["servers"] if isinstance(data, dict) and ("servers" in data) else data
+
+def manifest_entry(entry: Dict[str, Any], base_dirpath: str) -> MindustryServerConfig:
+    if not isinstance(entry, dict):
+        raise TypeError(f"expected an object, got {type(entry).__name__}")
+    entry = dict(entry)
+    # * The relative paths are relative to the manifest, not to the current directory
+    if entry.get("executable_filepath") is not None:
+        entry["executable_filepath"] = os.path.abspath(os.path.join(base_dirpath, entry["executable_filepath"]))
+        entry.setdefault("work_dirpath", os.path.dirname(entry["executable_filepath"]))
+    if entry.get("work_dirpath") is not None:
+        entry["work_dirpath"] = os.path.abspath(os.path.join(base_dirpath, entry["work_dirpath"]))
+    entry.setdefault("arguments", [])
+    server = MindustryServerConfig.parse_obj(entry)
+    # * The same check as the add command, a wrong path would only fail at the start
+    if not os.path.isfile(server.executable_filepath):
+        raise ValueError(f"the executable {repr(server.executable_filepath)} does not exist or is not a file")
+    return server
+
+def read_manifest(filepath: str, format: Optional[ManifestFormat]=None) -> List[MindustryServerConfig]:
+    format = format or manifest_format(filepath)
+    try:
+        entries = read_entries(filepath, format)
+    except (OSError, ValueError, KeyError, csv.Error) as e:
+        raise ManifestError(filepath, [f"{e.__class__.__name__}: {e}"])
+    if not isinstance(entries, list):
+        raise ManifestError(filepath, ["expected a list of servers"])
+    base_dirpath = os.path.dirname(os.path.abspath(filepath))
+    # * Every entry is checked before reporting, so the whole manifest can be fixed at once
+    servers, errors = [], []
+    for idx, entry in enumerate(entries):
+        try:
+            servers.append(manifest_entry(entry, base_dirpath))
+        except (TypeError, ValueError) as e:
+            errors.append(f"entry {idx}: " + " ".join(str(e).split()))
+    if len(errors) != 0:
+        raise ManifestError(filepath, errors)
+    return servers
+
+# ? Discovery
+def scan_directory(dirpath: str, executable_name: str) -> Tuple[List[str], Optional[str]]:
+    subdirpaths, executable_filepath = [], None
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirpaths.append(entry.path)
+                elif (entry.name == executable_name) and entry.is_file():
+                    executable_filepath = entry.path
+    except OSError:
+        pass
+    return subdirpaths, executable_filepath
+
+def scan_servers(
+    root_dirpath: str,
+    executable_name: str=SERVER_EXECUTABLE_NAME,
+    max_depth: int=SCAN_MAX_DEPTH,
+    workers: int=SCAN_WORKERS
+) -> List[str]:
+    from concurrent.futures import ThreadPoolExecutor
+    level, found = [os.path.abspath(root_dirpath)], []
+    # * Breadth-first, every directory of a level is listed in parallel
+    with ThreadPoolExecutor(max(1, workers)) as executor:
+        for depth in range(max_depth + 1):
+            next_level = []
+            for subdirpaths, executable_filepath in executor.map(partial(scan_directory, executable_name=executable_name), level):
+                if executable_filepath is not None:
+                    # * The server directory itself (config, saves, mods) is not searched further
+                    found.append(executable_filepath)
+                elif depth < max_depth:
+                    next_level.extend(subdirpaths)
+            if len(level:=next_level) == 0:
+                break
+    return sorted(found)
+
+def unique_name(name: str, taken: Set[str]) -> str:
+    candidate, idx = name, 1
+    while candidate in taken:
+        idx += 1
+        candidate = f"{name}-{idx}"
+    taken.add(candidate)
+    return candidate
+
+def discovered_servers(
+    root_dirpath: str,
+    executable_filepaths: Iterable[str],
+    taken_names: Iterable[str]=(),
+    *,
+    prefix: str="",
+    arguments: Iterable[str]=(),
+    host: Optional[str]=None,
+    backend: Literal['screen', 'native']='screen'
+) -> List[MindustryServerConfig]:
+    root_dirpath, taken, servers = os.path.abspath(root_dirpath), set(taken_names), []
+    for executable_filepath in executable_filepaths:
+        work_dirpath = os.path.dirname(executable_filepath)
+        relpath = os.path.relpath(work_dirpath, root_dirpath)
+        # * The directory path is the name, "hub/pvp" becomes "hub-pvp"
+        name = os.path.basename(root_dirpath) if relpath == "." else relpath.replace(os.sep, "-")
+        servers.append(
+            MindustryServerConfig(
+                screen_name=unique_name(prefix + name, taken),
+                work_dirpath=work_dirpath,
+                executable_filepath=executable_filepath,
+                arguments=list(arguments),
+                host=host,
+                backend=backend
+            )
+        )
+    return servers
+
+# ? Ports
+def taken_ports(servers: Iterable[MindustryServerConfig]) -> Set[Tuple[str, int]]:
+    return {
+        (server.host, port) for server in servers if server.host is not None \
+            for port in (server.port, server.input_port) if port is not None
+    }
+
+def assign_ports(
+    servers: List[MindustryServerConfig],
+    taken: Set[Tuple[str, int]],
+    port: Optional[int]=None,
+    input_port: Optional[int]=None
+) -> List[MindustryServerConfig]:
+    taken, next_ports, assigned = set(taken) | taken_ports(servers), {}, []
+    def next_port(host: str, field: str, start: int) -> int:
+        candidate = next_ports.get((host, field), start)
+        while (host, candidate) in taken:
+            candidate += 1
+        if candidate > MAX_PORT:
+            raise ValueError(f"no free {field.replace('_', ' ')} left on {host}")
+        taken.add((host, candidate))
+        next_ports[(host, field)] = candidate + 1
+        return candidate
+    # * Only the servers with a host and without a port get one, the explicit ports are kept
+    for server in servers:
+        changes = {}
+        if server.host is not None:
+            if (server.port is None) and (port is not None):
+                changes["port"] = next_port(server.host, "port", port)
+            if (server.input_port is None) and (input_port is not None):
+                changes["input_port"] = next_port(server.host, "input_port", input_port)
+        assigned.append(server.copy(update=changes) if len(changes) != 0 else server)
+    return assigned
+
+# ? Export
+def server_row(server: MindustryServerConfig) -> Dict[str, Any]:
+    # * A CSV row has no nested values, the health policy is only kept by the JSON formats
+    row = {key: getattr(server, key) for key in MANIFEST_FIELDS}
+    row["arguments"] = shlex.join(server.arguments)
+    return row
+
+def iter_export(servers: Iterable[MindustryServerConfig], format: ManifestFormat) -> Iterator[str]:
+    if format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, MANIFEST_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        for server in servers:
+            writer.writerow(server_row(server))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    elif format == 'ndjson':
+        for server in servers:
+            yield json.dumps(server.dict(), separators=(",", ":")) + "\n"
+    else:
+        # * Written server by server, the same shape as the config so it can be imported back
+        yield '{"servers": ['
+        for idx, server in enumerate(servers):
+            yield ("," if idx != 0 else "") + "\n  " + json.dumps(server.dict())
+        yield "\n]}\n"
@@ -0,0 +1,189 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Literal, Tuple, List, Dict, Any
+# * Local Imports
+from .storage import atomic_write
+
+# ! Types
+MetricType = Literal['gauge', 'counter', 'summary']
+Labels = Tuple[Tuple[str, str], ...]
+
+# ! Functions
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+
+def format_labels(labels: Labels) -> str:
+    if len(labels) == 0:
+        return ""
+    return "{" + ",".join(f"{key}=\"{escape_label(value)}\"" for key, value in labels) + "}"
+
+def format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    elif value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# ! Metrics
+class Metric:
+    def __init__(self, name: str, documentation: str, metric_type: MetricType) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.type = metric_type
+        self.values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[tuple(labels.items())] = value
+
+    def inc(self, value: float=1, **labels: str) -> None:
+        key = tuple(labels.items())
+        self.values[key] = self.values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}"
+        ]
+        for labels, value in list(self.values.items()):
+            lines.append(f"{self.name}{format_labels(labels)} {format_value(value)}")
+        return lines
+
+class Summary(Metric):
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation, 'summary')
+        self.counts: Dict[Labels, int] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.items())
+        self.values[key] = self.values.get(key, 0) + value
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}"
+        ]
+        for labels, value in list(self.values.items()):
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(value)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {self.counts.get(labels, 0)}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        return self.metrics.setdefault(metric.name, metric)
+
+    def gauge(self, name: str, documentation: str) -> Metric:
+        return self.register(Metric(name, documentation, 'gauge'))
+
+    def counter(self, name: str, documentation: str) -> Metric:
+        return self.register(Metric(name, documentation, 'counter'))
+
+    def summary(self, name: str, documentation: str) -> Summary:
+        return self.register(Summary(name, documentation))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, filepath: str) -> None:
+        atomic_write(filepath, self.render())
+
+# ! Server Metrics
+class ServerMetrics:
+    def __init__(self, registry: Optional[MetricsRegistry]=None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.up = self.registry.gauge("msmanager_server_up", "Whether the server answered the last status query.")
+        self.ping = self.registry.gauge("msmanager_server_ping_milliseconds", "The status query round trip time.")
+        self.players = self.registry.gauge("msmanager_server_players", "The number of players on the server.")
+        self.wave = self.registry.gauge("msmanager_server_wave", "The current wave on the server.")
+        self.checks = self.registry.counter("msmanager_server_checks_total", "The number of status checks.")
+        self.check_duration = self.registry.summary("msmanager_server_check_duration_seconds", "The duration of status checks.")
+        self.exits = self.registry.counter("msmanager_server_exits_total", "The number of server process exits seen by the watchdog.")
+        self.restarts = self.registry.counter("msmanager_server_restarts_total", "The number of restarts by the watchdog.")
+        self.failed_restarts = self.registry.counter("msmanager_server_failed_restarts_total", "The number of failed restarts by the watchdog.")
+        self.parked = self.registry.gauge("msmanager_server_parked", "Whether the watchdog parked the crash-looping server.")
+        self.ready = self.registry.gauge("msmanager_server_ready_seconds", "The time to ready of the last restart.")
+        self.updated = self.registry.gauge("msmanager_last_update_timestamp_seconds", "The time of the last metrics update.")
+
+    def observe_status(self, server: str, status: Any, duration: Optional[float]=None) -> None:
+        ok = not isinstance(status, BaseException)
+        self.up.set(1 if ok else 0, server=server)
+        self.checks.inc(server=server, result="ok" if ok else "error")
+        if ok:
+            self.ping.set(status.ping, server=server)
+            self.players.set(status.players, server=server)
+            self.wave.set(status.wave, server=server)
+        if duration is not None:
+            self.check_duration.observe(duration, server=server)
+        self.updated.set(time.time())
+
+    def observe_event(self, event: str, server: str, data: Dict[str, Any]) -> None:
+        if event == "check":
+            self.observe_status(server, data["status"] if data["ok"] else data["error"], data.get("duration"))
+        elif event == "exited":
+            self.exits.inc(server=server)
+            self.up.set(0, server=server)
+            self.updated.set(time.time())
+        elif event in ("parked", "unparked"):
+            self.parked.set(1 if event == "parked" else 0, server=server)
+            self.updated.set(time.time())
+        elif event == "restarted":
+            self.restarts.inc(server=server)
+            self.ready.set(data["result"].elapsed, server=server)
+            self.updated.set(time.time())
+        elif event == "restart_failed":
+            self.failed_restarts.inc(server=server)
+            self.updated.set(time.time())
+
+# ! Exporters
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+def serve_metrics(registry: MetricsRegistry, port: int, host: str="127.0.0.1") -> ThreadingHTTPServer:
+    handler = type("RegistryMetricsHandler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="msmanager-metrics", daemon=True).start()
+    return server
+
+class TextfileWriter:
+    def __init__(self, registry: MetricsRegistry, filepath: str, interval: float=15) -> None:
+        self.registry = registry
+        self.filepath = filepath
+        self.interval = interval
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="msmanager-metrics-textfile", daemon=True)
+
+    def run(self) -> None:
+        while not self.stopping.wait(self.interval):
+            try: self.registry.write_textfile(self.filepath)
+            except OSError: pass
+
+    def start(self) -> "TextfileWriter":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopping.set()
+        try: self.registry.write_textfile(self.filepath)
+        except OSError: pass
@@ -1,7 +1,27 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Literal, Dict, List, Any
 
 # ! MSManager Models
+class HealthPolicy(BaseModel):
+    # * A zero or negative interval would ping without pauses, a negative cooldown would never park
+    interval: Optional[float]=Field(None, gt=0)
+    check_timeout: Optional[float]=Field(None, gt=0)
+    checks: Optional[int]=Field(None, ge=1)
+    ping_timeout: Optional[float]=Field(None, gt=0)
+    restart_limit: Optional[int]=Field(None, ge=1)
+    restart_window: Optional[float]=Field(None, gt=0)
+    backoff: Optional[float]=Field(None, ge=0)
+    backoff_max: Optional[float]=Field(None, ge=0)
+    cooldown: Optional[float]=Field(None, gt=0)
+
+class LaunchProfile(BaseModel):
+    java: Optional[str]=None
+    min_heap: Optional[str]=None
+    max_heap: Optional[str]=None
+    jvm_flags: List[str]=[]
+    env: Dict[str, str]={}
+    cds: bool=False
+
 class MindustryServerConfig(BaseModel):
     screen_name: str
     work_dirpath: str
@@ -10,9 +30,31 @@ class MindustryServerConfig(BaseModel):
     host: Optional[str]=None
     port: Optional[int]=None
     input_port: Optional[int]=None
+    backend: Literal['screen', 'native']='screen'
+    health: Optional[HealthPolicy]=None
+    profile: Optional[str]=None
 
 class MainConfig(BaseModel):
     servers: List[MindustryServerConfig] = []
+    profiles: Dict[str, LaunchProfile] = {}
+
+# ! MSManager Runtime Models
+class ScreenSession(BaseModel):
+    pid: Optional[int]=None
+    name: str
+    state: str
+
+class CommandReply(BaseModel):
+    lines: List[str]
+    elapsed: float
+
+class ReadinessResult(BaseModel):
+    ready: bool
+    elapsed: float
+    attempts: int
+    probe: str
+    cancelled: bool=False
+    error: Optional[str]=None
 
 # ! MSManager Json Output Models
 class JsonOutput(BaseModel):
@@ -1,72 +1,149 @@
-import os
-import screens
-from typing import Optional
-from versioner import Version
+from __future__ import annotations
+import time
+import threading
+from typing import TYPE_CHECKING, Optional, Iterable, Tuple, List, Dict
 # * Local Imports
 from .units import CONFIG_PATH
 from .config import MSManagerConfig
-from .models import MindustryServerConfig
+from .models import MindustryServerConfig, HealthPolicy, LaunchProfile, ScreenSession, CommandReply
+from .backends import Backend, BackendKind, create_backends
+from .launch import LaunchCommand, launch_command
+from .logs import server_log_path
 from .functions import get_mindustry_server_version, checking_environment
-from .exceptions import ServerNotExistsError, ServerIsStartedError, ServerIsStoppedError
+from .exceptions import ServerNotExistsError, ServerInputPortError, ProfileNotExistsError
+
+# * Type Imports
+if TYPE_CHECKING:
+    from versioner import Version
+    from .pinging import PingResult
+    from .channel import CommandResult
 
 class MSManager:
-    def __init__(self, config_path: str=CONFIG_PATH, check_environment: bool=True) -> None:
+    def __init__(
+        self,
+        config_path: str=CONFIG_PATH,
+        check_environment: bool=True,
+        sessions_ttl: float=2
+    ) -> None:
         self.config_path = config_path
-        
-        # * Create children directions
-        os.makedirs(os.path.dirname(self.config_path), mode=644, exist_ok=True)
+        self.backends: Dict[BackendKind, Backend] = create_backends(sessions_ttl)
+        self.sessions = self.backends['screen'].sessions
+        # * Starting and stopping of one server must not interleave, other servers are not held up
+        self.locks: Dict[str, threading.RLock] = {}
+        self.locks_lock = threading.Lock()
         
         # * Init Config
         self.config = MSManagerConfig(self.config_path)
         
         # * Test System
         if check_environment:
-            checking_environment()
+            # * Screen is only not needed when every server is native, new servers use it by default
+            checking_environment(self.get_backend_kinds() != ['native'])
     
     # ? Config Managemant
     def add_server_config(self, server: MindustryServerConfig) -> None:
         return self.config.add_server(server)
     
+    def add_servers_config(self, servers: Iterable[MindustryServerConfig]) -> int:
+        return self.config.add_servers(servers)
+    
     def get_server_config(self, screen_name: str) -> Optional[MindustryServerConfig]:
         return self.config.get_server(screen_name)
     
+    def get_servers_config(self) -> List[MindustryServerConfig]:
+        return list(self.config.config.servers)
+    
+    def get_server_config_by_address(self, host: str, port: int) -> Optional[MindustryServerConfig]:
+        return self.config.get_server_by_address(host, port)
+    
+    def get_servers_config_by_executable(self, executable_filepath: str) -> List[MindustryServerConfig]:
+        return self.config.get_servers_by_executable(executable_filepath)
+    
     def exists_server_config(self, screen_name: str) -> bool:
         return self.config.exists_server(screen_name)
     
     def remove_server_config(self, screen_name: str) -> None:
         return self.config.remove_server(screen_name)
     
+    def set_server_health(self, screen_name: str, health: Optional[HealthPolicy]) -> MindustryServerConfig:
+        return self.config.update_server(screen_name, health=health)
+    
+    def set_servers_health(self, healths: Dict[str, Optional[HealthPolicy]]) -> List[MindustryServerConfig]:
+        return self.config.update_servers({screen_name: {"health": health} for screen_name, health in healths.items()})
+    
+    def set_server_profile(self, screen_name: str, profile: Optional[str]) -> MindustryServerConfig:
+        return self.config.update_server(screen_name, profile=profile)
+    
+    # ? Launch Profiles
+    def get_profiles(self) -> Dict[str, LaunchProfile]:
+        return dict(self.config.config.profiles)
+    
+    def set_profile(self, name: str, profile: LaunchProfile) -> None:
+        return self.config.set_profile(name, profile)
+    
+    def remove_profile(self, name: str) -> None:
+        return self.config.remove_profile(name)
+    
+    def get_launch_command(self, server_config: MindustryServerConfig) -> LaunchCommand:
+        profile = None
+        if (server_config.profile is not None) and ((profile:=self.config.get_profile(server_config.profile)) is None):
+            raise ProfileNotExistsError(server_config.profile)
+        return launch_command(server_config, profile)
+    
+    # ? Server Status
+    def ping_servers(
+        self,
+        targets: Iterable[Tuple[str, int]],
+        timeout: float=10
+    ) -> Dict[Tuple[str, int], PingResult]:
+        from .pinging import ping_many
+        return ping_many(targets, timeout)
+    
     # ? Server Managemant
     def check_server_version(self, screen_name: str) -> Version:
         if (server_config:=self.get_server_config(screen_name)) is not None:
             return get_mindustry_server_version(server_config.executable_filepath)
         raise ServerNotExistsError(screen_name)
     
+    def get_backend(self, server_config: MindustryServerConfig) -> Backend:
+        return self.backends[server_config.backend]
+    
+    def get_backend_kinds(self) -> List[BackendKind]:
+        return sorted({server.backend for server in self.config.config.servers})
+    
+    def get_sessions(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        sessions: Dict[str, ScreenSession] = {}
+        for kind in self.get_backend_kinds():
+            sessions.update(self.backends[kind].get_sessions(refresh))
+        return sessions
+    
     def server_is_started(self, screen_name: str) -> bool:
-        return screens.get_session_by_name(screen_name) is not None
+        if (server_config:=self.get_server_config(screen_name)) is not None:
+            return self.get_backend(server_config).is_started(server_config)
+        return self.sessions.get_session(screen_name) is not None
+    
+    def get_server_pid(self, screen_name: str) -> Optional[int]:
+        if (server_config:=self.get_server_config(screen_name)) is not None:
+            return self.get_backend(server_config).get_pid(server_config)
+        raise ServerNotExistsError(screen_name)
+    
+    def server_lock(self, screen_name: str) -> threading.RLock:
+        with self.locks_lock:
+            return self.locks.setdefault(screen_name, threading.RLock())
     
     def start_server(self, screen_name: str) -> None:
         server_config = self.get_server_config(screen_name)
         if server_config is not None:
-            if not self.server_is_started(screen_name):
-                server_screen = screens.Screen(server_config.screen_name)
-                args = " ".join(server_config.arguments)
-                os.chdir(server_config.work_dirpath)
-                server_screen.send_command(f"cd {server_config.work_dirpath}")
-                server_screen.send_command(f"java -jar {server_config.executable_filepath} {args}")
-            else:
-                raise ServerIsStartedError(screen_name)
+            with self.server_lock(screen_name):
+                self.get_backend(server_config).start(server_config, self.get_launch_command(server_config))
         else:
             raise ServerNotExistsError(screen_name)
     
     def stop_server(self, screen_name: str) -> None:
         server_config = self.get_server_config(screen_name)
         if server_config is not None:
-            server_screen = screens.get_session_by_name(screen_name)
-            if server_screen is not None:
-                server_screen.kill()
-            else:
-                raise ServerIsStoppedError(screen_name)
+            with self.server_lock(screen_name):
+                self.get_backend(server_config).stop(server_config)
         else:
             raise ServerNotExistsError(screen_name)
     
@@ -76,3 +153,54 @@ class MSManager:
         except:
             pass
         self.start_server(screen_name)
+    
+    # ? Server Console
+    def get_console_targets(
+        self,
+        screen_names: Iterable[str],
+        localhost: bool=True
+    ) -> Tuple[Dict[str, Tuple[str, int]], Dict[str, Exception]]:
+        targets, errors = {}, {}
+        for screen_name in screen_names:
+            if (server_config:=self.get_server_config(screen_name)) is None:
+                errors[screen_name] = ServerNotExistsError(screen_name)
+            elif server_config.input_port is None:
+                errors[screen_name] = ServerInputPortError(screen_name)
+            else:
+                # * The server listens to the console socket on localhost by default
+                host = "localhost" if localhost or (server_config.host is None) else server_config.host
+                targets[screen_name] = (host, server_config.input_port)
+        return targets, errors
+    
+    def exec_servers(
+        self,
+        screen_names: Iterable[str],
+        command: str,
+        timeout: float=5,
+        idle: float=0.5,
+        localhost: bool=True
+    ) -> Dict[str, CommandResult]:
+        from .channel import broadcast
+        targets, errors = self.get_console_targets(screen_names, localhost)
+        return {**broadcast(targets, command, timeout, idle), **self.send_servers(errors, command)}
+    
+    def send_servers(self, errors: Dict[str, Exception], command: str) -> Dict[str, CommandResult]:
+        # * Servers without the input port get the command through the backend, without a reply
+        results: Dict[str, CommandResult] = {}
+        for screen_name, error in errors.items():
+            results[screen_name] = error
+            if isinstance(error, ServerInputPortError):
+                server_config = self.get_server_config(screen_name)
+                start = time.monotonic()
+                try:
+                    self.get_backend(server_config).send(server_config, command)
+                    results[screen_name] = CommandReply(lines=[], elapsed=time.monotonic() - start)
+                except Exception as send_error:
+                    results[screen_name] = send_error
+        return results
+    
+    # ? Server Logs
+    def get_server_log_path(self, screen_name: str) -> str:
+        if self.exists_server_config(screen_name):
+            return server_log_path(screen_name)
+        raise ServerNotExistsError(screen_name)
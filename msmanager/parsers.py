@@ -0,0 +1,54 @@
+import re
+from typing import Optional, NamedTuple, Iterable, Tuple
+# * Local Imports
+from .units import COLOR_PATTERN
+
+# ! Constants
+DEFAULT_PORT = 6567
+COLOR_REGEX = re.compile(COLOR_PATTERN)
+ADDRESS_REGEX = re.compile(r"^(?:\[(?P<ipv6>[0-9A-Fa-f:.]+(?:%[^\]\s]+)?)\]|(?P<host>[^\s:\[\]]+))(?::(?P<port>\d{1,5}))?$")
+IPV6_REGEX = re.compile(r"^[0-9A-Fa-f]*:[0-9A-Fa-f:.]*:[0-9A-Fa-f:.]*(?:%\S+)?$")
+# * "openjdk 17.0.2 2022-01-18" from --version and 'java version "1.8.0_292"' from the old -version
+JAVA_VERSION_REGEX = re.compile(r"^\s*\S+\s+(?:version\s+)?\"?(?P<version>\d[^\s\"]*)\"?")
+LOG_LINE_REGEX = re.compile(r"^(?:\[(?P<time>[^\]]*)\]\s+)?\[(?P<level>[DIWE])\]\s?(?P<message>.*)$")
+HEAP_SIZE_REGEX = re.compile(r"^\d+[kKmMgGtT]?$")
+VERSION_MESSAGE_REGEX = re.compile(r"^Version:\s+(?P<build>.+?)\s+/\s+build\s+(?P<version>\S+)\s*$")
+
+# ! Types
+class LogLine(NamedTuple):
+    time: Optional[str]
+    level: str
+    message: str
+
+# ! Functions
+def remove_color(text: str) -> str:
+    return COLOR_REGEX.sub("", text) if "\x1b" in text else text
+
+def parse_address(text: str, default_port: int=DEFAULT_PORT) -> Optional[Tuple[str, int]]:
+    text = text.strip()
+    if (match:=ADDRESS_REGEX.match(text)) is None:
+        # * A bare IPv6 address cannot have a port, the port needs the brackets
+        if IPV6_REGEX.match(text) is not None:
+            return text, default_port
+        return None
+    port = default_port if match["port"] is None else int(match["port"])
+    if port > 65535:
+        return None
+    return match["host"] or match["ipv6"], port
+
+def parse_java_version(text: str) -> Optional[str]:
+    if (match:=JAVA_VERSION_REGEX.match(text.split("\n", 1)[0])) is not None:
+        return match["version"]
+
+def parse_log_line(line: str) -> Optional[LogLine]:
+    if (match:=LOG_LINE_REGEX.match(remove_color(line).rstrip("\r\n"))) is not None:
+        return LogLine(match["time"], match["level"], match["message"])
+
+def find_server_version(lines: Iterable[str]) -> Optional[str]:
+    for line in lines:
+        # * Most lines are not the version line, the cheap test goes first
+        if "Version:" not in line:
+            continue
+        if ((log_line:=parse_log_line(line)) is not None) and (log_line.level == "I") and \
+            ((match:=VERSION_MESSAGE_REGEX.match(log_line.message)) is not None):
+            return match["version"]
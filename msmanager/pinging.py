@@ -0,0 +1,202 @@
+import socket
+import asyncio
+import pydustry
+from time import perf_counter
+from struct import unpack_from
+from typing import Tuple, List, Dict, Iterable, Iterator, Optional, Union
+
+# ! Types
+Address = Tuple[str, int]
+PingResult = Union[pydustry.Status, Exception]
+
+# ! Constants
+STATUS_REQUEST = b"\xfe\x01"
+DATAGRAM_SIZE = 1024
+
+# ! Parse Functions
+def parse_status(data: bytes, ping: int, encoding: str='utf-8', errors: str='strict') -> pydustry.Status:
+    offset, info = 0, {}
+
+    def read_string() -> str:
+        nonlocal offset
+        length = data[offset]
+        value = data[offset+1:offset+1+length].decode(encoding, errors)
+        offset += length + 1
+        return value
+
+    def read_int(fmt: str=">i", size: int=4) -> int:
+        nonlocal offset
+        value = unpack_from(fmt, data, offset)[0]
+        offset += size
+        return value
+
+    info['name'] = read_string()
+    info['map'] = read_string()
+    info['players'] = read_int()
+    info['wave'] = read_int()
+    info['version'] = read_int()
+    info['vertype'] = read_string()
+    info['gamemode'] = read_int(">b", 1)
+    info['limit'] = read_int()
+    info['desc'] = read_string()
+    info['modename'] = read_string()
+    info['ping'] = ping
+    return pydustry.Status(**info)
+
+def status_to_dict(status: pydustry.Status) -> Dict[str, Union[str, int, float]]:
+    return {
+        "name": status.name,
+        "players": status.players,
+        "map": status.map,
+        "wave": status.wave,
+        "ping": status.ping,
+        "version": status.version,
+        "vertype": status.vertype
+    }
+
+# ! Protocol
+class StatusProtocol(asyncio.DatagramProtocol):
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.waiters: Dict[Address, List[List]] = {}
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple) -> None:
+        waiters = self.waiters.pop(addr[:2], None)
+        if waiters is None:
+            return
+        received = perf_counter()
+        for sent, future in waiters:
+            if not future.done():
+                try:
+                    future.set_result(parse_status(data, round((received - sent) * 1000)))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for waiters in self.waiters.values():
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(exc or ConnectionError("The status socket is closed."))
+        self.waiters.clear()
+
+# ! Pinger
+class StatusPinger:
+    def __init__(self, attempts: int=1) -> None:
+        self.attempts = max(1, attempts)
+        self.protocols: Dict[int, StatusProtocol] = {}
+        self.addresses: Dict[Address, Tuple[int, Address]] = {}
+        self._endpoint_lock: Optional[asyncio.Lock] = None
+
+    async def resolve(self, host: str, port: int) -> Tuple[int, Address]:
+        if (resolved:=self.addresses.get((host, port))) is not None:
+            return resolved
+        for family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                # * The replies come from the canonical form ("0:0::1" answers as "::1"), the waiters are keyed by it
+                resolved = (family, (socket.inet_ntop(family, socket.inet_pton(family, host)), port))
+                break
+            except OSError:
+                pass
+        else:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+            infos.sort(key=lambda info: info[0] != socket.AF_INET)
+            resolved = (infos[0][0], infos[0][4][:2])
+        self.addresses[(host, port)] = resolved
+        return resolved
+
+    async def endpoint(self, family: int) -> StatusProtocol:
+        if (protocol:=self.protocols.get(family)) is not None:
+            return protocol
+        if self._endpoint_lock is None:
+            self._endpoint_lock = asyncio.Lock()
+        async with self._endpoint_lock:
+            if (protocol:=self.protocols.get(family)) is None:
+                _, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+                    StatusProtocol, family=family
+                )
+                self.protocols[family] = protocol
+        return protocol
+
+    async def status(self, host: str, port: int, timeout: float=10) -> pydustry.Status:
+        if not (isinstance(host, str) and isinstance(port, int)):
+            raise ValueError(f"Incorrect server address: {host}:{port}")
+        family, address = await self.resolve(host, port)
+        protocol = await self.endpoint(family)
+        future = asyncio.get_running_loop().create_future()
+        waiter = [perf_counter(), future]
+        protocol.waiters.setdefault(address, []).append(waiter)
+        try:
+            for _ in range(self.attempts):
+                protocol.transport.sendto(STATUS_REQUEST, address)
+                await asyncio.wait({future}, timeout=timeout / self.attempts)
+                if future.done():
+                    return future.result()
+            raise socket.timeout("timed out")
+        finally:
+            if (waiters:=protocol.waiters.get(address)) is not None:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if len(waiters) == 0:
+                    protocol.waiters.pop(address, None)
+            if not future.done():
+                future.cancel()
+
+    def close(self) -> None:
+        for protocol in self.protocols.values():
+            if protocol.transport is not None:
+                protocol.transport.close()
+        self.protocols.clear()
+
+# ! Functions
+async def aping_many(
+    targets: Iterable[Address],
+    timeout: float=10,
+    attempts: int=1
+) -> Dict[Address, PingResult]:
+    targets, pinger = list(dict.fromkeys(targets)), StatusPinger(attempts)
+    try:
+        results = await asyncio.gather(
+            *[pinger.status(host, port, timeout) for host, port in targets],
+            return_exceptions=True
+        )
+    finally:
+        pinger.close()
+    return dict(zip(targets, results))
+
+def ping_many(
+    targets: Iterable[Address],
+    timeout: float=10,
+    attempts: int=1
+) -> Dict[Address, PingResult]:
+    return asyncio.run(aping_many(targets, timeout, attempts))
+
+def iter_ping(
+    targets: Iterable[Address],
+    timeout: float=10,
+    attempts: int=1
+) -> Iterator[Tuple[Address, PingResult]]:
+    # * The results are yielded in the order they arrive, not in the order of the targets
+    targets, pinger = list(dict.fromkeys(targets)), StatusPinger(attempts)
+    loop = asyncio.new_event_loop()
+    tasks = {loop.create_task(pinger.status(host, port, timeout)): (host, port) for host, port in targets}
+    pending = set(tasks)
+    try:
+        while len(pending) != 0:
+            done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+            for task in done:
+                yield tasks[task], task.exception() or task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if len(pending) != 0:
+            loop.run_until_complete(asyncio.wait(pending))
+        # * The results left after an early exit are retrieved so that they are not reported as lost
+        for task in tasks:
+            if not task.cancelled():
+                task.exception()
+        pinger.close()
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
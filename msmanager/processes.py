@@ -0,0 +1,122 @@
+import os
+import asyncio
+from typing import Optional, List, Dict
+
+# ! Constants
+PROC_DIRPATH = "/proc"
+
+# ! Functions
+def read_stat(pid: int) -> Optional[List[bytes]]:
+    # * The fields after the command name, the name itself may contain spaces and brackets
+    try:
+        with open(f"{PROC_DIRPATH}/{pid}/stat", "rb") as file:
+            return file.read().rsplit(b")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+
+def process_start_time(pid: int) -> Optional[int]:
+    # * The start time tells a reused PID from the original process (Linux only)
+    if (fields:=read_stat(pid)) is None:
+        return None
+    if fields[0] == b"Z":
+        return -1
+    return int(fields[19])
+
+def process_is_alive(pid: int, start_time: Optional[int]=None) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    current = process_start_time(pid)
+    if current == -1:
+        return False
+    return (start_time is None) or (current is None) or (current == start_time)
+
+def process_name(pid: int) -> Optional[str]:
+    try:
+        with open(f"{PROC_DIRPATH}/{pid}/comm", "rb") as file:
+            return file.read().decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+
+def process_children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir(PROC_DIRPATH)
+    except OSError:
+        return children
+    for entry in entries:
+        if entry.isdigit() and ((fields:=read_stat(int(entry))) is not None):
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+def find_process(pid: int, name: str="java") -> Optional[int]:
+    # * A screen session runs the server as a grandchild (SCREEN -> shell -> java)
+    if process_name(pid) == name:
+        return pid
+    children, queue = process_children(), [pid]
+    while len(queue) != 0:
+        for child in children.get(queue.pop(0), []):
+            if process_name(child) == name:
+                return child
+            queue.append(child)
+
+# ! Process Watcher
+class ProcessWatcher:
+    def __init__(self, poll_interval: float=0.5) -> None:
+        self.poll_interval = poll_interval
+        self.pidfd = hasattr(os, "pidfd_open")
+        self.watches: Dict[int, "asyncio.Future[int]"] = {}
+
+    def watch(self, pid: int) -> "asyncio.Future[int]":
+        if ((future:=self.watches.get(pid)) is not None) and not future.done():
+            return future
+        loop = asyncio.get_running_loop()
+        future = self.watches[pid] = loop.create_future()
+        future.add_done_callback(lambda _: self.forget(pid, future))
+        if self.pidfd:
+            try:
+                descriptor = os.pidfd_open(pid)
+            except ProcessLookupError:
+                future.set_result(pid)
+                return future
+            except OSError:
+                # * pidfd needs Linux 5.3, older kernels and sandboxes fall back to polling
+                self.pidfd = False
+            else:
+                # * The descriptor becomes readable when the process exits
+                loop.add_reader(descriptor, self.exited, pid, future)
+                future.add_done_callback(lambda _: self.close_descriptor(loop, descriptor))
+                return future
+        polling = loop.create_task(self.poll(pid, future))
+        future.add_done_callback(lambda _: polling.cancel())
+        return future
+
+    @staticmethod
+    def exited(pid: int, future: "asyncio.Future[int]") -> None:
+        if not future.done():
+            future.set_result(pid)
+
+    @staticmethod
+    def close_descriptor(loop: asyncio.AbstractEventLoop, descriptor: int) -> None:
+        loop.remove_reader(descriptor)
+        os.close(descriptor)
+
+    async def poll(self, pid: int, future: "asyncio.Future[int]") -> None:
+        start_time = process_start_time(pid)
+        while not future.done():
+            if not process_is_alive(pid, start_time):
+                self.exited(pid, future)
+                break
+            await asyncio.sleep(self.poll_interval)
+
+    def forget(self, pid: int, future: "asyncio.Future[int]") -> None:
+        if self.watches.get(pid) is future:
+            del self.watches[pid]
+
+    def close(self) -> None:
+        for future in list(self.watches.values()):
+            future.cancel()
+        self.watches.clear()
@@ -0,0 +1,138 @@
+import os
+import re
+import time
+import random
+import socket
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Callable, Literal, Union, List
+# * Local Imports
+from .models import MindustryServerConfig, ReadinessResult
+from .logs import server_log_path
+from .units import START_TIMEOUT
+
+# ! Types
+ProbeKind = Literal['status', 'tcp', 'log']
+
+# ! Constants
+# * The server config fields each probe needs, the log probe only reads the server log
+PROBE_FIELDS = {
+    'status': ("host", "port"),
+    'tcp': ("host", "input_port"),
+    'log': ()
+}
+
+# ! Probes
+class Probe(ABC):
+    name: str = "probe"
+
+    @abstractmethod
+    def __call__(self, timeout: float) -> None:
+        ...
+
+class StatusProbe(Probe):
+    name = "status"
+
+    def __init__(self, host: str, port: int=6567) -> None:
+        import pydustry
+        self.server = pydustry.Server(host, port)
+
+    def __call__(self, timeout: float) -> None:
+        self.server.get_status(timeout)
+
+class TCPProbe(Probe):
+    name = "tcp"
+
+    def __init__(self, host: str, port: int=6859) -> None:
+        self.address = (host, port)
+
+    def __call__(self, timeout: float) -> None:
+        socket.create_connection(self.address, timeout).close()
+
+class LogProbe(Probe):
+    name = "log"
+
+    def __init__(self, filepath: str, pattern: Union[str, re.Pattern]=r"Server loaded\.") -> None:
+        self.filepath = filepath
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        # * Only lines written after the probe was created are taken into account
+        try: self.offset = os.path.getsize(filepath)
+        except OSError: self.offset = 0
+        self.tail = ""
+
+    def __call__(self, timeout: float) -> None:
+        with open(self.filepath, "r", errors="replace") as file:
+            if os.fstat(file.fileno()).st_size < self.offset:
+                self.offset, self.tail = 0, ""
+            file.seek(self.offset)
+            text = self.tail + file.read()
+            self.offset = file.tell()
+        lines = text.split("\n")
+        self.tail = lines.pop()
+        for line in lines:
+            if self.pattern.search(line) is not None:
+                return
+        raise TimeoutError(f"The line {repr(self.pattern.pattern)} has not appeared in {repr(self.filepath)}.")
+
+def missing_probe_fields(server: MindustryServerConfig, kind: ProbeKind='status') -> List[str]:
+    return [field for field in PROBE_FIELDS[kind] if getattr(server, field) is None]
+
+def server_probe(server: MindustryServerConfig, kind: ProbeKind='status', host: Optional[str]=None) -> Probe:
+    host = host or server.host
+    if kind == 'status':
+        return StatusProbe(host, server.port)
+    elif kind == 'tcp':
+        if server.input_port is None:
+            raise ValueError(f"The server {repr(server.screen_name)} has no input port for the TCP probe.")
+        return TCPProbe(host, server.input_port)
+    elif kind == 'log':
+        return LogProbe(server_log_path(server.screen_name))
+    raise ValueError(f"The {repr(kind)} probe cannot be created from the server config.")
+
+# ! Waiter
+def wait_ready(
+    probe: Union[Probe, Callable[[float], None]],
+    timeout: Optional[float]=START_TIMEOUT,
+    *,
+    attempt_timeout: float=1,
+    initial_delay: float=0.25,
+    max_delay: float=5,
+    factor: float=2,
+    cancel: Optional[threading.Event]=None
+) -> ReadinessResult:
+    start = time.monotonic()
+    deadline = None if timeout is None else start + timeout
+    delay, attempts, error = initial_delay, 0, None
+
+    def result(ready: bool) -> ReadinessResult:
+        return ReadinessResult(
+            ready=ready,
+            elapsed=time.monotonic() - start,
+            attempts=attempts,
+            probe=getattr(probe, "name", "probe"),
+            cancelled=(cancel is not None) and cancel.is_set(),
+            error=None if (ready or (error is None)) else repr(error)
+        )
+
+    while True:
+        if (cancel is not None) and cancel.is_set():
+            return result(False)
+        attempts += 1
+        per_attempt = attempt_timeout
+        if deadline is not None:
+            per_attempt = max(0.01, min(per_attempt, deadline - time.monotonic()))
+        try:
+            probe(per_attempt)
+            return result(True)
+        except Exception as e:
+            error = e
+        sleep = delay / 2 + random.uniform(0, delay / 2)
+        if deadline is not None:
+            if (remaining:=deadline - time.monotonic()) <= 0:
+                return result(False)
+            sleep = min(sleep, remaining)
+        if cancel is not None:
+            cancel.wait(sleep)
+        else:
+            time.sleep(sleep)
+        delay = min(delay * factor, max_delay)
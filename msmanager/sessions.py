@@ -0,0 +1,85 @@
+import re
+import time
+import shutil
+import threading
+from typing import Optional, Dict
+# * Local Imports
+from .models import ScreenSession
+from .functions import run_binary
+from .exceptions import ScreenNotWorkingError
+
+# ! Constants
+SESSION_PATTERN = re.compile(r"^\s+(\d+)\.(\S+)\s+(.*)$")
+STATE_PATTERN = re.compile(r"\(([^()]*)\)")
+
+# ! Functions
+def parse_sessions(text: str) -> Dict[str, ScreenSession]:
+    sessions: Dict[str, ScreenSession] = {}
+    for line in text.splitlines():
+        if (match:=SESSION_PATTERN.match(line)) is not None:
+            states = STATE_PATTERN.findall(match.group(3))
+            sessions.setdefault(
+                match.group(2),
+                ScreenSession(
+                    pid=int(match.group(1)),
+                    name=match.group(2),
+                    state=states[-1] if len(states) != 0 else "Unknown"
+                )
+            )
+    return sessions
+
+def list_sessions() -> Dict[str, ScreenSession]:
+    if (screen:=shutil.which("screen")) is None:
+        raise ScreenNotWorkingError()
+    return parse_sessions(run_binary(screen, "-ls")[1])
+
+def kill_session(session: ScreenSession) -> None:
+    if (screen:=shutil.which("screen")) is None:
+        raise ScreenNotWorkingError()
+    target = session.name if session.pid is None else f"{session.pid}.{session.name}"
+    run_binary(screen, "-S", target, "-X", "quit")
+
+def send_to_session(session: ScreenSession, command: str) -> None:
+    if (screen:=shutil.which("screen")) is None:
+        raise ScreenNotWorkingError()
+    target = session.name if session.pid is None else f"{session.pid}.{session.name}"
+    run_binary(screen, "-S", target, "-p", "0", "-X", "stuff", f"{command}\r")
+
+def enable_logging(name: str, filepath: str, flush: int=1) -> None:
+    if (screen:=shutil.which("screen")) is None:
+        raise ScreenNotWorkingError()
+    run_binary(screen, "-S", name, "-X", "logfile", filepath)
+    run_binary(screen, "-S", name, "-X", "logfile", "flush", str(flush))
+    run_binary(screen, "-S", name, "-X", "log", "on")
+
+# ! Snapshot
+class SessionSnapshot:
+    def __init__(self, ttl: float=2) -> None:
+        self.ttl = ttl
+        self.sessions: Dict[str, ScreenSession] = {}
+        self.updated: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def get(self, refresh: bool=False) -> Dict[str, ScreenSession]:
+        with self.lock:
+            if refresh or (self.updated is None) or (time.monotonic() - self.updated > self.ttl):
+                self.sessions = list_sessions()
+                self.updated = time.monotonic()
+            return self.sessions
+
+    def get_session(self, name: str) -> Optional[ScreenSession]:
+        return self.get().get(name)
+
+    def add(self, session: ScreenSession) -> None:
+        with self.lock:
+            if self.updated is not None:
+                self.sessions = {**self.sessions, session.name: session}
+
+    def discard(self, name: str) -> None:
+        with self.lock:
+            if (self.updated is not None) and (name in self.sessions):
+                self.sessions = {k: v for k, v in self.sessions.items() if k != name}
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.updated = None
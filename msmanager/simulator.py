@@ -0,0 +1,240 @@
+import os
+import time
+import random
+import struct
+import asyncio
+from typing import Optional, Callable, Iterable, Tuple, List, Dict, Any
+# * Local Imports
+from .config import MSManagerConfig
+from .models import MindustryServerConfig
+
+# ! Types
+EventHandler = Callable[[str, Optional["SimulatedServer"], Dict[str, Any]], None]
+
+# ! Constants
+STATUS_REQUEST = b"\xfe\x01"
+SIMULATED_VERSION = 146
+SIMULATED_EXECUTABLE = "simulated-server-release.jar"
+
+# ! Functions
+def pack_string(value: str) -> bytes:
+    data = value.encode()[:255]
+    return bytes([len(data)]) + data
+
+def build_status(name: str, map_name: str, players: int, wave: int, limit: int=0) -> bytes:
+    return b"".join(
+        [
+            pack_string(name),
+            pack_string(map_name),
+            struct.pack(">iii", players, wave, SIMULATED_VERSION),
+            pack_string("official"),
+            struct.pack(">b", 0),
+            struct.pack(">i", limit),
+            pack_string("Simulated by msmanager"),
+            pack_string("")
+        ]
+    )
+
+def register_servers(config: MSManagerConfig, servers: Iterable[MindustryServerConfig]) -> None:
+    config.add_servers(servers)
+
+def unregister_servers(config: MSManagerConfig, screen_names: Iterable[str]) -> None:
+    screen_names = set(screen_names)
+    with config.transaction():
+        config.config.servers = [i for i in config.config.servers if i.screen_name not in screen_names]
+        config.reindex()
+
+# ! Protocols
+class StatusServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "SimulatedServer") -> None:
+        self.server = server
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        simulator = self.server.simulator
+        if data[:2] != STATUS_REQUEST:
+            return
+        simulator.stats["queries"] += 1
+        if random.random() < simulator.loss:
+            simulator.stats["dropped"] += 1
+            return
+        delay = simulator.delay()
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.reply, addr)
+        else:
+            self.reply(addr)
+
+    def reply(self, addr: Tuple[str, int]) -> None:
+        if (self.transport is not None) and not self.transport.is_closing():
+            self.transport.sendto(self.server.status(), addr)
+            self.server.simulator.stats["answered"] += 1
+
+# ! Simulated Server
+class SimulatedServer:
+    def __init__(self, simulator: "Simulator", name: str, port: int, input_port: int) -> None:
+        self.simulator = simulator
+        self.name = name
+        self.port = port
+        self.input_port = input_port
+        # * Runtime
+        self.up = False
+        self.started: Optional[float] = None
+        self.crashed: Optional[asyncio.Event] = None
+        self.status_transport: Optional[asyncio.DatagramTransport] = None
+        self.console: Optional[asyncio.AbstractServer] = None
+
+    def config(self, work_dirpath: str) -> MindustryServerConfig:
+        return MindustryServerConfig(
+            screen_name=self.name,
+            work_dirpath=work_dirpath,
+            executable_filepath=os.path.join(work_dirpath, SIMULATED_EXECUTABLE),
+            arguments=[],
+            host=self.simulator.host,
+            port=self.port,
+            input_port=self.input_port
+        )
+
+    def status(self) -> bytes:
+        uptime = time.monotonic() - self.started
+        players = (hash(self.name) + int(uptime // 10)) % 16
+        return build_status(self.name, "Ancient Caldera", players, int(uptime // 30) + 1)
+
+    # ? Console
+    async def handle_console(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while len(line:=await reader.readline()) != 0:
+                command = line.decode("utf-8", "replace").strip()
+                self.simulator.stats["commands"] += 1
+                if (delay:=self.simulator.delay()) > 0:
+                    await asyncio.sleep(delay)
+                if command in ("exit", "stop"):
+                    writer.write(b"[I] Shutting down server.\n")
+                    await writer.drain()
+                    self.crashed.set()
+                    break
+                elif command == "status":
+                    uptime = time.monotonic() - self.started
+                    writer.write(
+                        f"[I] Status:\n[I]   Playing on map Ancient Caldera / Wave {int(uptime // 30) + 1}\n".encode()
+                    )
+                else:
+                    writer.write(f"[I] {command}\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ? Lifecycle
+    async def open(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.started = time.monotonic()
+        self.status_transport, _ = await loop.create_datagram_endpoint(
+            lambda: StatusServerProtocol(self), local_addr=(self.simulator.host, self.port)
+        )
+        self.console = await asyncio.start_server(self.handle_console, self.simulator.host, self.input_port)
+        self.up = True
+        # * Made inside the running loop, before Python 3.10 an Event is bound to the loop it was made in
+        self.crashed = asyncio.Event()
+
+    def close(self) -> None:
+        self.up = False
+        if self.status_transport is not None:
+            self.status_transport.close()
+            self.status_transport = None
+        if self.console is not None:
+            self.console.close()
+            self.console = None
+
+    async def run(self) -> None:
+        simulator = self.simulator
+        try:
+            while True:
+                if (slow_start:=random.uniform(*simulator.slow_start)) > 0:
+                    await asyncio.sleep(slow_start)
+                await self.open()
+                simulator.emit("up", self, slow_start=slow_start)
+                timeout = None
+                if simulator.crash_rate > 0:
+                    # * Crashes are a Poisson process, crash_rate is the mean number per hour
+                    timeout = random.expovariate(simulator.crash_rate / 3600)
+                try:
+                    await asyncio.wait_for(self.crashed.wait(), timeout)
+                    reason = "stopped"
+                except asyncio.TimeoutError:
+                    reason = "crashed"
+                self.close()
+                simulator.stats[reason] += 1
+                simulator.emit("down", self, reason=reason, uptime=time.monotonic() - self.started)
+                if simulator.downtime is None:
+                    break
+                await asyncio.sleep(simulator.downtime)
+        finally:
+            self.close()
+
+# ! Simulator
+class Simulator:
+    def __init__(
+        self,
+        count: int,
+        *,
+        host: str="127.0.0.1",
+        port: int=20000,
+        input_port: int=30000,
+        prefix: str="sim-",
+        latency: float=0,
+        jitter: float=0,
+        loss: float=0,
+        crash_rate: float=0,
+        downtime: Optional[float]=30,
+        slow_start: Tuple[float, float]=(0, 0),
+        report_interval: Optional[float]=None,
+        on_event: Optional[EventHandler]=None
+    ) -> None:
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.crash_rate = crash_rate
+        self.downtime = downtime
+        self.slow_start = slow_start
+        self.report_interval = report_interval
+        self.on_event = on_event
+        self.servers: List[SimulatedServer] = [
+            SimulatedServer(self, f"{prefix}{idx}", port + idx, input_port + idx) for idx in range(count)
+        ]
+        self.stats: Dict[str, int] = {"queries": 0, "answered": 0, "dropped": 0, "commands": 0, "crashed": 0, "stopped": 0}
+
+    def delay(self) -> float:
+        return max(0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def emit(self, event: str, server: Optional[SimulatedServer], **data: Any) -> None:
+        if self.on_event is not None:
+            self.on_event(event, server, data)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {**self.stats, "servers": len(self.servers), "up": sum(i.up for i in self.servers)}
+
+    async def report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.emit("stats", None, **self.get_state(), cpu=time.process_time())
+
+    async def run(self, duration: Optional[float]=None) -> None:
+        tasks = [asyncio.create_task(server.run()) for server in self.servers]
+        if self.report_interval is not None:
+            tasks.append(asyncio.create_task(self.report()))
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def start(self, duration: Optional[float]=None) -> None:
+        asyncio.run(self.run(duration))
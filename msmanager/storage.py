@@ -0,0 +1,91 @@
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional, Tuple, Dict, Iterator, Any
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# ! Types
+Signature = Tuple[int, int]
+
+# ! Functions
+def get_signature(filepath: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def atomic_write(filepath: str, text: str) -> None:
+    dirpath, filename = os.path.split(filepath)
+    os.makedirs(dirpath, exist_ok=True)
+    fd, temppath = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=dirpath)
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temppath, filepath)
+    except:
+        try: os.remove(temppath)
+        except OSError: pass
+        raise
+
+@contextmanager
+def file_lock(filepath: str) -> Iterator[None]:
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(f"{filepath}.lock", "a+") as lockfile:
+        if fcntl is not None:
+            fcntl.flock(lockfile.fileno(), fcntl.LOCK_EX)
+        else:
+            lockfile.seek(0)
+            msvcrt.locking(lockfile.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
+            else:
+                lockfile.seek(0)
+                msvcrt.locking(lockfile.fileno(), msvcrt.LK_UNLCK, 1)
+
+# ! Disk Cache
+class DiskCache:
+    def __init__(self, filepath: str, max_entries: int=256) -> None:
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.data: Optional[Dict[str, Any]] = None
+        self.lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        if self.data is None:
+            try:
+                with open(self.filepath) as file:
+                    self.data = json.load(file)
+                if not isinstance(self.data, dict):
+                    self.data = {}
+            except (OSError, ValueError):
+                self.data = {}
+        return self.data
+
+    def get(self, key: str, default: Any=None) -> Any:
+        with self.lock:
+            return self.load().get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            data = self.load()
+            data.pop(key, None)
+            data[key] = value
+            while len(data) > self.max_entries:
+                data.pop(next(iter(data)))
+            try:
+                atomic_write(self.filepath, json.dumps(data))
+            except OSError:
+                pass
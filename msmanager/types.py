@@ -1,6 +1,41 @@
-from vbml import Patcher
-from versioner import Versioner
+from __future__ import annotations
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Any
+
+# * Type Imports
+if TYPE_CHECKING:
+    from vbml import Patcher, Pattern
+    from versioner import Versioner
+
+# ! Vars
+default_versioner: Optional[Versioner] = None
+default_vbml_patcher: Optional[Patcher] = None
+
+# ! Getters
+def get_versioner() -> Versioner:
+    global default_versioner
+    if default_versioner is None:
+        from versioner import Versioner
+        default_versioner = Versioner()
+    return default_versioner
+
+def get_vbml_patcher() -> Patcher:
+    global default_vbml_patcher
+    if default_vbml_patcher is None:
+        from vbml import Patcher
+        default_vbml_patcher = Patcher()
+    return default_vbml_patcher
+
+# * Building a pattern parses its text, so every pattern is built once
+@lru_cache(maxsize=256)
+def get_vbml_pattern(text: str) -> Pattern:
+    from vbml import Pattern
+    return Pattern(text)
 
 # ! Variable Types
-DefaultVersioner = Versioner()
-DefaultVBMLPacther = Patcher()
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    if name == "DefaultVersioner":
+        return get_versioner()
+    elif name == "DefaultVBMLPacther":
+        return get_vbml_patcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 import os
-from platformdirs import user_config_dir
+import warnings
+from platformdirs import user_config_dir, user_cache_dir, user_data_dir, user_runtime_dir
 
 # ! Metadata
 __prog_name__ = "msmanager"
@@ -13,12 +14,28 @@ __url__ = "https://github.com/RCR-OOP/msmanager"
 SUPPORT_PLATFORMS = [
     "windows-amd64", "windows-x86_64", "linux-x86_64"
 ]
-CONFIG_DIRPATH      = user_config_dir(__prog_name__, __author__, ensure_exists=True)
+CONFIG_DIRPATH      = user_config_dir(__prog_name__, __author__)
 CONFIG_PATH         = os.path.join(CONFIG_DIRPATH, "msmanager_config.json")
 ERRORLOG_DIRPATH    = os.path.join(CONFIG_DIRPATH, "errors")
+CACHE_DIRPATH       = user_cache_dir(__prog_name__, __author__)
+PROBES_CACHE_PATH   = os.path.join(CACHE_DIRPATH, "probes.json")
+VERSIONS_CACHE_PATH = os.path.join(CACHE_DIRPATH, "versions.json")
+DATA_DIRPATH        = user_data_dir(__prog_name__, __author__)
+HISTORY_DIRPATH     = os.path.join(DATA_DIRPATH, "history")
+LOGS_DIRPATH        = os.path.join(DATA_DIRPATH, "logs")
+LOG_OFFSETS_PATH    = os.path.join(CACHE_DIRPATH, "log_offsets.json")
+CDS_DIRPATH         = os.path.join(CACHE_DIRPATH, "cds")
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    RUNTIME_DIRPATH = user_runtime_dir(__prog_name__, __author__)
+AGENT_SOCKET_PATH   = os.path.join(RUNTIME_DIRPATH, "agent.sock")
+
+# ! Timeouts
+PROBE_TIMEOUT = 15
+START_TIMEOUT = 300
+JVM_VERSION_TIMEOUT = 120
+AGENT_TIMEOUT = 600
 
 # ! Regex
 COLOR_PATTERN = r"\x1b\[[0-9;]*m"
-
-# ! Creating directoryes
-os.makedirs(ERRORLOG_DIRPATH, exist_ok=True)
\ No newline at end of file
+BUILD_PATTERN = r"\d+(\.\d+)?"
\ No newline at end of file
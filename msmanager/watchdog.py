@@ -0,0 +1,300 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Iterable, Deque, Dict, Any
+# * Local Imports
+from .msm import MSManager
+from .models import MindustryServerConfig, HealthPolicy, ReadinessResult
+from .pinging import StatusPinger
+from .processes import ProcessWatcher
+from .functions import wait_start_server
+from .units import START_TIMEOUT
+from .readiness import ProbeKind, server_probe
+from .metrics import ServerMetrics
+from .history import HistoryStore
+from .exceptions import ServerIsStoppedError, ServerStartTimeoutError
+
+# ! Types
+EventHandler = Callable[[str, MindustryServerConfig, Dict[str, Any]], None]
+
+# ! Constants
+LOOKUP_WORKERS = 2
+
+# ! Watchdog
+class Watchdog:
+    def __init__(
+        self,
+        msmanager: MSManager,
+        servers: Iterable[MindustryServerConfig],
+        *,
+        interval: float=60,
+        check_timeout: float=1,
+        checks: int=3,
+        ping_timeout: float=10,
+        max_restarts: int=4,
+        restart_limit: int=5,
+        restart_window: float=600,
+        backoff: float=5,
+        backoff_max: float=300,
+        cooldown: float=1800,
+        start_timeout: float=START_TIMEOUT,
+        probe: ProbeKind='status',
+        localhost: bool=False,
+        process_watch: bool=True,
+        on_event: Optional[EventHandler]=None,
+        metrics: Optional[ServerMetrics]=None,
+        history: Optional[HistoryStore]=None
+    ) -> None:
+        self.msmanager = msmanager
+        self.servers = list(servers)
+        # * The defaults for the servers without their own health policy
+        self.defaults = HealthPolicy(
+            interval=interval,
+            check_timeout=check_timeout,
+            checks=checks,
+            ping_timeout=ping_timeout,
+            restart_limit=restart_limit,
+            restart_window=restart_window,
+            backoff=backoff,
+            backoff_max=backoff_max,
+            cooldown=cooldown
+        )
+        self.max_restarts = max(1, max_restarts)
+        self.start_timeout = start_timeout
+        self.probe = probe
+        self.localhost = localhost
+        self.process_watch = process_watch
+        self.on_event = on_event
+        self.metrics = metrics
+        self.history = history
+        # * Runtime
+        self.pinger: Optional[StatusPinger] = None
+        self.processes: Optional[ProcessWatcher] = None
+        self.restarts: Optional[asyncio.Semaphore] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        # * The config reads and pid lookups have their own pool, a long restart must not delay them
+        self.lookups: Optional[ThreadPoolExecutor] = None
+        self.stopping = threading.Event()
+        self.state: Dict[str, Dict[str, Any]] = {}
+
+    def update_state(self, event: str, server: MindustryServerConfig, data: Dict[str, Any]) -> None:
+        state = self.state.setdefault(
+            server.screen_name,
+            {
+                "ok": None, "pid": None, "parked": False,
+                "checks": 0, "failed_checks": 0, "exits": 0, "restarts": 0, "failed_restarts": 0
+            }
+        )
+        state["last_event"], state["last_event_time"] = event, time.time()
+        if event == "check":
+            state["ok"] = data["ok"]
+            state["checks"] += 1
+            if not data["ok"]:
+                state["failed_checks"] += 1
+        elif event == "tracked":
+            state["pid"] = data["pid"]
+        elif event == "exited":
+            state["pid"] = None
+            state["exits"] += 1
+        elif event == "parked":
+            state["parked"], state["parked_until"] = True, data["until"]
+        elif event == "unparked":
+            state["parked"], state["parked_until"] = False, None
+        elif event == "restarted":
+            state["restarts"] += 1
+        elif event == "restart_failed":
+            state["failed_restarts"] += 1
+
+    def emit(self, event: str, server: MindustryServerConfig, **data: Any) -> None:
+        self.update_state(event, server, data)
+        if self.metrics is not None:
+            self.metrics.observe_event(event, server.screen_name, data)
+        if self.history is not None:
+            self.history.observe_event(event, server.screen_name, data)
+        if self.on_event is not None:
+            self.on_event(event, server, data)
+
+    def policy(self, server: MindustryServerConfig) -> HealthPolicy:
+        if server.health is None:
+            return self.defaults
+        policy = self.defaults.copy(update=server.health.dict(exclude_none=True))
+        policy.checks = max(1, policy.checks)
+        policy.restart_limit = max(1, policy.restart_limit)
+        return policy
+
+    def read_server(self, server: MindustryServerConfig) -> MindustryServerConfig:
+        # * The agent reloads the config on every call, a local config is reloaded here (one stat call)
+        if (config:=getattr(self.msmanager, "config", None)) is not None:
+            config.reload()
+        return self.msmanager.get_server_config(server.screen_name) or server
+
+    async def refresh(self, server: MindustryServerConfig) -> MindustryServerConfig:
+        # * The policy changed with `msmanager policy` is picked up after the next check
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.lookups, self.read_server, server)
+        except Exception:
+            return server
+
+    # ? Checks
+    async def check(self, server: MindustryServerConfig, policy: HealthPolicy) -> bool:
+        host = "localhost" if self.localhost else server.host
+        start = time.monotonic()
+        try:
+            status = await self.pinger.status(host, server.port, policy.ping_timeout)
+        except Exception as e:
+            self.emit("check", server, ok=False, error=e, duration=time.monotonic() - start)
+            return False
+        self.emit("check", server, ok=True, status=status, duration=time.monotonic() - start)
+        return True
+
+    # ? Processes
+    async def track(self, server: MindustryServerConfig) -> Optional["asyncio.Future[int]"]:
+        if (not self.process_watch) or self.stopping.is_set():
+            return None
+        try:
+            pid = await asyncio.get_running_loop().run_in_executor(
+                self.lookups, self.msmanager.get_server_pid, server.screen_name
+            )
+        except Exception:
+            return None
+        if pid is None:
+            return None
+        self.emit("tracked", server, pid=pid)
+        return self.processes.watch(pid)
+
+    async def check_alive(
+        self,
+        server: MindustryServerConfig,
+        policy: HealthPolicy,
+        exited: "asyncio.Future[int]",
+        delay: float
+    ) -> Optional[bool]:
+        # * The process exit wakes the watchdog at once, the pings only catch hung servers
+        await asyncio.wait([exited], timeout=delay)
+        if not exited.done():
+            checking = asyncio.ensure_future(self.check(server, policy))
+            await asyncio.wait([checking, exited], return_when=asyncio.FIRST_COMPLETED)
+            if not exited.done():
+                return checking.result()
+            checking.cancel()
+        return None
+
+    # ? Restarts
+    def restart_server(self, server: MindustryServerConfig) -> ReadinessResult:
+        try:
+            self.msmanager.stop_server(server.screen_name)
+        except ServerIsStoppedError:
+            pass
+        probe = server_probe(server, self.probe, "localhost" if self.localhost else None)
+        self.msmanager.start_server(server.screen_name)
+        result = wait_start_server(
+            server.host, server.port, server.input_port,
+            timeout=self.start_timeout,
+            probe=probe,
+            cancel=self.stopping
+        )
+        if not (result.ready or result.cancelled):
+            raise ServerStartTimeoutError(server.screen_name, self.start_timeout)
+        return result
+
+    async def restart(self, server: MindustryServerConfig) -> bool:
+        async with self.restarts:
+            self.emit("restart", server)
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.restart_server, server
+                )
+            except Exception as e:
+                self.emit("restart_failed", server, error=e)
+                return False
+        self.emit("restarted", server, result=result)
+        return True
+
+    async def hold_restart(
+        self,
+        server: MindustryServerConfig,
+        policy: HealthPolicy,
+        restarts: Deque[float],
+        attempt: int
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        while (len(restarts) != 0) and (restarts[0] <= loop.time() - policy.restart_window):
+            restarts.popleft()
+        if len(restarts) >= policy.restart_limit:
+            # * The circuit is open: a crash-looping server is parked instead of restarted
+            self.emit("parked", server, restarts=len(restarts), until=time.time() + policy.cooldown)
+            await asyncio.sleep(policy.cooldown)
+            restarts.clear()
+            self.emit("unparked", server)
+            return False
+        if attempt > 0:
+            delay = min(policy.backoff * 2 ** (attempt - 1), policy.backoff_max)
+            self.emit("backoff", server, attempt=attempt, delay=delay)
+            await asyncio.sleep(delay)
+        return True
+
+    # ? Scheduling
+    async def watch(self, server: MindustryServerConfig) -> None:
+        loop, failures = asyncio.get_running_loop(), 0
+        policy = self.policy(server)
+        # * Restarts in the window for the circuit breaker, restarts in a row for the backoff
+        restarts: Deque[float] = deque()
+        attempt = 0
+        next_check = loop.time()
+        exited = await self.track(server)
+        while True:
+            delay = max(0, next_check - loop.time())
+            if exited is not None:
+                ok = await self.check_alive(server, policy, exited, delay)
+            else:
+                await asyncio.sleep(delay)
+                ok = await self.check(server, policy)
+            server = await self.refresh(server)
+            policy = self.policy(server)
+            if ok is None:
+                self.emit("exited", server, pid=exited.result())
+                failures = policy.checks
+            elif ok:
+                failures, attempt = 0, 0
+                next_check += policy.interval
+                if exited is None:
+                    exited = await self.track(server)
+            else:
+                failures += 1
+                next_check = loop.time() + policy.check_timeout
+            if failures >= policy.checks:
+                if exited is not None:
+                    exited.cancel()
+                # * After the cooldown the server is checked again before the next restart
+                if await self.hold_restart(server, policy, restarts, attempt):
+                    restarts.append(loop.time())
+                    attempt += 1
+                    restarted = await self.restart(server)
+                    next_check = loop.time() + (policy.interval if restarted else policy.check_timeout)
+                else:
+                    next_check = loop.time()
+                failures = 0
+                exited = await self.track(server)
+            if next_check < loop.time():
+                next_check = loop.time()
+
+    async def run(self) -> None:
+        self.stopping.clear()
+        self.pinger = StatusPinger()
+        self.processes = ProcessWatcher()
+        self.restarts = asyncio.Semaphore(self.max_restarts)
+        self.executor = ThreadPoolExecutor(self.max_restarts, "msmanager-watchdog")
+        self.lookups = ThreadPoolExecutor(LOOKUP_WORKERS, "msmanager-watchdog-lookup")
+        try:
+            await asyncio.gather(*[self.watch(server) for server in self.servers])
+        finally:
+            self.stopping.set()
+            self.pinger.close()
+            self.processes.close()
+            self.executor.shutdown(wait=False)
+            self.lookups.shutdown(wait=False)
+
+    def start(self) -> None:
+        asyncio.run(self.run())